@@ -23,6 +23,7 @@ import time
 from typing import Any, Optional
 import uuid
 import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
 from copy import deepcopy
 
 import numpy as np
@@ -75,6 +76,9 @@ class Bob:
     end_electronic_shot_noise: (
         int  #: End of the electronic shot noise data in case of automatic calibration.
     )
+    data_generation: (
+        int  #: Incremented each time the signal data or a noise is replaced.
+    )
 
     quantum_symbols: Optional[np.ndarray]  #: Array of corrected symbols.
     electronic_symbols: Optional[
@@ -113,6 +117,12 @@ class Bob:
         bool  #: Enable the laser if True. Meant to be False when using the GUI.
     )
 
+    _request_executor: Optional[
+        ThreadPoolExecutor
+    ]  #: Worker thread for the parameter changes requested without waiting.
+
+    dsp_workers: int  #: Number of threads for the DSP. With more than one, the DSP of the noises is done while the symbols are requested to Alice.
+
     def __init__(self, config_path: str, enable_laser: bool = True):
         """
         Args:
@@ -130,6 +140,7 @@ class Bob:
         self.electronic_shot_symbols = None
 
         self.end_electronic_shot_noise = 0
+        self.data_generation = 0
 
         self.indices = None
         self.alice_symbols = None
@@ -149,6 +160,8 @@ class Bob:
         self.quantum_symbols = None
 
         self.enable_laser = enable_laser
+        self.dsp_workers = 1
+        self._request_executor = None
 
         self.laser = None
         self.switch = None
@@ -386,6 +399,9 @@ class Bob:
         """
         Close the socket and Bob.
         """
+        if self._request_executor is not None:
+            self._request_executor.shutdown()
+            self._request_executor = None
         self.socket.close()
         self.close_hardware()
 
@@ -480,6 +496,7 @@ class Bob:
 
             self._stop_acquisition()
             self.signal_data = deepcopy(self.adc_data)
+            self.data_generation += 1
 
             assert self.signal_data is not None
             if self.config.bob.switch.switching_time:
@@ -644,6 +661,20 @@ class Bob:
 
         self.quantum_symbols, params, dsp_debug = dsp_bob(data, self.config)
 
+        # The DSP of the noises does not depend on the symbols of Alice, and
+        # can be done in a worker thread while the global phase is corrected.
+        special_dsp_future: Optional[Future] = None
+        if self.dsp_workers > 1:
+            logger.info("Applying DSP on elec and elec+shot noise data in a thread")
+            executor = ThreadPoolExecutor(max_workers=1)
+            special_dsp_future = executor.submit(
+                special_dsp,
+                self.electronic_noise.data,
+                self.electronic_shot_noise.data,
+                params,
+            )
+            executor.shutdown(wait=False)
+
         # Correct global phase of each frame of quantum symbols
         logger.info("Correcting global frame on each subframe")
         self.indices = []
@@ -703,11 +734,16 @@ class Bob:
             self.begin_data / self.config.bob.adc.rate * 1e3,
         )
 
-        logger.info("Applying DSP on elec and elec+shot noise data")
+        if special_dsp_future is not None:
+            self.electronic_symbols, self.electronic_shot_symbols = (
+                special_dsp_future.result()
+            )
+        else:
+            logger.info("Applying DSP on elec and elec+shot noise data")
 
-        self.electronic_symbols, self.electronic_shot_symbols = special_dsp(
-            self.electronic_noise.data, self.electronic_shot_noise.data, params
-        )
+            self.electronic_symbols, self.electronic_shot_symbols = special_dsp(
+                self.electronic_noise.data, self.electronic_shot_noise.data, params
+            )
 
         logger.info("DSP end")
 
@@ -729,6 +765,7 @@ class Bob:
         self._get_adc_data()
         assert self.adc_data is not None
         self.electronic_noise = ElectronicNoise(deepcopy(self.adc_data))
+        self.data_generation += 1
         self._stop_acquisition()
 
     def load_electronic_noise_data(self):
@@ -738,6 +775,7 @@ class Bob:
         self.electronic_noise = ElectronicNoise.load(
             self.config.bob.electronic_noise.path
         )
+        self.data_generation += 1
 
     def save_electronic_noise_data(self, detector: str = "", comment: str = "") -> None:
         """
@@ -762,6 +800,21 @@ class Bob:
         It will switch the state of the optical switch to the calibration state,
         make an acquisition, switch back, and finally compute the noise density.
         """
+        self.electronic_shot_noise = self.acquire_electronic_shot_noise_data()
+        self.data_generation += 1
+
+    def acquire_electronic_shot_noise_data(self) -> ElectronicShotNoise:
+        """
+        Acquire electronic+shot noise data using the configured adc and return it,
+        without replacing the current electronic+shot noise.
+
+        This only uses the switch and the adc, without changing the attributes
+        of Bob, and can be run in a worker thread while the DSP is applied on
+        the previous acquisition.
+
+        Returns:
+            ElectronicShotNoise: the acquired electronic+shot noise.
+        """
         assert self.config is not None and self.config.bob is not None
         assert self.switch is not None
         if self.config.bob.switch.switching_time:
@@ -771,12 +824,13 @@ class Bob:
         logger.info("Starting calibration of shot noise.")
         self.switch.set_state(self.config.bob.switch.calibration_state)
         self._start_acquisition()
-        self._get_adc_data()
-        assert self.adc_data is not None
-        self.electronic_shot_noise = ElectronicShotNoise(deepcopy(self.adc_data))
+        # The data is kept local, as self.adc_data may be used by the main thread.
+        data = self.adc.get_data()
+        electronic_shot_noise = ElectronicShotNoise(deepcopy(data))
         self._stop_acquisition()
         self.switch.set_state(self.config.bob.switch.signal_state)
         logger.info("Calibration of shot noise finished.")
+        return electronic_shot_noise
 
     def load_electronic_shot_noise_data(self) -> None:
         """
@@ -790,6 +844,7 @@ class Bob:
         self.electronic_shot_noise = ElectronicShotNoise.load(
             self.config.bob.electronic_shot_noise.path
         )
+        self.data_generation += 1
 
     def save_electronic_shot_noise_data(
         self, detector: str = "", power: Optional[float] = None, comment: str = ""
@@ -861,6 +916,25 @@ class Bob:
         else:
             logger.warning("The value of the parameter %s was not changed", parameter)
 
+    def request_parameter_change_async(self, parameter: str, new_value: Any) -> Future:
+        """Request a parameter change to the server in a worker thread, without waiting for it.
+
+        The requests are done in order, and the socket should not be used
+        by anything else until the returned future is done.
+
+        Args:
+            parameter (str): full module name of the parameter.
+            new_value (Any): the requested value for the parameter.
+
+        Returns:
+            Future: future of the request.
+        """
+        if self._request_executor is None:
+            self._request_executor = ThreadPoolExecutor(max_workers=1)
+        return self._request_executor.submit(
+            self.request_parameter_change, parameter, new_value
+        )
+
     def _optimal_polarisation_finding(self):
         """
         The goal of this function is to minimize the power on the powermeter, that corresponds
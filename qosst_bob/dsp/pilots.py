@@ -22,7 +22,7 @@ from typing import Tuple, List, Optional
 
 import numpy as np
 from scipy import signal
-from scipy.fft import fft, fftfreq
+from scipy.fft import fft, ifft, fftfreq, next_fast_len, set_workers
 from scipy.ndimage import uniform_filter1d
 
 from .resample import downsample
@@ -41,6 +41,7 @@ def recover_tones(
     Recover all the tones within data given the list of frequencies of the tones.
 
     This will get the tones by applying a FIR of size fir_size and cut-off cutoff on the data.
+    The FFT of the data is only computed once for all the tones.
 
     Args:
         data (np.ndarray): data on which the tones should be recovered.
@@ -57,10 +58,47 @@ def recover_tones(
         str([freq * 1e-6 for freq in frequencies]),
         cutoff * 1e-6,
     )
-    return [
-        recover_tone(data, frequency, rate, fir_size, cutoff)
-        for frequency in frequencies
-    ]
+    # The FFT of the data is shared by all the tones. The full convolution
+    # is zero-padded to a fast length and then cropped as in mode="same".
+    fft_size = next_fast_len(len(data) + fir_size - 1)
+    start = (fir_size - 1) // 2
+    tones = []
+    with set_workers(-1):
+        data_fft = fft(data, fft_size)
+        for frequency in frequencies:
+            fir = _tone_fir(frequency, rate, fir_size, cutoff, data.dtype)
+            tones.append(
+                ifft(data_fft * fft(fir, fft_size))[start : start + len(data)]
+            )
+    return tones
+
+
+def _tone_fir(
+    frequency: float, rate: float, fir_size: int, cutoff: float, dtype: np.dtype
+) -> np.ndarray:
+    """
+    Build the band-pass FIR centered on frequency used to recover a tone.
+
+    If dtype is single precision (float32 or complex64), the FIR is
+    returned in complex64.
+
+    Args:
+        frequency (float): the frequency of the tone, in Hz.
+        rate (float): the rate of the data, in Samples per second.
+        fir_size (int): the size of the FIR.
+        cutoff (float): the cut-off frequency of the filter, in Hz.
+        dtype (np.dtype): the dtype of the data to filter.
+
+    Returns:
+        np.ndarray: the FIR.
+    """
+    fir = signal.firwin(fir_size, cutoff / rate) * np.exp(
+        1j * 2 * np.pi * np.arange(fir_size) * frequency / rate
+    )
+    if dtype in (np.float32, np.complex64):
+        # Keep single precision data in single precision
+        fir = fir.astype(np.complex64)
+    return fir
 
 
 def recover_tone(
@@ -75,6 +113,9 @@ def recover_tone(
 
     This will get the tones by applying a FIR of size fir_size and cut-off cutoff on the data.
 
+    If data is in single precision (float32 or complex64), the FIR is built in
+    single precision and the returned tone is complex64.
+
     Args:
         data (np.ndarray): the data on which the tones should be recovered.
         frequencies (float): the frequency of the tone.
@@ -90,10 +131,9 @@ def recover_tone(
         frequency * 1e-6,
         cutoff * 1e-6,
     )
-    fir = signal.firwin(fir_size, cutoff / rate) * np.exp(
-        1j * 2 * np.pi * np.arange(fir_size) * frequency / rate
-    )
-    return signal.fftconvolve(data, fir, mode="same")
+    fir = _tone_fir(frequency, rate, fir_size, cutoff, data.dtype)
+    with set_workers(-1):
+        return signal.fftconvolve(data, fir, mode="same")
 
 
 def find_one_pilot(
@@ -115,7 +155,7 @@ def find_one_pilot(
     if excl is None:
         excl = []
 
-    data_fft = fft(data)
+    data_fft = fft(data, workers=-1)
     data_fftfreq = fftfreq(len(data), 1 / rate)
 
     mask_exclusion_zone = data_fftfreq > 0
@@ -158,7 +198,7 @@ def find_two_pilots(
 
     if excl is None:
         excl = []
-    data_fft = fft(data)
+    data_fft = fft(data, workers=-1)
     data_fftfreq = fftfreq(len(data), 1 / rate)
 
     mask_exclusion_zone = data_fftfreq > 0
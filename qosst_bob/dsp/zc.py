@@ -19,6 +19,7 @@
 DSP functions to deal with Zadoff-Chu sequences and synchronisation.
 """
 from typing import Tuple
+from functools import lru_cache
 import logging
 
 import numpy as np
@@ -30,6 +31,34 @@ from qosst_core.comm.zc import zcsequence
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=16)
+def _resampled_zc(
+    zc_root: int, zc_length: int, resample: int, use_abs: bool, single_precision: bool
+) -> np.ndarray:
+    """
+    Build the upsampled Zadoff-Chu sequence and cache it.
+
+    The returned array is read-only since it is shared between calls.
+
+    Args:
+        zc_root (int): the root of the Zadoff-Chu sequence.
+        zc_length (int): the length of the Zadoff-Chu sequence.
+        resample (int): the number of times each point is repeated.
+        use_abs (bool): if True, the absolute value of the sequence is returned.
+        single_precision (bool): if True, the sequence is returned in single precision.
+
+    Returns:
+        np.ndarray: the upsampled Zadoff-Chu sequence.
+    """
+    zadoff_chu = np.repeat(zcsequence(zc_root, zc_length), resample)
+    if use_abs:
+        zadoff_chu = np.abs(zadoff_chu)
+    if single_precision:
+        zadoff_chu = zadoff_chu.astype(np.float32 if use_abs else np.complex64)
+    zadoff_chu.flags.writeable = False
+    return zadoff_chu
+
+
 # pylint: disable=too-many-arguments
 def synchronisation_zc(
     data: np.ndarray,
@@ -75,8 +104,14 @@ def synchronisation_zc(
         - int(len(data) / ratio_approx) / 2
     )
     logger.debug("Approximative position found at %i.", approx_zc)
-    zadoff_chu = zcsequence(zc_root, zc_length)
-    zadoff_chu = np.repeat(zadoff_chu, int(resample))
+    # Keep single precision data in single precision
+    zadoff_chu = _resampled_zc(
+        zc_root,
+        zc_length,
+        int(resample),
+        bool(use_abs),
+        data.dtype in (np.float32, np.complex64),
+    )
     logger.debug(
         "Upsampling sequence with resample value %f. New length is %i",
         resample,
@@ -85,7 +120,7 @@ def synchronisation_zc(
     data_zc = data[approx_zc - 2 * len(zadoff_chu) : approx_zc + 2 * len(zadoff_chu)]
     lags = signal.correlation_lags(len(data_zc), len(zadoff_chu), mode="same")
     if use_abs:
-        xcorr = signal.correlate(np.abs(data_zc), np.abs(zadoff_chu), mode="same")
+        xcorr = signal.correlate(np.abs(data_zc), zadoff_chu, mode="same")
     else:
         xcorr = signal.correlate(data_zc, zadoff_chu, mode="same")
 
@@ -35,6 +35,7 @@ from qosst_core.participant import Participant
 from qosst_bob import __version__
 from qosst_bob.bob import Bob
 from qosst_bob.data import ExcessNoiseResults
+from qosst_bob.parameters_estimation import shot_noise_variance
 
 logger = logging.getLogger(__name__)
 
@@ -168,8 +169,8 @@ def main():
             all_transmittance_values[j] = transmittance
             all_photon_number_values[j] = photon_number
             all_electronic_noise_values[j] = electronic_noise
-            all_shot_noise_values[j] = np.var(bob.electronic_shot_symbols) - np.var(
-                bob.electronic_symbols
+            all_shot_noise_values[j] = shot_noise_variance(
+                bob.electronic_symbols, bob.electronic_shot_symbols
             )
             datetimes[j] = current_datetime
             j += 1
@@ -18,14 +18,22 @@
 """
 A graphical user interface for Bob.
 """
+# pylint: disable=too-many-lines
 import logging
+import logging.handlers
 import argparse
-from typing import Union, List, Tuple, Optional
+import hashlib
+import math
+import queue
+import threading
+from dataclasses import dataclass, field
+from functools import lru_cache, partial
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Dict, Union, List, Tuple, Optional
 
 import numpy as np
 import FreeSimpleGUI as sg
-import matplotlib
-import matplotlib.pyplot as plt
 
 from qosst_core import RELEASE_NAME
 from qosst_core.utils import export_np
@@ -35,18 +43,19 @@ from qosst_core.commands import THANKS_STRING
 
 from qosst_bob import __version__
 from qosst_bob.bob import Bob
-from qosst_bob.gui.layout import layout
-from qosst_bob.gui.figures import all_figures
+from qosst_bob.gui.layout import layout, plot_styles
+from qosst_bob.gui.figures import all_figures, QOSSTBobGUIFigure
+from qosst_bob.parameters_estimation import shot_noise_variance
 from qosst_bob.gui.layout_content import (
     QOSSTGUIActions,
     QOSSTGUIContent,
     QOSSTGUIText,
     QOSSTGUIInput,
+    QOSSTGUIEvents,
     THEME,
     SEQUENCE,
     LICENSE_TEXT,
 )
-from qosst_bob.gui.plot_utils import get_styles
 
 
 # Configure logging
@@ -55,39 +64,100 @@ from qosst_bob.gui.plot_utils import get_styles
 # * One stdout handler that will actually be redirected to the gui
 # * One file handler
 # pylint: disable=no-member
-class GUIHandler(logging.StreamHandler):
+class GUIHandler(logging.Handler):
     """
     A log handler to print the log in the console on the GUI.
+
+    The formatted records are buffered and a LOG_FLUSH event is sent to the
+    window, so that the event loop prints all the pending records at once.
     """
 
     window: sg.Window
+    logger_element: sg.Multiline
+    buffer: List[str]
 
     def __init__(self, window: sg.Window):
         """
-        Initialize the associated StreamHandler.
+        Initialize the associated Handler.
         """
         self.window = window
-        logging.StreamHandler.__init__(self)
+        self.logger_element = window[QOSSTGUIText.LOGGER]
+        self.buffer = []
+        self._buffer_lock = threading.Lock()
+        logging.Handler.__init__(self)
 
     def emit(self, record: logging.LogRecord):
         """
-        Print the log.
+        Add the log to the buffer and notify the window if needed.
 
         Args:
             record (logging.LogRecord): the log to print.
         """
-        self.window[QOSSTGUIText.LOGGER].print(self.format(record))
+        message = self.format(record)
+        with self._buffer_lock:
+            notify = not self.buffer
+            self.buffer.append(message)
+        if notify:
+            self.window.write_event_value(QOSSTGUIEvents.LOG_FLUSH, None)
+
+    def print_buffer(self):
+        """
+        Print all the buffered logs in the console of the GUI.
+
+        This should be called from the GUI thread.
+        """
+        with self._buffer_lock:
+            messages, self.buffer = self.buffer, []
+        if messages:
+            self.logger_element.print("\n".join(messages))
 
 
 root_logger = logging.getLogger("")
 
 logger = logging.getLogger(__name__)
 
-figures_plot_keys = [figure.plot_key for figure in all_figures]
-figures_save_keys = [figure.save_key for figure in all_figures]
-
-
-def autoplot(bob: Bob, values: dict):
+FIGURES_BY_PLOT_KEY: Dict[str, QOSSTBobGUIFigure] = {
+    figure.plot_key: figure for figure in all_figures
+}  #: Figures indexed by the key of their plot button.
+FIGURES_BY_SAVE_KEY: Dict[str, QOSSTBobGUIFigure] = {
+    figure.save_key: figure for figure in all_figures
+}  #: Figures indexed by the key of their save button.
+FIGURES_BY_TAB_KEY: Dict[str, QOSSTBobGUIFigure] = {
+    figure.tab_key: figure for figure in all_figures
+}  #: Figures indexed by the key of their tab.
+AUTOPLOT_KEYS: Tuple[str, ...] = tuple(
+    figure.autoplot_key for figure in all_figures
+)  #: Keys of the autoplot checkboxes.
+BOB_ACTIONS: Tuple[QOSSTGUIActions, ...] = (
+    QOSSTGUIActions.READ_CONFIGURATION,
+    QOSSTGUIActions.INITIALIZE_HARDWARE,
+    QOSSTGUIActions.CONNECT,
+    QOSSTGUIActions.IDENTIFICATION,
+    QOSSTGUIActions.INITIALIZATION,
+    QOSSTGUIActions.QIE,
+    QOSSTGUIActions.DSP,
+    QOSSTGUIActions.PARAMETERS_ESTIMATION,
+    QOSSTGUIActions.ERROR_CORRECTION,
+    QOSSTGUIActions.PRIVACY_AMPLITICATION,
+    QOSSTGUIActions.ACQUISITION_ELEC_NOISE,
+    QOSSTGUIActions.LOAD_ELEC_NOISE,
+    QOSSTGUIActions.SAVE_ELEC_NOISE,
+    QOSSTGUIActions.ACQUISITION_SHOT_NOISE,
+    QOSSTGUIActions.LOAD_SHOT_NOISE,
+    QOSSTGUIActions.SAVE_SHOT_NOISE,
+    QOSSTGUIActions.EXPORT_ELEC_NOISE,
+    QOSSTGUIActions.EXPORT_SHOT_NOISE,
+    QOSSTGUIActions.EXPORT_SIGNAL,
+)  #: Actions using Bob, disabled while an operation of Bob is running.
+_ENABLED_AT_START: Tuple[QOSSTGUIActions, ...] = (
+    QOSSTGUIActions.READ_CONFIGURATION,
+    QOSSTGUIActions.EXPORT_ELEC_NOISE,
+    QOSSTGUIActions.EXPORT_SHOT_NOISE,
+    QOSSTGUIActions.EXPORT_SIGNAL,
+)  #: Actions of Bob that are enabled in the layout.
+
+
+def autoplot(bob: Bob, values: dict, force: bool = False):
     """
     Iterate through all figures and actualise plot
     if autoplot is enabled for this figure.
@@ -95,10 +165,13 @@ def autoplot(bob: Bob, values: dict):
     Args:
         bob (Bob): Bob object.
         values (dict): current values of the GUI.
+        force (bool, optional): if True, replot even if the data did not change. Defaults to False.
     """
+    if not any(values[key] for key in AUTOPLOT_KEYS):
+        return
     for figure in all_figures:
         if values[figure.autoplot_key]:
-            figure.plot(bob)
+            figure.plot(bob, force=force)
 
 
 def change_enable_status(
@@ -109,16 +182,84 @@ def change_enable_status(
     """
     Change the enable status of content.
 
+    The applied status is remembered in the metadata of the window so
+    that elements already in the requested status are not updated again.
+    While the actions of Bob are locked, their requested status is only
+    remembered, and applied when they are unlocked.
+
     Args:
         window (sg.Window): the window of the GUI.
         content (Union[QOSSTGUIContent, List[QOSSTGUIContent]]): a GUI object or a list of GUI object to set as either enabled or disabled.
         disabled (bool, optional): if True, the content is disabled. If False, the content is enabled. Defaults to False.
     """
+    if window.metadata is None:
+        window.metadata = {}
+    enable_status = window.metadata.setdefault("enable_status", {})
+    locked = window.metadata.get("locked", False)
     if isinstance(content, QOSSTGUIContent):
-        window[content].update(disabled=disabled)
-    else:
-        for item in content:
-            window[item].update(disabled=disabled)
+        content = [content]
+    for item in content:
+        if enable_status.get(item) != disabled:
+            if not (locked and item in BOB_ACTIONS):
+                window[item].update(disabled=disabled)
+            enable_status[item] = disabled
+
+
+def _bob_actions_locked(window: sg.Window) -> bool:
+    """
+    Tell if the actions of Bob are locked, because an operation of Bob is running.
+
+    Args:
+        window (sg.Window): the window of the GUI.
+
+    Returns:
+        bool: True if the actions of Bob are locked.
+    """
+    return window.metadata is not None and window.metadata.get("locked", False)
+
+
+def _lock_bob_actions(window: sg.Window, locked: bool = True):
+    """
+    Disable all the actions of Bob and the plot buttons, or restore their enable status.
+
+    Args:
+        window (sg.Window): the window of the GUI.
+        locked (bool, optional): if True, the actions of Bob are disabled. If False, the status requested with change_enable_status is restored. Defaults to True.
+    """
+    if window.metadata is None:
+        window.metadata = {}
+    if window.metadata.get("locked", False) == locked:
+        return
+    window.metadata["locked"] = locked
+    enable_status = window.metadata.setdefault("enable_status", {})
+    for item in BOB_ACTIONS:
+        disabled = enable_status.get(item, item not in _ENABLED_AT_START)
+        window[item].update(disabled=locked or disabled)
+    for key in FIGURES_BY_PLOT_KEY:
+        window[key].update(disabled=locked)
+
+
+def _button_keys(window: sg.Window) -> List[Any]:
+    """
+    Get the keys of the buttons of the window.
+
+    The keys are computed once and stored in the metadata of the window.
+
+    Args:
+        window (sg.Window): pysimplegui window.
+
+    Returns:
+        List[Any]: the keys of the buttons.
+    """
+    if window.metadata is None:
+        window.metadata = {}
+    if "button_keys" not in window.metadata:
+        window.metadata["button_keys"] = [
+            key
+            for key, element in window.key_dict.items()
+            if isinstance(element, sg.Button)
+        ]
+    return window.metadata["button_keys"]
 
 
 def block_focus(window: sg.Window):
@@ -128,10 +269,45 @@ def block_focus(window: sg.Window):
     Args:
         window (sg.Window): pysimplegui window.
     """
-    for key in window.key_dict:  # Remove dash box of all Buttons
-        element = window[key]
-        if isinstance(element, sg.Button):
-            element.block_focus()
+    for key in _button_keys(window):  # Remove dash box of all Buttons
+        window[key].block_focus()
+
+
+_popup_windows: Dict[Tuple[str, str], sg.Window] = {}  #: Popups kept between uses.
+
+
+def _get_popup_window(
+    title: str, location: str, popup_layout: Callable[[], list]
+) -> sg.Window:
+    """
+    Get a popup window, creating it if it doesn't exist or was closed.
+
+    Popups are hidden instead of closed after being read, so that the
+    next call only has to show them again.
+
+    Args:
+        title (str): title of the popup.
+        location (str): location displayed in the popup.
+        popup_layout (Callable[[], list]): function returning the layout of the popup.
+
+    Returns:
+        sg.Window: the popup window, visible.
+    """
+    window = _popup_windows.get((title, location))
+    if window is None or window.was_closed():
+        window = sg.Window(
+            title,
+            popup_layout(),
+            use_default_focus=False,
+            finalize=True,
+            modal=True,
+        )
+        block_focus(window)
+        _popup_windows[(title, location)] = window
+    else:
+        window.un_hide()
+        window.make_modal()
+    return window
 
 
 def popup_save_electronic_noise(location: str) -> Tuple[bool, str, str]:
@@ -146,35 +322,34 @@ def popup_save_electronic_noise(location: str) -> Tuple[bool, str, str]:
     Returns:
         Tuple[bool, str, str]: return True if the operation was not cancelled, and if not cancelled, the name of the detector and a comment.
     """
-    popup_layout = [
-        [sg.Text(f"Saving electronic noise at location {location}")],
-        [sg.Text("Optional information: ")],
-        [sg.Text("Detector"), sg.Input(key="-POPUP-ELECTRONIC-NOISE-DETECTOR-")],
-        [sg.Text("Comment"), sg.Input(key="-POPUP-ELECTRONIC-NOISE-COMMENT-")],
-        [sg.Button("Save"), sg.Button("Cancel")],
-    ]
-    window = sg.Window(
+    window = _get_popup_window(
         "Save electronic noise",
-        popup_layout,
-        use_default_focus=False,
-        finalize=True,
-        modal=True,
+        location,
+        lambda: [
+            [sg.Text(f"Saving electronic noise at location {location}")],
+            [sg.Text("Optional information: ")],
+            [sg.Text("Detector"), sg.Input(key="-POPUP-ELECTRONIC-NOISE-DETECTOR-")],
+            [sg.Text("Comment"), sg.Input(key="-POPUP-ELECTRONIC-NOISE-COMMENT-")],
+            [sg.Button("Save"), sg.Button("Cancel")],
+        ],
     )
-    block_focus(window)
-    while True:
-        event, values = window.read()
-        if event == "Save":
-            window.close()
-            return (
-                True,
-                values["-POPUP-ELECTRONIC-NOISE-DETECTOR-"],
-                values["-POPUP-ELECTRONIC-NOISE-COMMENT-"],
-            )
-
-        # Cancel
-        window.close()
+    event, values = window.read()
+    if event == sg.WIN_CLOSED:
         return False, "", ""
 
+    window.hide()
+    window["-POPUP-ELECTRONIC-NOISE-DETECTOR-"].update("")
+    window["-POPUP-ELECTRONIC-NOISE-COMMENT-"].update("")
+    if event == "Save":
+        return (
+            True,
+            values["-POPUP-ELECTRONIC-NOISE-DETECTOR-"],
+            values["-POPUP-ELECTRONIC-NOISE-COMMENT-"],
+        )
+
+    # Cancel
+    return False, "", ""
+
 
 def popup_save_electronic_shot_noise(
     location: str,
@@ -190,43 +365,49 @@ def popup_save_electronic_shot_noise(
     Returns:
         Tuple[bool, str, Optional[float], str]: return True if the operation was not cancelled, and if not cancelled, the name of the detector, the power and a comment.
     """
-    popup_layout = [
-        [sg.Text(f"Saving electronic and shot noise at location {location}")],
-        [sg.Text("Optional information: ")],
-        [sg.Text("Detector"), sg.Input(key="-POPUP-ELECTRONIC-SHOT-NOISE-DETECTOR-")],
-        [sg.Text("Power"), sg.Input(key="-POPUP-ELECTRONIC-SHOT-NOISE-POWER-")],
-        [sg.Text("Comment"), sg.Input(key="-POPUP-ELECTRONIC-SHOT-NOISE-COMMENT-")],
-        [sg.Button("Save"), sg.Button("Cancel")],
-    ]
-    window = sg.Window(
+    window = _get_popup_window(
         "Save electronic and shot noise",
-        popup_layout,
-        use_default_focus=False,
-        finalize=True,
-        modal=True,
+        location,
+        lambda: [
+            [sg.Text(f"Saving electronic and shot noise at location {location}")],
+            [sg.Text("Optional information: ")],
+            [
+                sg.Text("Detector"),
+                sg.Input(key="-POPUP-ELECTRONIC-SHOT-NOISE-DETECTOR-"),
+            ],
+            [sg.Text("Power"), sg.Input(key="-POPUP-ELECTRONIC-SHOT-NOISE-POWER-")],
+            [
+                sg.Text("Comment"),
+                sg.Input(key="-POPUP-ELECTRONIC-SHOT-NOISE-COMMENT-"),
+            ],
+            [sg.Button("Save"), sg.Button("Cancel")],
+        ],
     )
-    block_focus(window)
-    while True:
-        event, values = window.read()
-        if event == "Save":
-            window.close()
-            power = None
-            if values["-POPUP-ELECTRONIC-SHOT-NOISE-POWER-"]:
-                try:
-                    power = float(values["-POPUP-ELECTRONIC-SHOT-NOISE-POWER-"])
-                except ValueError:
-                    pass
-            return (
-                True,
-                values["-POPUP-ELECTRONIC-SHOT-NOISE-DETECTOR-"],
-                power,
-                values["-POPUP-ELECTRONIC-SHOT-NOISE-COMMENT-"],
-            )
-
-        # Cancel
-        window.close()
+    event, values = window.read()
+    if event == sg.WIN_CLOSED:
         return False, "", None, ""
 
+    window.hide()
+    window["-POPUP-ELECTRONIC-SHOT-NOISE-DETECTOR-"].update("")
+    window["-POPUP-ELECTRONIC-SHOT-NOISE-POWER-"].update("")
+    window["-POPUP-ELECTRONIC-SHOT-NOISE-COMMENT-"].update("")
+    if event == "Save":
+        power = None
+        if values["-POPUP-ELECTRONIC-SHOT-NOISE-POWER-"]:
+            try:
+                power = float(values["-POPUP-ELECTRONIC-SHOT-NOISE-POWER-"])
+            except ValueError:
+                pass
+        return (
+            True,
+            values["-POPUP-ELECTRONIC-SHOT-NOISE-DETECTOR-"],
+            power,
+            values["-POPUP-ELECTRONIC-SHOT-NOISE-COMMENT-"],
+        )
+
+    # Cancel
+    return False, "", None, ""
+
 
 def _create_parser() -> argparse.ArgumentParser:
     """
@@ -249,443 +430,1118 @@ def _create_parser() -> argparse.ArgumentParser:
     return parser
 
 
-# pylint: disable=too-many-locals, too-many-branches, too-many-statements, no-member
-def main():
+# pylint: disable=too-many-instance-attributes
+@dataclass
+class GUIState:
     """
-    Main entrypoint for the GUI.
+    State of the GUI, shared between the event handlers.
     """
-    # Create the window
-    bob = None
 
-    parser = _create_parser()
-    args = parser.parse_args()
+    window: sg.Window  #: The window of the GUI.
+    texts: Dict[QOSSTGUIText, sg.Element]  #: The updatable text elements of the GUI.
+    gui_handler: GUIHandler  #: The log handler printing in the GUI.
+    formatter: logging.Formatter  #: The formatter for the logs.
+    gui_console_level: int  #: The log level of the console and GUI handlers.
+    values: dict = field(default_factory=dict)  #: Current values of the GUI.
+    bob: Optional[Bob] = None  #: Bob object, once the configuration is read.
+    hardware_enabled: bool = False  #: True if the hardware was initialized.
+    initialization_done: bool = False  #: True if the initialization was done.
+    sequence_pointer: int = 0  #: Position in the keyboard sequence.
+    config_hash: Optional[bytes] = None  #: Hash of the displayed configuration.
+    file_handler: Optional[logging.handlers.MemoryHandler] = (
+        None  #: Buffered handler of the log file, if enabled.
+    )
+    worker: Optional[threading.Thread] = None  #: Thread of the last operation of Bob.
+    exit_requested: bool = False  #: True if exit was asked during an operation.
+    plot_style_pending: bool = False  #: True if the style changed during an operation.
 
-    gui_console_level = verbose_to_log_level(args.verbose)
 
-    root_logger.setLevel(gui_console_level)
+Handler = Callable[[GUIState], None]  #: An event handler of the GUI.
 
-    formatter = logging.Formatter(
-        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+def _run_operation(operation: Callable[[], Any]) -> Tuple[bool, Any]:
+    """
+    Run an operation, catching its exceptions.
+
+    This is meant to be run in a worker thread.
+
+    Args:
+        operation (Callable[[], Any]): the operation to run.
+
+    Returns:
+        Tuple[bool, Any]: True and the returned value of the operation if it succeeded, False and the raised exception otherwise.
+    """
+    try:
+        return True, operation()
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        logger.exception("Error during an operation of Bob")
+        return False, exc
+
+
+def _start_long_operation(
+    state: GUIState,
+    operation: Callable[[], Any],
+    done_event: QOSSTGUIEvents,
+) -> None:
+    """
+    Run an operation of Bob in a worker thread.
+
+    All the actions of Bob are disabled while the operation is running.
+    When the operation is over, done_event is always sent to the window,
+    with the result of _run_operation. The thread is kept in the state,
+    so that Bob is only closed once it is over.
+
+    Args:
+        state (GUIState): the state of the GUI.
+        operation (Callable[[], Any]): the operation to run.
+        done_event (QOSSTGUIEvents): the event to send at the end of the operation.
+    """
+    _lock_bob_actions(state.window)
+    state.worker = threading.Thread(
+        target=lambda: state.window.write_event_value(
+            done_event, _run_operation(operation)
+        ),
+        daemon=True,
     )
+    state.worker.start()
 
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(gui_console_level)
-    console_handler.setFormatter(formatter)
 
-    root_logger.addHandler(console_handler)
+def _finish_long_operation(
+    state: GUIState, done_event: QOSSTGUIEvents
+) -> Tuple[bool, Any]:
+    """
+    Enable again the actions of Bob at the end of an operation,
+    and display the error if the operation failed.
 
-    window = sg.Window(
-        "QOSST Bob",
-        layout,
-        resizable=True,
-        finalize=True,
-        element_justification="c",
-        return_keyboard_events=True,
-        use_default_focus=False,
+    Args:
+        state (GUIState): the state of the GUI.
+        done_event (QOSSTGUIEvents): the event sent at the end of the operation.
+
+    Returns:
+        Tuple[bool, Any]: True and the returned value of the operation if it succeeded, False and the raised exception otherwise.
+    """
+    _lock_bob_actions(state.window, locked=False)
+    succeeded, result = state.values[done_event]
+    if not succeeded:
+        sg.popup_error(f"Error during the operation: {result}")
+    return succeeded, result
+
+
+def _prepare_figures(bob: Bob, figures: List[QOSSTBobGUIFigure]) -> None:
+    """
+    Do the expensive computations of the figures.
+
+    This is meant to be run in a worker thread.
+
+    Args:
+        bob (Bob): Bob object.
+        figures (List[QOSSTBobGUIFigure]): the figures to prepare.
+    """
+    for figure in figures:
+        figure.prepare(bob)
+
+
+def _start_autoplot(state: GUIState) -> None:
+    """
+    Prepare the figures with autoplot enabled in a worker thread.
+
+    The actions of Bob are disabled during the computations, so that the
+    data of Bob is not replaced while it is read. When the computations are
+    over, the figures are drawn by the handler of the AUTOPLOT_PREPARED event.
+
+    Args:
+        state (GUIState): the state of the GUI.
+    """
+    figures = [figure for figure in all_figures if state.values[figure.autoplot_key]]
+    if not figures:
+        return
+    _start_long_operation(
+        state,
+        partial(_prepare_figures, state.bob, figures),
+        QOSSTGUIEvents.AUTOPLOT_PREPARED,
     )
 
-    window.bind("<KeyPress-a>", "a:97")
-    window.bind("<KeyPress-b>", "b:98")
 
-    gui_handler = GUIHandler(window=window)
-    gui_handler.setLevel(gui_console_level)
-    gui_handler.setFormatter(formatter)
+def _handle_autoplot_prepared(state: GUIState) -> None:
+    """
+    Draw the figures with autoplot enabled, once they are prepared.
 
-    root_logger.addHandler(gui_handler)
+    Args:
+        state (GUIState): the state of the GUI.
+    """
+    succeeded, _ = _finish_long_operation(state, QOSSTGUIEvents.AUTOPLOT_PREPARED)
+    if succeeded:
+        autoplot(state.bob, state.values)
 
-    sg.theme(THEME)
 
-    for figure in all_figures:
-        figure.init_figure(window)
+def _handle_log_flush(state: GUIState) -> None:
+    """
+    Print the pending logs in the console of the GUI.
 
-    window[QOSSTGUIText.LOGGER].expand(True, True)
+    Args:
+        state (GUIState): the state of the GUI.
+    """
+    state.gui_handler.print_buffer()
 
-    window[QOSSTGUIText.LOGGER].print(get_script_infos(motd=False))
 
-    hardware_enabled = False
-    initialization_done = False
-    sequence_pointer = 0
+# pylint: disable=too-many-statements
+def _handle_read_configuration(state: GUIState) -> None:
+    """
+    Read the configuration (creating Bob if needed) and display it.
 
-    # Create an event loop
-    # pylint: disable=too-many-nested-blocks
-    while True:
-        event, values = window.read()
-        if event in (QOSSTGUIActions.EXIT, sg.WIN_CLOSED):
-            break
-        if event == QOSSTGUIActions.READ_CONFIGURATION:
-            # change_enable_status()
-            window[QOSSTGUIInput.CONFIGURATION_PATH].update(disabled=True)
-            window[QOSSTGUIActions.BROWSE].update(disabled=True)
-            if bob is None:
-                config_path = values[QOSSTGUIInput.CONFIGURATION_PATH]
-                bob = Bob(config_path, enable_laser=False)
-
-                # Set file logs
-                if bob.config.logs.logging:
-                    root_logger.setLevel(min(bob.config.logs.level, gui_console_level))
-                    file_handler = logging.FileHandler(bob.config.logs.path)
-                    file_handler.setLevel(bob.config.logs.level)
-                    file_handler.setFormatter(formatter)
-                    root_logger.addHandler(file_handler)
-            else:
-                bob.load_configuration()
-
-            # Set configuration in the QI tab
-            window[QOSSTGUIText.CONFIGURATION_QI_NUM_SYMBOLS].update(
-                bob.config.frame.quantum.num_symbols
-            )
-            window[QOSSTGUIText.CONFIGURATION_QI_SHIFT].update(
-                bob.config.frame.quantum.frequency_shift * 1e-6
-            )
-            window[QOSSTGUIText.CONFIGURATION_QI_SYMBOL_RATE].update(
-                bob.config.frame.quantum.symbol_rate * 1e-6
-            )
-            window[QOSSTGUIText.CONFIGURATION_QI_ROLL_OFF].update(
-                bob.config.frame.quantum.roll_off
-            )
-            window[QOSSTGUIText.CONFIGURATION_QI_MODULATION].update(
-                bob.config.frame.quantum.modulation_cls.__name__
+    Args:
+        state (GUIState): the state of the GUI.
+    """
+    window = state.window
+    change_enable_status(
+        window,
+        [QOSSTGUIInput.CONFIGURATION_PATH, QOSSTGUIActions.BROWSE],
+        disabled=True,
+    )
+    if state.bob is None:
+        config_path = state.values[QOSSTGUIInput.CONFIGURATION_PATH]
+        state.bob = Bob(config_path, enable_laser=False)
+
+        # Set file logs
+        if state.bob.config.logs.logging:
+            root_logger.setLevel(
+                min(state.bob.config.logs.level, state.gui_console_level)
             )
-            window[QOSSTGUIText.CONFIGURATION_QI_MODULATION_SIZE].update(
-                bob.config.frame.quantum.modulation_size
+            # The file is only opened at the first write, and records are
+            # written by batches (or as soon as an error is logged)
+            file_handler = logging.FileHandler(state.bob.config.logs.path, delay=True)
+            file_handler.setLevel(state.bob.config.logs.level)
+            file_handler.setFormatter(state.formatter)
+            state.file_handler = logging.handlers.MemoryHandler(
+                capacity=200, flushLevel=logging.ERROR, target=file_handler
             )
+            state.file_handler.setLevel(state.bob.config.logs.level)
+            root_logger.addHandler(state.file_handler)
+    else:
+        state.bob.load_configuration()
+    bob = state.bob
+
+    # Only refresh the display if the configuration file has changed
+    config_hash = hashlib.blake2b(
+        Path(bob.config_path).read_bytes(), digest_size=8
+    ).digest()
+    if config_hash == state.config_hash:
+        return
+    state.config_hash = config_hash
+
+    texts = state.texts
+    quantum = bob.config.frame.quantum
+    zadoff_chu = bob.config.frame.zadoff_chu
+    pilots = bob.config.frame.pilots
+    dsp = bob.config.bob.dsp
+
+    # Set configuration in the QI tab
+    texts[QOSSTGUIText.CONFIGURATION_QI_NUM_SYMBOLS].update(quantum.num_symbols)
+    texts[QOSSTGUIText.CONFIGURATION_QI_SHIFT].update(quantum.frequency_shift * 1e-6)
+    texts[QOSSTGUIText.CONFIGURATION_QI_SYMBOL_RATE].update(quantum.symbol_rate * 1e-6)
+    texts[QOSSTGUIText.CONFIGURATION_QI_ROLL_OFF].update(quantum.roll_off)
+    texts[QOSSTGUIText.CONFIGURATION_QI_MODULATION].update(
+        quantum.modulation_cls.__name__
+    )
+    texts[QOSSTGUIText.CONFIGURATION_QI_MODULATION_SIZE].update(quantum.modulation_size)
 
-            # Set configuration in ZC tab
-            window[QOSSTGUIText.CONFIGURATION_ZC_ROOT].update(
-                bob.config.frame.zadoff_chu.root
-            )
-            window[QOSSTGUIText.CONFIGURATION_ZC_LENGTH].update(
-                bob.config.frame.zadoff_chu.length
-            )
-            window[QOSSTGUIText.CONFIGURATION_ZC_RATE].update(
-                bob.config.frame.zadoff_chu.rate * 1e-6
-            )
+    # Set configuration in ZC tab
+    texts[QOSSTGUIText.CONFIGURATION_ZC_ROOT].update(zadoff_chu.root)
+    texts[QOSSTGUIText.CONFIGURATION_ZC_LENGTH].update(zadoff_chu.length)
+    texts[QOSSTGUIText.CONFIGURATION_ZC_RATE].update(zadoff_chu.rate * 1e-6)
+
+    # Set configuration in the pilots tab
+    texts[QOSSTGUIText.CONFIGURATION_PILOTS_FREQUENCIES].update(
+        ", ".join(np.char.mod("%.10g", np.asarray(pilots.frequencies) * 1e-6))
+    )
+
+    # Set configuration in the DSP tab
+    texts[QOSSTGUIText.CONFIGURATION_DSP_TONE_CUTOFF].update(
+        dsp.tone_filtering_cutoff * 1e-6
+    )
+    texts[QOSSTGUIText.CONFIGURATION_DSP_SUBFRAMES_SIZE].update(dsp.subframes_size)
+    texts[QOSSTGUIText.CONFIGURATION_DSP_ABORT_CLOCK_RECOVERY].update(
+        dsp.abort_clock_recovery
+    )
+    texts[QOSSTGUIText.CONFIGURATION_DSP_ALICE_DAC_RATE].update(
+        dsp.alice_dac_rate * 1e-6
+    )
+    texts[QOSSTGUIText.CONFIGURATION_DSP_EXCLUSION_ZONE].update(
+        dsp.exclusion_zone_pilots
+    )
+    texts[QOSSTGUIText.CONFIGURATION_DSP_PHASE_FILTERING].update(
+        dsp.pilot_phase_filtering_size
+    )
+
+    # Set export directory
+    texts[QOSSTGUIText.EXPORT_DIRECTORY].update(bob.config.bob.export_directory)
+
+    # Enable buttons
+    change_enable_status(
+        window,
+        [
+            QOSSTGUIActions.INITIALIZE_HARDWARE,
+            QOSSTGUIActions.CONNECT,
+            QOSSTGUIActions.LOAD_ELEC_NOISE,
+            QOSSTGUIActions.LOAD_SHOT_NOISE,
+            QOSSTGUIActions.SAVE_ELEC_NOISE,
+            QOSSTGUIActions.SAVE_SHOT_NOISE,
+        ],
+        disabled=False,
+    )
 
-            # Set configuration in the pilots tab
-            window[QOSSTGUIText.CONFIGURATION_PILOTS_FREQUENCIES].update(
-                ", ".join([str(x * 1e-6) for x in bob.config.frame.pilots.frequencies])
+
+def _handle_initialize_hardware(state: GUIState) -> None:
+    """
+    Open the hardware of Bob.
+
+    Args:
+        state (GUIState): the state of the GUI.
+    """
+    if state.bob:
+        state.bob.open_hardware()
+        change_enable_status(
+            state.window, QOSSTGUIActions.INITIALIZE_HARDWARE, disabled=True
+        )
+        change_enable_status(
+            state.window,
+            [
+                QOSSTGUIActions.ACQUISITION_ELEC_NOISE,
+                QOSSTGUIActions.ACQUISITION_SHOT_NOISE,
+            ],
+            disabled=False,
+        )
+        if state.initialization_done:
+            change_enable_status(
+                state.window,
+                [
+                    QOSSTGUIActions.QIE,
+                    QOSSTGUIActions.DSP,
+                    QOSSTGUIActions.PARAMETERS_ESTIMATION,
+                    QOSSTGUIActions.ERROR_CORRECTION,
+                    QOSSTGUIActions.PRIVACY_AMPLITICATION,
+                ],
+                disabled=False,
             )
+        state.hardware_enabled = True
+    else:
+        sg.popup_ok("Please read configuration first.")
 
-            # Set configuration in the DSP tab
-            window[QOSSTGUIText.CONFIGURATION_DSP_TONE_CUTOFF].update(
-                bob.config.bob.dsp.tone_filtering_cutoff * 1e-6
+
+def _handle_connect(state: GUIState) -> None:
+    """
+    Connect Bob to Alice.
+
+    Args:
+        state (GUIState): the state of the GUI.
+    """
+    bob = state.bob
+    if bob:
+        res = bob.connect()
+        if res:
+            state.texts[QOSSTGUIText.CONNECTION_STATUS].update(
+                f"Status: Connected to {bob.config.bob.network.server_address}"
             )
-            window[QOSSTGUIText.CONFIGURATION_DSP_SUBFRAMES_SIZE].update(
-                bob.config.bob.dsp.subframes_size
+            change_enable_status(state.window, QOSSTGUIActions.CONNECT, disabled=True)
+            change_enable_status(
+                state.window, QOSSTGUIActions.IDENTIFICATION, disabled=False
             )
-            window[QOSSTGUIText.CONFIGURATION_DSP_ABORT_CLOCK_RECOVERY].update(
-                bob.config.bob.dsp.abort_clock_recovery
+        else:
+            sg.popup_error(
+                f"Couldn't connect to host {bob.config.bob.network.server_address}"
             )
-            window[QOSSTGUIText.CONFIGURATION_DSP_ALICE_DAC_RATE].update(
-                bob.config.bob.dsp.alice_dac_rate * 1e-6
+    else:
+        sg.popup_ok("Please read configuration first.")
+
+
+def _handle_identification(state: GUIState) -> None:
+    """
+    Identify Bob to Alice.
+
+    Args:
+        state (GUIState): the state of the GUI.
+    """
+    if state.bob and state.bob.is_connected:
+        res = state.bob.identification()
+        if res:
+            state.texts[QOSSTGUIText.IDENTIFICATION_STATUS].update(
+                "Identification status : Done"
             )
-            window[QOSSTGUIText.CONFIGURATION_DSP_EXCLUSION_ZONE].update(
-                bob.config.bob.dsp.exclusion_zone_pilots
+            change_enable_status(
+                state.window, QOSSTGUIActions.INITIALIZATION, disabled=False
             )
-            window[QOSSTGUIText.CONFIGURATION_DSP_PHASE_FILTERING].update(
-                bob.config.bob.dsp.pilot_phase_filtering_size
+        else:
+            state.texts[QOSSTGUIText.IDENTIFICATION_STATUS].update(
+                "Identification status : Done"
             )
+    else:
+        sg.popup_ok("Please read configuration and connect Bob first.")
 
-            # Set export directory
-            window[QOSSTGUIText.EXPORT_DIRECTORY].update(
-                bob.config.bob.export_directory
-            )
 
-            # Enable buttons
+def _handle_initialization(state: GUIState) -> None:
+    """
+    Start a new frame in a worker thread.
+
+    Args:
+        state (GUIState): the state of the GUI.
+    """
+    if state.bob and state.bob.is_connected:
+        _start_long_operation(
+            state,
+            state.bob.initialization,
+            QOSSTGUIEvents.INITIALIZATION_DONE,
+        )
+    else:
+        sg.popup_ok("Please read configuration and connect Bob first.")
+
+
+def _handle_initialization_done(state: GUIState) -> None:
+    """
+    Display the result of the initialization.
+
+    Args:
+        state (GUIState): the state of the GUI.
+    """
+    succeeded, res = _finish_long_operation(state, QOSSTGUIEvents.INITIALIZATION_DONE)
+
+    if succeeded and res:
+        state.texts[QOSSTGUIText.FRAME_UUID].update(
+            f"Frame UUID : {state.bob.frame_uuid}"
+        )
+        state.initialization_done = True
+        if state.hardware_enabled:
             change_enable_status(
-                window,
+                state.window,
                 [
-                    QOSSTGUIActions.INITIALIZE_HARDWARE,
-                    QOSSTGUIActions.CONNECT,
-                    QOSSTGUIActions.LOAD_ELEC_NOISE,
-                    QOSSTGUIActions.LOAD_SHOT_NOISE,
-                    QOSSTGUIActions.SAVE_ELEC_NOISE,
-                    QOSSTGUIActions.SAVE_SHOT_NOISE,
+                    QOSSTGUIActions.QIE,
+                    QOSSTGUIActions.DSP,
+                    QOSSTGUIActions.PARAMETERS_ESTIMATION,
+                    QOSSTGUIActions.ERROR_CORRECTION,
+                    QOSSTGUIActions.PRIVACY_AMPLITICATION,
                 ],
                 disabled=False,
             )
-        elif event == QOSSTGUIActions.INITIALIZE_HARDWARE:
-            if bob:
-                bob.open_hardware()
-                change_enable_status(
-                    window, QOSSTGUIActions.INITIALIZE_HARDWARE, disabled=True
-                )
-                change_enable_status(
-                    window,
-                    [
-                        QOSSTGUIActions.ACQUISITION_ELEC_NOISE,
-                        QOSSTGUIActions.ACQUISITION_SHOT_NOISE,
-                    ],
-                    disabled=False,
-                )
-                if initialization_done:
-                    change_enable_status(
-                        window,
-                        [
-                            QOSSTGUIActions.QIE,
-                            QOSSTGUIActions.DSP,
-                            QOSSTGUIActions.PARAMETERS_ESTIMATION,
-                            QOSSTGUIActions.ERROR_CORRECTION,
-                            QOSSTGUIActions.PRIVACY_AMPLITICATION,
-                        ],
-                        disabled=False,
-                    )
-                hardware_enabled = True
-            else:
-                sg.popup_ok("Please read configuration first.")
-        elif event == QOSSTGUIActions.CONNECT:
-            if bob:
-                res = bob.connect()
-                if res:
-                    window[QOSSTGUIText.CONNECTION_STATUS].update(
-                        f"Status: Connected to {bob.config.bob.network.server_address}"
-                    )
-                    change_enable_status(window, QOSSTGUIActions.CONNECT, disabled=True)
-                    change_enable_status(
-                        window, QOSSTGUIActions.IDENTIFICATION, disabled=False
-                    )
-                else:
-                    sg.popup_error(
-                        f"Couldn't connect to host {bob.config.bob.network.server_address}"
-                    )
-            else:
-                sg.popup_ok("Please read configuration first.")
-        elif event == QOSSTGUIActions.IDENTIFICATION:
-            if bob and bob.is_connected:
-                res = bob.identification()
-                if res:
-                    window[QOSSTGUIText.IDENTIFICATION_STATUS].update(
-                        "Identification status : Done"
-                    )
-                    change_enable_status(
-                        window, QOSSTGUIActions.INITIALIZATION, disabled=False
-                    )
-                else:
-                    window[QOSSTGUIText.IDENTIFICATION_STATUS].update(
-                        "Identification status : Done"
-                    )
-            else:
-                sg.popup_ok("Please read configuration and connect Bob first.")
-        elif event == QOSSTGUIActions.INITIALIZATION:
-            if bob and bob.is_connected:
-                res = bob.initialization()
-
-                if res:
-                    window[QOSSTGUIText.FRAME_UUID].update(
-                        f"Frame UUID : {bob.frame_uuid}"
-                    )
-                    initialization_done = True
-                    if hardware_enabled:
-                        change_enable_status(
-                            window,
-                            [
-                                QOSSTGUIActions.QIE,
-                                QOSSTGUIActions.DSP,
-                                QOSSTGUIActions.PARAMETERS_ESTIMATION,
-                                QOSSTGUIActions.ERROR_CORRECTION,
-                                QOSSTGUIActions.PRIVACY_AMPLITICATION,
-                            ],
-                            disabled=False,
-                        )
-                else:
-                    window[QOSSTGUIText.FRAME_UUID].update("Initialization failed")
-            else:
-                sg.popup_ok("Please read configuration and connect Bob first.")
-        elif event == QOSSTGUIActions.QIE:
-            if bob:
-                res = bob.quantum_information_exchange()
-                if res:
-                    window[QOSSTGUIText.QIE_STATUS].update("QIE status: Done")
-                    if values[QOSSTGUIInput.AUTO_EXPORT_DATA]:
-                        filename = export_np(
-                            bob.signal_data,
-                            bob.config.bob.export_directory,
-                            data_name="signal",
-                        )
-                        if filename:
-                            window[QOSSTGUIText.LAST_EXPORT].update(filename)
-                    autoplot(bob, values)
-                else:
-                    window[QOSSTGUIText.QIE_STATUS].update("QIE status: Failed")
-            else:
-                sg.popup_ok("Please read configuration first.")
-        elif event == QOSSTGUIActions.DSP:
-            if bob:
-                res = bob.dsp()
-                if res:
-                    window[QOSSTGUIText.DSP_STATUS].update("DSP status: Done")
-                else:
-                    window[QOSSTGUIText.DSP_STATUS].update("DSP status: failed")
-                autoplot(bob, values)
-
-            else:
-                sg.popup_ok("Please read configuration first.")
-        elif event == QOSSTGUIActions.PARAMETERS_ESTIMATION:
-            if bob:
-                res = bob.parameters_estimation()
-                if res:
-                    window[QOSSTGUIText.PARAMETERS_ESTIMATION_STATUS].update(
-                        "PE status: Done"
-                    )
-                    window[QOSSTGUIText.PE_ETA].update(bob.config.bob.eta)
-                    window[QOSSTGUIText.PE_SHOT].update(
-                        np.var(bob.electronic_shot_symbols)
-                        - np.var(bob.electronic_symbols)
-                    )
-                    window[QOSSTGUIText.PE_VEL].update(bob.vel)
-                    window[QOSSTGUIText.PE_ETA_T].update(bob.transmittance)
-                    window[QOSSTGUIText.PE_T].update(
-                        bob.transmittance / bob.config.bob.eta
-                    )
-                    window[QOSSTGUIText.PE_EXCESS_NOISE_BOB].update(
-                        bob.excess_noise_bob
-                    )
-                    window[QOSSTGUIText.PE_EXCESS_NOISE_ALICE].update(
-                        bob.excess_noise_bob / bob.transmittance
-                    )
-                    window[QOSSTGUIText.PE_SKR].update(bob.skr * 1e-3)
-                    window[QOSSTGUIText.PE_PHOTON_NUMBER].update(bob.photon_number)
-                    window[QOSSTGUIText.PE_DISTANCE].update(
-                        -10 * np.log10(bob.transmittance / bob.config.bob.eta) / 0.2
-                    )
-                else:
-                    window[QOSSTGUIText.PARAMETERS_ESTIMATION_STATUS].update(
-                        "PE status: Failed"
-                    )
-            else:
-                sg.popup_ok("Please read configuration first.")
-        elif event == QOSSTGUIActions.ERROR_CORRECTION:
-            if bob:
-                sg.popup_error("Error correction is not yet implemented.")
-            else:
-                sg.popup_ok("Please read configuration first.")
-        elif event == QOSSTGUIActions.PRIVACY_AMPLITICATION:
-            if bob:
-                sg.popup_error("Privacy amplification is not yet implemented.")
-            else:
-                sg.popup_ok("Please read configuration first.")
-        elif event == QOSSTGUIActions.ACQUISITION_ELEC_NOISE:
-            if bob:
-                bob.get_electronic_noise_data()
-                window[QOSSTGUIText.ELEC_DATA_STATUS].update("Status : Acquired")
-                if values[QOSSTGUIInput.AUTO_EXPORT_DATA]:
-                    filename, _ = export_np(
-                        bob.electronic_noise,
-                        bob.config.bob.export_directory,
-                        "elec_data",
-                    )
-                    window[QOSSTGUIText.LAST_EXPORT].update(filename)
-            else:
-                sg.popup_ok("Please read configuration first.")
-        elif event == QOSSTGUIActions.LOAD_ELEC_NOISE:
-            if bob:
-                bob.load_electronic_noise_data()
-                window[QOSSTGUIText.ELEC_DATA_STATUS].update("Status : Loaded")
-            else:
-                sg.popup_ok("Please read configuration first.")
-        elif event == QOSSTGUIActions.SAVE_ELEC_NOISE:
-            if bob:
-                save, detector, comment = popup_save_electronic_noise(
-                    str(bob.config.bob.electronic_noise.path)
-                )
-                if save:
-                    bob.save_electronic_noise_data(detector=detector, comment=comment)
-            else:
-                sg.popup_ok("Please read configuration first.")
-        elif event == QOSSTGUIActions.ACQUISITION_SHOT_NOISE:
-            if bob:
-                bob.get_electronic_shot_noise_data()
-                window[QOSSTGUIText.SHOT_DATA_STATUS].update("Status : Acquired")
-                if values[QOSSTGUIInput.AUTO_EXPORT_DATA]:
-                    filename, _ = export_np(
-                        bob.electronic_shot_noise,
-                        bob.config.bob.export_directory,
-                        "elec_shot_data",
-                    )
-                    window[QOSSTGUIText.LAST_EXPORT].update(filename)
-            else:
-                sg.popup_ok("Please read configuration first.")
-        elif event == QOSSTGUIActions.LOAD_SHOT_NOISE:
-            if bob:
-                bob.load_electronic_shot_noise_data()
-                window[QOSSTGUIText.SHOT_DATA_STATUS].update("Status : Loaded")
-            else:
-                sg.popup_ok("Please read configuration first.")
-        elif event == QOSSTGUIActions.SAVE_SHOT_NOISE:
-            if bob:
-                save, detector, power, comment = popup_save_electronic_shot_noise(
-                    bob.config.bob.electronic_shot_noise.path
-                )
-                if save:
-                    bob.save_electronic_shot_noise_data(detector, power, comment)
-            else:
-                sg.popup_ok("Please read configuration first.")
-        elif event in figures_plot_keys:
-            for figure in all_figures:
-                if event == figure.plot_key:
-                    figure.plot(bob)
-        elif event in figures_save_keys:
-            for figure in all_figures:
-                if event == figure.save_key:
-                    path = sg.popup_get_file(
-                        message="Select location to save figure",
-                        save_as=True,
-                        file_types=plt.gcf().canvas.get_supported_filetypes().items(),
-                        default_extension=".png",
-                    )
-                    if path:
-                        figure.save(path)
-                        logger.info("Figure %s was saved to %s", figure.name, str(path))
-        elif event == QOSSTGUIActions.EXPORT_ELEC_NOISE:
-            filename, _ = export_np(
-                bob.electronic_noise.data, bob.config.bob.export_directory, "elec_data"
-            )
-            window[QOSSTGUIText.LAST_EXPORT].update(filename)
-        elif event == QOSSTGUIActions.EXPORT_SHOT_NOISE:
-            filename, _ = export_np(
-                bob.electronic_shot_noise.data,
+    else:
+        state.texts[QOSSTGUIText.FRAME_UUID].update("Initialization failed")
+
+
+def _handle_qie(state: GUIState) -> None:
+    """
+    Perform the Quantum Information Exchange in a worker thread.
+
+    Args:
+        state (GUIState): the state of the GUI.
+    """
+    if state.bob:
+        _start_long_operation(
+            state,
+            state.bob.quantum_information_exchange,
+            QOSSTGUIEvents.QIE_DONE,
+        )
+    else:
+        sg.popup_ok("Please read configuration first.")
+
+
+def _handle_qie_done(state: GUIState) -> None:
+    """
+    Display the result of the Quantum Information Exchange.
+
+    Args:
+        state (GUIState): the state of the GUI.
+    """
+    succeeded, res = _finish_long_operation(state, QOSSTGUIEvents.QIE_DONE)
+    bob = state.bob
+    if succeeded and res:
+        state.texts[QOSSTGUIText.QIE_STATUS].update("QIE status: Done")
+        if state.values[QOSSTGUIInput.AUTO_EXPORT_DATA]:
+            filename = export_np(
+                bob.signal_data,
                 bob.config.bob.export_directory,
-                "elec_shot_data",
+                data_name="signal",
             )
-            window[QOSSTGUIText.LAST_EXPORT].update(filename)
-        elif event == QOSSTGUIActions.EXPORT_SIGNAL:
-            filename, _ = export_np(
-                bob.signal_data, bob.config.bob.export_directory, "signal"
-            )
-            window[QOSSTGUIText.LAST_EXPORT].update(filename)
-        elif event == QOSSTGUIActions.ABOUT:
-            sg.popup_ok(LICENSE_TEXT, title="About")
-        elif event == QOSSTGUIInput.SELECT_PLOT_STYLE:
-            new_style = values[QOSSTGUIInput.SELECT_PLOT_STYLE]
-            logger.info("Resetting to default matplotlib style")
-            matplotlib.rcParams.update(matplotlib.rcParamsDefault)
-            if new_style != "default":
-                logger.info("Using new style for plots: %s", new_style)
-                styles = get_styles()
-                plt.style.use(styles[new_style])
-            autoplot(bob, values)
-        elif ":" in event:
-            # Keyboard events are returned in the format
-            # key:number
-            # I am not sure what number it is since it doesn't seem
-            # to be the ordinal.
-            try:
-                key_ord = int(event.split(":")[1])
-            except ValueError:
-                continue
-            if key_ord == SEQUENCE[sequence_pointer]:
-                sequence_pointer += 1
-            else:
-                sequence_pointer = 0
-
-            if sequence_pointer == len(SEQUENCE):
-                sg.popup_ok(
-                    THANKS_STRING.format(release_name=RELEASE_NAME), title="Thanks"
-                )
-                sequence_pointer = 0
+            if filename:
+                state.texts[QOSSTGUIText.LAST_EXPORT].update(filename)
+        _start_autoplot(state)
+    else:
+        state.texts[QOSSTGUIText.QIE_STATUS].update("QIE status: Failed")
+
+
+def _handle_dsp(state: GUIState) -> None:
+    """
+    Apply the DSP in a worker thread.
+
+    Args:
+        state (GUIState): the state of the GUI.
+    """
+    if state.bob:
+        _start_long_operation(state, state.bob.dsp, QOSSTGUIEvents.DSP_DONE)
+    else:
+        sg.popup_ok("Please read configuration first.")
+
+
+def _handle_dsp_done(state: GUIState) -> None:
+    """
+    Display the result of the DSP.
+
+    Args:
+        state (GUIState): the state of the GUI.
+    """
+    succeeded, res = _finish_long_operation(state, QOSSTGUIEvents.DSP_DONE)
+    if succeeded and res:
+        state.texts[QOSSTGUIText.DSP_STATUS].update("DSP status: Done")
+    else:
+        state.texts[QOSSTGUIText.DSP_STATUS].update("DSP status: failed")
+    _start_autoplot(state)
+
+
+def _parameters_estimation(bob: Bob) -> Tuple[bool, float]:
+    """
+    Run the parameters estimation and compute the shot noise to display.
+
+    This is meant to be run in a worker thread, so that the variances over
+    the noise symbols are not computed in the GUI thread. The variances
+    are computed in the precision of the symbols.
+
+    Args:
+        bob (Bob): Bob object.
+
+    Returns:
+        Tuple[bool, float]: True if the parameters estimation was successful, and the shot noise.
+    """
+    if not bob.parameters_estimation():
+        return False, 0.0
+    shot = shot_noise_variance(bob.electronic_symbols, bob.electronic_shot_symbols)
+    return True, float(shot)
+
+
+def _handle_parameters_estimation(state: GUIState) -> None:
+    """
+    Perform the parameters estimation in a worker thread.
+
+    Args:
+        state (GUIState): the state of the GUI.
+    """
+    if state.bob:
+        _start_long_operation(
+            state,
+            partial(_parameters_estimation, state.bob),
+            QOSSTGUIEvents.PARAMETERS_ESTIMATION_DONE,
+        )
+    else:
+        sg.popup_ok("Please read configuration first.")
+
+
+def _handle_parameters_estimation_done(state: GUIState) -> None:
+    """
+    Display the results of the parameters estimation.
+
+    Args:
+        state (GUIState): the state of the GUI.
+    """
+    texts = state.texts
+    bob = state.bob
+    succeeded, result = _finish_long_operation(
+        state, QOSSTGUIEvents.PARAMETERS_ESTIMATION_DONE
+    )
+    res, shot = result if succeeded else (False, 0.0)
+    if res:
+        eta = bob.config.bob.eta
+        transmittance = bob.transmittance / eta
+        excess_noise_alice = bob.excess_noise_bob / bob.transmittance
+        # Equivalent distance for a loss of 0.2 dB/km
+        distance = (
+            -10 * math.log10(transmittance) / 0.2 if transmittance > 0 else math.nan
+        )
+        pe_updates = {
+            QOSSTGUIText.PARAMETERS_ESTIMATION_STATUS: "PE status: Done",
+            QOSSTGUIText.PE_ETA: eta,
+            QOSSTGUIText.PE_SHOT: shot,
+            QOSSTGUIText.PE_VEL: bob.vel,
+            QOSSTGUIText.PE_ETA_T: bob.transmittance,
+            QOSSTGUIText.PE_T: transmittance,
+            QOSSTGUIText.PE_EXCESS_NOISE_BOB: bob.excess_noise_bob,
+            QOSSTGUIText.PE_EXCESS_NOISE_ALICE: excess_noise_alice,
+            QOSSTGUIText.PE_SKR: bob.skr * 1e-3,
+            QOSSTGUIText.PE_PHOTON_NUMBER: bob.photon_number,
+            QOSSTGUIText.PE_DISTANCE: distance,
+        }
+        for key, value in pe_updates.items():
+            texts[key].update(value)
+    else:
+        texts[QOSSTGUIText.PARAMETERS_ESTIMATION_STATUS].update("PE status: Failed")
+
+
+def _handle_error_correction(state: GUIState) -> None:
+    """
+    Apply error correction (not yet implemented).
+
+    Args:
+        state (GUIState): the state of the GUI.
+    """
+    if state.bob:
+        sg.popup_error("Error correction is not yet implemented.")
+    else:
+        sg.popup_ok("Please read configuration first.")
+
+
+def _handle_privacy_amplification(state: GUIState) -> None:
+    """
+    Apply privacy amplification (not yet implemented).
+
+    Args:
+        state (GUIState): the state of the GUI.
+    """
+    if state.bob:
+        sg.popup_error("Privacy amplification is not yet implemented.")
+    else:
+        sg.popup_ok("Please read configuration first.")
+
+
+def _handle_acquisition_elec_noise(state: GUIState) -> None:
+    """
+    Acquire electronic noise in a worker thread.
+
+    Args:
+        state (GUIState): the state of the GUI.
+    """
+    if state.bob:
+        _start_long_operation(
+            state,
+            state.bob.get_electronic_noise_data,
+            QOSSTGUIEvents.ACQUISITION_ELEC_NOISE_DONE,
+        )
+    else:
+        sg.popup_ok("Please read configuration first.")
+
+
+def _handle_acquisition_elec_noise_done(state: GUIState) -> None:
+    """
+    Display the status of the electronic noise acquisition.
+
+    Args:
+        state (GUIState): the state of the GUI.
+    """
+    succeeded, _ = _finish_long_operation(
+        state, QOSSTGUIEvents.ACQUISITION_ELEC_NOISE_DONE
+    )
+    if not succeeded:
+        state.texts[QOSSTGUIText.ELEC_DATA_STATUS].update("Status : Failed")
+        return
+    bob = state.bob
+    state.texts[QOSSTGUIText.ELEC_DATA_STATUS].update("Status : Acquired")
+    if state.values[QOSSTGUIInput.AUTO_EXPORT_DATA]:
+        filename, _ = export_np(
+            bob.electronic_noise,
+            bob.config.bob.export_directory,
+            "elec_data",
+        )
+        state.texts[QOSSTGUIText.LAST_EXPORT].update(filename)
+
+
+def _handle_load_elec_noise(state: GUIState) -> None:
+    """
+    Load electronic noise.
+
+    Args:
+        state (GUIState): the state of the GUI.
+    """
+    if state.bob:
+        state.bob.load_electronic_noise_data()
+        state.texts[QOSSTGUIText.ELEC_DATA_STATUS].update("Status : Loaded")
+    else:
+        sg.popup_ok("Please read configuration first.")
+
+
+def _handle_save_elec_noise(state: GUIState) -> None:
+    """
+    Save electronic noise.
+
+    Args:
+        state (GUIState): the state of the GUI.
+    """
+    bob = state.bob
+    if bob:
+        save, detector, comment = popup_save_electronic_noise(
+            str(bob.config.bob.electronic_noise.path)
+        )
+        if save:
+            bob.save_electronic_noise_data(detector=detector, comment=comment)
+    else:
+        sg.popup_ok("Please read configuration first.")
+
+
+def _handle_acquisition_shot_noise(state: GUIState) -> None:
+    """
+    Acquire electronic and shot noise in a worker thread.
+
+    Args:
+        state (GUIState): the state of the GUI.
+    """
+    if state.bob:
+        _start_long_operation(
+            state,
+            state.bob.get_electronic_shot_noise_data,
+            QOSSTGUIEvents.ACQUISITION_SHOT_NOISE_DONE,
+        )
+    else:
+        sg.popup_ok("Please read configuration first.")
+
+
+def _handle_acquisition_shot_noise_done(state: GUIState) -> None:
+    """
+    Display the status of the electronic and shot noise acquisition.
+
+    Args:
+        state (GUIState): the state of the GUI.
+    """
+    succeeded, _ = _finish_long_operation(
+        state, QOSSTGUIEvents.ACQUISITION_SHOT_NOISE_DONE
+    )
+    if not succeeded:
+        state.texts[QOSSTGUIText.SHOT_DATA_STATUS].update("Status : Failed")
+        return
+    bob = state.bob
+    state.texts[QOSSTGUIText.SHOT_DATA_STATUS].update("Status : Acquired")
+    if state.values[QOSSTGUIInput.AUTO_EXPORT_DATA]:
+        filename, _ = export_np(
+            bob.electronic_shot_noise,
+            bob.config.bob.export_directory,
+            "elec_shot_data",
+        )
+        state.texts[QOSSTGUIText.LAST_EXPORT].update(filename)
+
+
+def _handle_load_shot_noise(state: GUIState) -> None:
+    """
+    Load electronic and shot noise.
+
+    Args:
+        state (GUIState): the state of the GUI.
+    """
+    if state.bob:
+        state.bob.load_electronic_shot_noise_data()
+        state.texts[QOSSTGUIText.SHOT_DATA_STATUS].update("Status : Loaded")
+    else:
+        sg.popup_ok("Please read configuration first.")
+
+
+def _handle_save_shot_noise(state: GUIState) -> None:
+    """
+    Save electronic and shot noise.
+
+    Args:
+        state (GUIState): the state of the GUI.
+    """
+    bob = state.bob
     if bob:
-        bob.close()
+        save, detector, power, comment = popup_save_electronic_shot_noise(
+            bob.config.bob.electronic_shot_noise.path
+        )
+        if save:
+            bob.save_electronic_shot_noise_data(detector, power, comment)
+    else:
+        sg.popup_ok("Please read configuration first.")
+
+
+def _handle_plot_figure(figure: QOSSTBobGUIFigure, state: GUIState) -> None:
+    """
+    Plot a figure.
+
+    Args:
+        figure (QOSSTBobGUIFigure): the figure to plot.
+        state (GUIState): the state of the GUI.
+    """
+    figure.plot(state.bob, force=True)
+
+
+@lru_cache(maxsize=1)
+def _matplotlib() -> Tuple[ModuleType, ModuleType]:
+    """
+    Import matplotlib and pyplot on first use.
+
+    Returns:
+        Tuple[ModuleType, ModuleType]: the matplotlib and matplotlib.pyplot modules.
+    """
+    # pylint: disable=import-outside-toplevel
+    import matplotlib
+    import matplotlib.pyplot as plt
+
+    return matplotlib, plt
+
+
+@lru_cache(maxsize=1)
+def _supported_filetypes() -> Tuple[Tuple[str, str], ...]:
+    """
+    Get the file types supported by matplotlib to save figures.
+
+    Returns:
+        Tuple[Tuple[str, str], ...]: tuple of (extension, description).
+    """
+    _, plt = _matplotlib()
+    return tuple(plt.gcf().canvas.get_supported_filetypes().items())
+
+
+def _handle_save_figure(figure: QOSSTBobGUIFigure, _state: GUIState) -> None:
+    """
+    Ask for a location and save a figure.
+
+    Args:
+        figure (QOSSTBobGUIFigure): the figure to save.
+        _state (GUIState): the state of the GUI.
+    """
+    path = sg.popup_get_file(
+        message="Select location to save figure",
+        save_as=True,
+        file_types=_supported_filetypes(),
+        default_extension=".png",
+    )
+    if path:
+        figure.save(path)
+        logger.info("Figure %s was saved to %s", figure.name, str(path))
+
+
+def _handle_export_elec_noise(state: GUIState) -> None:
+    """
+    Export the electronic noise.
+
+    Args:
+        state (GUIState): the state of the GUI.
+    """
+    filename, _ = export_np(
+        state.bob.electronic_noise.data,
+        state.bob.config.bob.export_directory,
+        "elec_data",
+    )
+    state.texts[QOSSTGUIText.LAST_EXPORT].update(filename)
+
+
+def _handle_export_shot_noise(state: GUIState) -> None:
+    """
+    Export the electronic and shot noise.
+
+    Args:
+        state (GUIState): the state of the GUI.
+    """
+    filename, _ = export_np(
+        state.bob.electronic_shot_noise.data,
+        state.bob.config.bob.export_directory,
+        "elec_shot_data",
+    )
+    state.texts[QOSSTGUIText.LAST_EXPORT].update(filename)
+
+
+def _handle_export_signal(state: GUIState) -> None:
+    """
+    Export the signal data.
+
+    Args:
+        state (GUIState): the state of the GUI.
+    """
+    filename, _ = export_np(
+        state.bob.signal_data, state.bob.config.bob.export_directory, "signal"
+    )
+    state.texts[QOSSTGUIText.LAST_EXPORT].update(filename)
+
+
+def _handle_about(_state: GUIState) -> None:
+    """
+    Display the about popup.
+
+    Args:
+        _state (GUIState): the state of the GUI.
+    """
+    sg.popup_ok(LICENSE_TEXT, title="About")
+
+
+def _handle_select_figure_tab(state: GUIState) -> None:
+    """
+    Create the figure of the selected tab, if it was not already created.
+
+    Args:
+        state (GUIState): the state of the GUI.
+    """
+    figure = FIGURES_BY_TAB_KEY.get(state.values[QOSSTGUIInput.FIGURES_TAB_GROUP])
+    if figure is not None:
+        figure.show()
+
+
+def _handle_select_plot_style(state: GUIState) -> None:
+    """
+    Change the matplotlib style and replot the figures.
+
+    While an operation of Bob is running, the change is delayed
+    until the operation is over, as the figures read the data of Bob.
+
+    Args:
+        state (GUIState): the state of the GUI.
+    """
+    if _bob_actions_locked(state.window):
+        state.plot_style_pending = True
+        return
+    matplotlib, plt = _matplotlib()
+    new_style = state.values[QOSSTGUIInput.SELECT_PLOT_STYLE]
+    logger.info("Resetting to default matplotlib style")
+    matplotlib.rcParams.update(matplotlib.rcParamsDefault)
+    if new_style != "default":
+        logger.info("Using new style for plots: %s", new_style)
+        plt.style.use(plot_styles[new_style])
+    autoplot(state.bob, state.values, force=True)
+
+
+def _handle_exit(state: GUIState) -> None:
+    """
+    Ask to exit the GUI, once the running operation of Bob, if any, is over.
+
+    Args:
+        state (GUIState): the state of the GUI.
+    """
+    state.exit_requested = True
+    if _bob_actions_locked(state.window):
+        logger.info("Waiting for the running operation before exiting.")
+
+
+def _apply_pending(state: GUIState) -> bool:
+    """
+    Apply the plot style change asked while an operation of Bob was running,
+    once it is over, and tell if the GUI should exit.
+
+    Args:
+        state (GUIState): the state of the GUI.
+
+    Returns:
+        bool: True if exit was asked and no operation of Bob is running.
+    """
+    if _bob_actions_locked(state.window):
+        return False
+    if state.plot_style_pending:
+        state.plot_style_pending = False
+        _handle_select_plot_style(state)
+    return state.exit_requested
+
+
+_KEY_BINDINGS: Dict[str, int] = {
+    "<KeyPress-Up>": 38,
+    "<KeyPress-Down>": 40,
+    "<KeyPress-Left>": 37,
+    "<KeyPress-Right>": 39,
+    "<KeyPress-a>": 97,
+    "<KeyPress-b>": 98,
+}  #: Tk bindings of the keys of the sequence, and their number in the sequence.
+
+
+def _key_event(key_ord: int) -> str:
+    """
+    Get the event sent by the window for a key of the sequence.
+
+    Args:
+        key_ord (int): number of the key in the sequence.
+
+    Returns:
+        str: the event.
+    """
+    return f"-KEY-{key_ord}-"
+
+
+def _handle_keyboard(key_ord: int, state: GUIState) -> None:
+    """
+    Follow the keyboard sequence.
+
+    Args:
+        key_ord (int): number of the pressed key.
+        state (GUIState): the state of the GUI.
+    """
+    if key_ord == SEQUENCE[state.sequence_pointer]:
+        state.sequence_pointer += 1
+    else:
+        state.sequence_pointer = 0
+
+    if state.sequence_pointer == len(SEQUENCE):
+        sg.popup_ok(THANKS_STRING.format(release_name=RELEASE_NAME), title="Thanks")
+        state.sequence_pointer = 0
+
+
+HANDLERS: Dict[Any, Handler] = {
+    QOSSTGUIEvents.LOG_FLUSH: _handle_log_flush,
+    QOSSTGUIActions.READ_CONFIGURATION: _handle_read_configuration,
+    QOSSTGUIActions.INITIALIZE_HARDWARE: _handle_initialize_hardware,
+    QOSSTGUIActions.CONNECT: _handle_connect,
+    QOSSTGUIActions.IDENTIFICATION: _handle_identification,
+    QOSSTGUIActions.INITIALIZATION: _handle_initialization,
+    QOSSTGUIEvents.INITIALIZATION_DONE: _handle_initialization_done,
+    QOSSTGUIActions.QIE: _handle_qie,
+    QOSSTGUIEvents.QIE_DONE: _handle_qie_done,
+    QOSSTGUIActions.DSP: _handle_dsp,
+    QOSSTGUIEvents.DSP_DONE: _handle_dsp_done,
+    QOSSTGUIActions.PARAMETERS_ESTIMATION: _handle_parameters_estimation,
+    QOSSTGUIEvents.PARAMETERS_ESTIMATION_DONE: _handle_parameters_estimation_done,
+    QOSSTGUIActions.ERROR_CORRECTION: _handle_error_correction,
+    QOSSTGUIActions.PRIVACY_AMPLITICATION: _handle_privacy_amplification,
+    QOSSTGUIActions.ACQUISITION_ELEC_NOISE: _handle_acquisition_elec_noise,
+    QOSSTGUIEvents.ACQUISITION_ELEC_NOISE_DONE: _handle_acquisition_elec_noise_done,
+    QOSSTGUIActions.LOAD_ELEC_NOISE: _handle_load_elec_noise,
+    QOSSTGUIActions.SAVE_ELEC_NOISE: _handle_save_elec_noise,
+    QOSSTGUIActions.ACQUISITION_SHOT_NOISE: _handle_acquisition_shot_noise,
+    QOSSTGUIEvents.ACQUISITION_SHOT_NOISE_DONE: _handle_acquisition_shot_noise_done,
+    QOSSTGUIActions.LOAD_SHOT_NOISE: _handle_load_shot_noise,
+    QOSSTGUIActions.SAVE_SHOT_NOISE: _handle_save_shot_noise,
+    QOSSTGUIActions.EXPORT_ELEC_NOISE: _handle_export_elec_noise,
+    QOSSTGUIActions.EXPORT_SHOT_NOISE: _handle_export_shot_noise,
+    QOSSTGUIActions.EXPORT_SIGNAL: _handle_export_signal,
+    QOSSTGUIActions.ABOUT: _handle_about,
+    QOSSTGUIActions.EXIT: _handle_exit,
+    QOSSTGUIInput.SELECT_PLOT_STYLE: _handle_select_plot_style,
+    QOSSTGUIInput.FIGURES_TAB_GROUP: _handle_select_figure_tab,
+    QOSSTGUIEvents.AUTOPLOT_PREPARED: _handle_autoplot_prepared,
+}  #: Dispatch table from the events to their handler.
+HANDLERS.update(
+    {
+        key: partial(_handle_plot_figure, figure)
+        for key, figure in FIGURES_BY_PLOT_KEY.items()
+    }
+)
+HANDLERS.update(
+    {
+        key: partial(_handle_save_figure, figure)
+        for key, figure in FIGURES_BY_SAVE_KEY.items()
+    }
+)
+HANDLERS.update(
+    {
+        _key_event(key_ord): partial(_handle_keyboard, key_ord)
+        for key_ord in _KEY_BINDINGS.values()
+    }
+)
+
+
+def _setup_console_logging(gui_console_level: int) -> logging.Formatter:
+    """
+    Set the level of the root logger and add a console handler to it.
+
+    Args:
+        gui_console_level (int): level of the root logger and of the console.
+
+    Returns:
+        logging.Formatter: the formatter used by the console handler.
+    """
+    root_logger.setLevel(gui_console_level)
+
+    formatter = logging.Formatter(
+        "{asctime} - {name} - {levelname} - {message}",
+        datefmt="%Y-%m-%d %H:%M:%S",
+        style="{",
+    )
+
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(gui_console_level)
+    console_handler.setFormatter(formatter)
+
+    root_logger.addHandler(console_handler)
+    return formatter
+
+
+def _setup_gui_logging(
+    window: sg.Window, gui_console_level: int, formatter: logging.Formatter
+) -> Tuple[GUIHandler, logging.handlers.QueueHandler, logging.handlers.QueueListener]:
+    """
+    Send the log records to the logger element of the window.
+
+    The records are put in a queue by the root logger and sent to the
+    GUI handler by a listener thread.
+
+    Args:
+        window (sg.Window): the window containing the logger element.
+        gui_console_level (int): level of the GUI handler.
+        formatter (logging.Formatter): formatter of the GUI handler.
+
+    Returns:
+        Tuple[GUIHandler, logging.handlers.QueueHandler, logging.handlers.QueueListener]: the GUI handler, the queue handler added to the root logger and the started listener.
+    """
+    gui_handler = GUIHandler(window=window)
+    gui_handler.setLevel(gui_console_level)
+    gui_handler.setFormatter(formatter)
+
+    log_queue: queue.Queue = queue.Queue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setLevel(gui_console_level)
+    root_logger.addHandler(queue_handler)
+    queue_listener = logging.handlers.QueueListener(
+        log_queue, gui_handler, respect_handler_level=True
+    )
+    queue_listener.start()
+    return gui_handler, queue_handler, queue_listener
+
+
+def main():
+    """
+    Main entrypoint for the GUI.
+    """
+    args = _create_parser().parse_args()
+
+    gui_console_level = verbose_to_log_level(args.verbose)
+
+    formatter = _setup_console_logging(gui_console_level)
+
+    # Create the window
+    window = sg.Window(
+        "QOSST Bob",
+        layout,
+        resizable=True,
+        finalize=True,
+        element_justification="c",
+        use_default_focus=False,
+    )
+
+    for binding, key_ord in _KEY_BINDINGS.items():
+        window.bind(binding, _key_event(key_ord))
+
+    gui_handler, queue_handler, queue_listener = _setup_gui_logging(
+        window, gui_console_level, formatter
+    )
+
+    sg.theme(THEME)
+
+    for figure in all_figures:
+        figure.init_figure(window)
+    # The other figures are created when their tab is selected.
+    all_figures[0].show()
+
+    window[QOSSTGUIText.LOGGER].expand(True, True)
+
+    window[QOSSTGUIText.LOGGER].print(get_script_infos(motd=False))
+
+    state = GUIState(
+        window=window,
+        texts={key: window[key] for key in QOSSTGUIText},
+        gui_handler=gui_handler,
+        formatter=formatter,
+        gui_console_level=gui_console_level,
+    )
+
+    # Create an event loop
+    while True:
+        event, state.values = window.read()
+        if event == sg.WIN_CLOSED:
+            break
+        handler = HANDLERS.get(event)
+        if handler is not None:
+            handler(state)
+        if _apply_pending(state):
+            break
+    if state.worker is not None:
+        state.worker.join()
+    if state.bob:
+        state.bob.close()
+
+    for popup_window in _popup_windows.values():
+        popup_window.close()
+
+    if state.file_handler is not None:
+        root_logger.removeHandler(state.file_handler)
+        state.file_handler.close()
+        state.file_handler.target.close()
 
+    root_logger.removeHandler(queue_handler)
+    queue_listener.stop()
     window.close()
 
 
@@ -31,55 +31,294 @@ checkboxes required.
 
 This list will also be imported in the gui to detect the different events.
 """
-from typing import Callable, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
 from os import PathLike
-import gc
+from functools import lru_cache
+import sys
+import threading
+import weakref
 
 import numpy as np
-from scipy import fftpack
 import matplotlib.pyplot as plt
 from matplotlib.axes import Axes
 from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import FreeSimpleGUI as sg
 
 from qosst_bob.bob import Bob
 from qosst_bob.utils import heatmap_complex
 
+if TYPE_CHECKING:
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+#: Cache of the computations of the figures, keyed by the function, the data
+#: generation of Bob and the arguments, where arrays are replaced by their id.
+#: Only weak references to the arrays are kept, to check that the ids were not reused.
+_compute_cache: Dict[Tuple[Any, ...], Tuple[List[weakref.ref], Any]] = {}
+#: Lock of the cache, used by the GUI and worker threads.
+_compute_cache_lock = threading.Lock()
+_COMPUTE_CACHE_SIZE = 8  #: Maximal number of results kept in the cache.
+
+
+def _arrays(args: Tuple[Any, ...]) -> List[np.ndarray]:
+    """
+    Get the arrays in the arguments, including the arrays in tuples.
+
+    Args:
+        args (Tuple[Any, ...]): the arguments.
+
+    Returns:
+        List[np.ndarray]: the arrays, in order.
+    """
+    arrays = []
+    for arg in args:
+        if isinstance(arg, tuple):
+            arrays.extend(_arrays(arg))
+        elif isinstance(arg, np.ndarray):
+            arrays.append(arg)
+    return arrays
+
+
+def _cache_key(arg: Any) -> Any:
+    """
+    Get the part of the cache key corresponding to an argument.
+
+    Args:
+        arg (Any): the argument.
+
+    Returns:
+        Any: the id of the argument if it is an array, the tuple of the keys of its elements if it is a tuple, and the argument itself otherwise.
+    """
+    if isinstance(arg, np.ndarray):
+        return id(arg)
+    if isinstance(arg, tuple):
+        return tuple(_cache_key(element) for element in arg)
+    return arg
+
+
+def _cached(generation: int, func: Callable[..., Any], *args: Any) -> Any:
+    """
+    Call func with args, or return the cached result if func was already
+    called with the same arrays and the same other arguments.
+
+    This is meant for the expensive computations of the figures, that can be
+    done in a worker thread by the prepare functions and are then only
+    retrieved by the plot functions in the GUI thread.
+
+    The results of older data generations are removed when a result of a
+    newer generation is cached.
+
+    Args:
+        generation (int): the data generation of Bob.
+        func (Callable[..., Any]): the function to call.
+        *args (Any): the arguments of the function.
+
+    Returns:
+        Any: the result of the function.
+    """
+    key = (func, generation, _cache_key(args))
+    arrays = _arrays(args)
+    with _compute_cache_lock:
+        cached = _compute_cache.get(key)
+    if cached is not None and all(
+        ref() is array for ref, array in zip(cached[0], arrays)
+    ):
+        return cached[1]
+    result = func(*args)
+    with _compute_cache_lock:
+        for old_key in [
+            old_key for old_key in _compute_cache if old_key[1] < generation
+        ]:
+            del _compute_cache[old_key]
+        if len(_compute_cache) >= _COMPUTE_CACHE_SIZE:
+            del _compute_cache[next(iter(_compute_cache))]
+        _compute_cache[key] = ([weakref.ref(array) for array in arrays], result)
+    return result
+
+
+def _minmax_decimate(data: np.ndarray, target: int = 4000) -> np.ndarray:
+    """
+    Decimate the data for display by keeping the minimum and the maximum
+    of each of the target blocks, so that the envelope of the signal is preserved.
+
+    If the data has less than 2*target points, it is returned as is.
+
+    Args:
+        data (np.ndarray): the data to decimate.
+        target (int, optional): the number of blocks. Defaults to 4000.
+
+    Returns:
+        np.ndarray: the decimated data.
+    """
+    if len(data) < 2 * target:
+        return data
+    block = len(data) // target
+    blocks = data[: block * target].reshape(target, block)
+    return np.stack((blocks.min(axis=1), blocks.max(axis=1)), axis=1).ravel()
+
+
+@lru_cache(maxsize=4)
+def _decimated_times(length: int, rate: float, target: int = 4000) -> np.ndarray:
+    """
+    Get the times of the points returned by _minmax_decimate for
+    data of the given length.
+
+    The result is cached, and is read-only.
+
+    Args:
+        length (int): the length of the data before decimation.
+        rate (float): the sampling rate of the data.
+        target (int, optional): the number of blocks. Defaults to 4000.
+
+    Returns:
+        np.ndarray: the times of the decimated data.
+    """
+    if length < 2 * target:
+        times = np.arange(length) / rate
+    else:
+        times = np.repeat(np.arange(target) * (length // target), 2) / rate
+    times.flags.writeable = False
+    return times
+
+
+def prepare_temporal(bob: Bob) -> None:
+    """
+    Compute the decimated data of the temporal plot in the cache.
+
+    Args:
+        bob (Bob): Bob object.
+    """
+    if bob.signal_data is not None:
+        _cached(bob.data_generation, _minmax_decimate, bob.signal_data[0])
+
 
 def plot_temporal(bob: Optional[Bob], axes: Axes) -> None:
     """
     Plot the acquired data as a function of time.
 
+    When bob is None, only the labels, the title and the grid of the axes are set.
+    Otherwise, the data is plotted on axes that already have them.
+
     Args:
         bob (Bob): Bob object.
         axes (Axes): the axes where to plot the data.
     """
-    if bob is not None:
-        assert bob.config is not None and bob.config.bob is not None
-        axes.clear()
-
-        if bob.signal_data is not None:
-            data = bob.signal_data[0]
-            times = np.arange(len(data)) / bob.config.bob.adc.rate
-            axes.plot(times, data)
-
-        if bob.end_electronic_shot_noise:
-            axes.axvline(x=times[bob.end_electronic_shot_noise], color="red")
-        if bob.begin_data and bob.end_electronic_shot_noise:
-            axes.axvline(
-                x=times[bob.begin_data + bob.end_electronic_shot_noise],
-                color="black",
-            )
-        if bob.end_data and bob.end_electronic_shot_noise:
-            axes.axvline(
-                x=times[bob.end_data + bob.end_electronic_shot_noise],
-                color="black",
-            )
-    axes.set_xlabel("Time [s]")
-    axes.set_ylabel("Output [mV]")
-    axes.set_title("Output vs. time")
-    axes.grid(True)
+    if bob is None:
+        axes.set_xlabel("Time [s]")
+        axes.set_ylabel("Output [mV]")
+        axes.set_title("Output vs. time")
+        axes.grid(True)
+        return
+
+    assert bob.config is not None and bob.config.bob is not None
+
+    rate = bob.config.bob.adc.rate
+    if bob.signal_data is not None:
+        data = bob.signal_data[0]
+        axes.plot(
+            _decimated_times(len(data), rate),
+            _cached(bob.data_generation, _minmax_decimate, data),
+        )
+
+    if bob.end_electronic_shot_noise:
+        axes.axvline(x=bob.end_electronic_shot_noise / rate, color="red")
+    if bob.begin_data and bob.end_electronic_shot_noise:
+        axes.axvline(
+            x=(bob.begin_data + bob.end_electronic_shot_noise) / rate,
+            color="black",
+        )
+    if bob.end_data and bob.end_electronic_shot_noise:
+        axes.axvline(
+            x=(bob.end_data + bob.end_electronic_shot_noise) / rate,
+            color="black",
+        )
+
+
+def _welch_psds(
+    traces: Tuple[np.ndarray, ...], rate: float, nperseg: int = 2048
+) -> Tuple[np.ndarray, List[np.ndarray]]:
+    """
+    Estimate the one-sided Power Spectral Densities of several traces
+    with the Welch method, using a Hann window on segments of nperseg
+    points without overlap nor detrend.
+
+    The segments of all the traces are transformed in a single batched FFT,
+    and then averaged trace by trace, giving the same result as
+    scipy.signal.welch applied on each trace. Traces shorter than nperseg
+    are zero-padded.
+
+    Args:
+        traces (Tuple[np.ndarray, ...]): the real traces.
+        rate (float): the sampling rate of the traces.
+        nperseg (int, optional): the length of the segments. Defaults to 2048.
+
+    Returns:
+        Tuple[np.ndarray, List[np.ndarray]]: the frequencies and the PSD of each trace.
+    """
+    # scipy is only imported when a PSD is plotted.
+    # pylint: disable=import-outside-toplevel
+    from scipy.fft import rfft, rfftfreq
+    from scipy.signal import get_window
+
+    segments = []
+    for trace in traces:
+        # Single precision is enough for display and halves the memory traffic.
+        trace = np.asarray(trace, dtype=np.float32)
+        if len(trace) < nperseg:
+            trace = np.pad(trace, (0, nperseg - len(trace)))
+        num_segments = len(trace) // nperseg
+        segments.append(trace[: num_segments * nperseg].reshape(num_segments, nperseg))
+    bounds = np.cumsum([0] + [len(segment) for segment in segments])
+
+    window = get_window("hann", nperseg).astype(np.float32)
+    spectra = rfft(np.concatenate(segments) * window, axis=-1, workers=-1)
+    powers = np.real(spectra) ** 2 + np.imag(spectra) ** 2
+
+    scale = np.full(powers.shape[1], 2 / (rate * np.sum(window**2)))
+    scale[0] /= 2
+    if nperseg % 2 == 0:
+        scale[-1] /= 2
+    psds = [
+        powers[begin:end].mean(axis=0) * scale
+        for begin, end in zip(bounds[:-1], bounds[1:])
+    ]
+    return rfftfreq(nperseg, 1 / rate), psds
+
+
+def _frequential_traces(bob: Bob) -> Tuple[Tuple[np.ndarray, ...], List[str]]:
+    """
+    Get the available traces for the frequential plot, with their labels.
+
+    Args:
+        bob (Bob): Bob object.
+
+    Returns:
+        Tuple[Tuple[np.ndarray, ...], List[str]]: the traces and their labels.
+    """
+    traces = []
+    labels = []
+    if bob.signal_data is not None:
+        traces.append(bob.signal_data[0])
+        labels.append("Signal")
+    if bob.electronic_noise is not None:
+        traces.append(bob.electronic_noise.data[0])
+        labels.append("Electronic noise")
+    if bob.electronic_shot_noise is not None:
+        traces.append(bob.electronic_shot_noise.data[0])
+        labels.append("Electronic and shot noise")
+    return tuple(traces), labels
+
+
+def prepare_frequential(bob: Bob) -> None:
+    """
+    Compute the PSDs of the frequential plot in the cache.
+
+    Args:
+        bob (Bob): Bob object.
+    """
+    assert bob.config is not None and bob.config.bob is not None
+    traces, _ = _frequential_traces(bob)
+    if traces:
+        _cached(bob.data_generation, _welch_psds, traces, bob.config.bob.adc.rate)
 
 
 def plot_frequential(bob: Optional[Bob], axes: Axes) -> None:
@@ -87,135 +326,263 @@ def plot_frequential(bob: Optional[Bob], axes: Axes) -> None:
     Plot the Power Spectral Density of the received data
     and, if available, of the shot noise and electronic noise.
 
+    When bob is None, only the labels, the title and the grid of the axes are set.
+    Otherwise, the data is plotted on axes that already have them.
+
     Args:
         bob (Bob): Bob object.
         axes (Axes): the axes where to plot the data.
     """
-    if bob is not None:
-        assert bob.config is not None and bob.config.bob is not None
-
-        axes.clear()
-        if bob.signal_data is not None:
-            axes.psd(
-                bob.signal_data[0],
-                NFFT=2048,
-                Fs=bob.config.bob.adc.rate,
-                label="Signal",
-            )
-
-        if bob.electronic_noise is not None:
-            axes.psd(
-                bob.electronic_noise.data[0],
-                NFFT=2048,
-                Fs=bob.config.bob.adc.rate,
-                label="Electronic noise",
-            )
-        if bob.electronic_shot_noise is not None:
-            axes.psd(
-                bob.electronic_shot_noise.data[0],
-                NFFT=2048,
-                Fs=bob.config.bob.adc.rate,
-                label="Electronic and shot noise",
-            )
-        if bob.config.bob.dsp.exclusion_zone_pilots is not None:
-            for begin_zone, end_zone in bob.config.bob.dsp.exclusion_zone_pilots:
-                axes.axvspan(begin_zone, end_zone, alpha=0.3, color="black")
-        axes.legend(fancybox=True, shadow=True)
-    axes.set_xlabel("Frequency [Hz]")
-    axes.set_ylabel("Power Spectral Density [dBm/Hz]")
-    axes.set_title("PSD vs. frequency")
-    axes.grid(True)
+    if bob is None:
+        axes.set_xlabel("Frequency [Hz]")
+        axes.set_ylabel("Power Spectral Density [dBm/Hz]")
+        axes.set_title("PSD vs. frequency")
+        axes.grid(True)
+        return
+
+    assert bob.config is not None and bob.config.bob is not None
+
+    traces, labels = _frequential_traces(bob)
+    if traces:
+        freqs, psds = _cached(
+            bob.data_generation, _welch_psds, traces, bob.config.bob.adc.rate
+        )
+        for psd, label in zip(psds, labels):
+            axes.plot(freqs, 10 * np.log10(psd), label=label)
+    if bob.config.bob.dsp.exclusion_zone_pilots is not None:
+        for begin_zone, end_zone in bob.config.bob.dsp.exclusion_zone_pilots:
+            axes.axvspan(begin_zone, end_zone, alpha=0.3, color="black")
+    axes.legend(fancybox=True, shadow=True)
+
+
+def _fft_magnitude(data: np.ndarray, rate: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Get the non-negative frequencies and the magnitude of the FFT of the data,
+    decimated for display.
+
+    As the data is real, the negative frequencies are the mirror of the
+    positive ones and are not computed. The magnitude is computed in place
+    of the real part of the spectrum and min/max decimated as the temporal plot,
+    so that only the decimated points are kept and plotted.
+
+    Args:
+        data (np.ndarray): the real data.
+        rate (float): the sampling rate of the data.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: the frequencies and the magnitude of the FFT.
+    """
+    # scipy.fft is only imported when a FFT is plotted.
+    # pylint: disable=import-outside-toplevel
+    from scipy.fft import rfft
+
+    # Single precision is enough for display and halves the memory traffic.
+    spectrum = rfft(np.ascontiguousarray(data, dtype=np.float32), workers=-1)
+    # np.real is a view of the complex spectrum: the magnitude is written in place.
+    magnitude = np.abs(spectrum, out=np.real(spectrum))
+    # The frequency of the bin i is i * rate / len(data).
+    data_fftfreq = _decimated_times(len(magnitude), len(data) / rate)
+    data_fft = np.array(_minmax_decimate(magnitude))
+    return data_fftfreq, data_fft
+
+
+def prepare_fft(bob: Bob) -> None:
+    """
+    Compute the FFT of the FFT plot in the cache.
+
+    Args:
+        bob (Bob): Bob object.
+    """
+    assert bob.config is not None and bob.config.bob is not None
+    if bob.signal_data is not None:
+        _cached(
+            bob.data_generation,
+            _fft_magnitude,
+            bob.signal_data[0],
+            bob.config.bob.adc.rate,
+        )
 
 
 def plot_fft(bob: Optional[Bob], axes: Axes) -> None:
     """
     Plot the FFT of the acquired data.
 
+    When bob is None, only the labels, the title and the grid of the axes are set.
+    Otherwise, the data is plotted on axes that already have them.
+
     Args:
         bob (Bob): Bob object.
         axes (Axes): the axes where to plot the data.
     """
-    if bob is not None:
-        assert bob.config is not None and bob.config.bob is not None
+    if bob is None:
+        axes.set_xlabel("Frequency [Hz]")
+        axes.set_ylabel("FFT")
+        axes.set_title("FFT")
+        axes.grid(True)
+        return
+
+    assert bob.config is not None and bob.config.bob is not None
+
+    if bob.signal_data is not None:
+        data = bob.signal_data[0]
+        data_fftfreq, data_fft = _cached(
+            bob.data_generation, _fft_magnitude, data, bob.config.bob.adc.rate
+        )
+        axes.plot(data_fftfreq, data_fft)
+
+
+def _subsample(data: np.ndarray, size: int = 200_000) -> np.ndarray:
+    """
+    Randomly subsample the data for a heatmap if it has more than size points.
+
+    Above a few hundred thousands points, the density of the heatmap does not
+    visibly change. The random generator is seeded, so that the same data
+    always gives the same heatmap.
+
+    Args:
+        data (np.ndarray): the data to subsample.
+        size (int, optional): the maximal number of points. Defaults to 200_000.
 
-        axes.clear()
-        if bob.signal_data is not None:
-            data = bob.signal_data[0]
-            data_fft = fftpack.fft(data)
-            data_fftfreq = fftpack.fftfreq(len(data), 1 / bob.config.bob.adc.rate)
-            axes.plot(data_fftfreq, data_fft)
-    axes.set_xlabel("Frequency [Hz]")
-    axes.set_ylabel("FFT")
-    axes.set_title("FFT")
-    axes.grid(True)
+    Returns:
+        np.ndarray: the subsampled data.
+    """
+    if data.size <= size:
+        return data
+    return data[np.random.default_rng(0).integers(0, data.size, size)]
 
 
 def plot_tone(bob: Optional[Bob], axes: Axes) -> None:
     """
     Plot the recovered tone.
 
+    When bob is None, only the labels, the title and the grid of the axes are set.
+    Otherwise, the data is plotted on axes that already have them.
+
     Args:
         bob (Bob): Bob object.
         axes (Axes): the axes where to plot the data.
     """
-    if bob is not None and bob.received_tone is not None:
-        heatmap_complex(bob.received_tone, "I", "Q", "Tone", axes=axes, clear=True)
-    else:
+    if bob is None:
         axes.set_xlabel("I")
         axes.set_ylabel("Q")
         axes.set_title("Tone")
         axes.grid(True)
+    elif bob.received_tone is not None:
+        heatmap_complex(
+            _subsample(bob.received_tone),
+            "I",
+            "Q",
+            "Tone",
+            axes=axes,
+            clear=False,
+        )
 
 
 def plot_quantum_data(bob: Optional[Bob], axes: Axes) -> None:
     """
     Plot the uncorrected quantum data.
 
+    When bob is None, only the labels, the title and the grid of the axes are set.
+    Otherwise, the data is plotted on axes that already have them.
+
     Args:
         bob (Bob): Bob object.
         axes (Axes): the axes where to plot the data.
     """
-    if bob is not None and bob.quantum_data_phase_noisy is not None:
+    if bob is None:
+        axes.set_xlabel("I")
+        axes.set_ylabel("Q")
+        axes.set_title("Quantum data")
+        axes.grid(True)
+    elif bob.quantum_data_phase_noisy is not None:
         heatmap_complex(
-            bob.quantum_data_phase_noisy,
+            _subsample(bob.quantum_data_phase_noisy),
             "I",
             "Q",
             "Quantum data",
             axes=axes,
-            clear=True,
+            clear=False,
         )
-    else:
-        axes.set_xlabel("I")
-        axes.set_ylabel("Q")
-        axes.set_title("Quantum data")
-        axes.grid(True)
 
 
 def plot_recovered(bob: Optional[Bob], axes: Axes) -> None:
     """
     Plot the corrected quantum data.
 
+    When bob is None, only the labels, the title and the grid of the axes are set.
+    Otherwise, the data is plotted on axes that already have them.
+
     Args:
         bob (Bob): Bob object.
         axes (Axes): the axes where to plot the data.
     """
-    if bob is not None and bob.quantum_symbols is not None:
+    if bob is None:
+        axes.set_xlabel("I")
+        axes.set_ylabel("Q")
+        axes.set_title("Recovered symbols")
+        axes.grid(True)
+    elif bob.quantum_symbols is not None:
         heatmap_complex(
-            bob.quantum_symbols,
+            _subsample(bob.quantum_symbols),
             "I",
             "Q",
             "Recovered symbols",
             axes=axes,
-            clear=True,
+            clear=False,
         )
-    else:
-        axes.set_xlabel("I")
-        axes.set_ylabel("Q")
-        axes.set_title("Recovered symbols")
-        axes.grid(True)
 
 
-def draw_figure(canvas: sg.Canvas, figure: Figure) -> FigureCanvasTkAgg:
+def _data_reference(value: Any) -> Any:
+    """
+    Get a reference to an attribute of Bob used by a plot, that does not keep it alive.
+
+    Args:
+        value (Any): the attribute of Bob.
+
+    Returns:
+        Any: a weak reference to the value if it supports them, its id otherwise.
+    """
+    try:
+        return weakref.ref(value)
+    except TypeError:
+        return id(value)
+
+
+def _is_referenced(value: Any, reference: Any) -> bool:
+    """
+    Check if value is the object referenced by a reference returned by _data_reference.
+
+    Args:
+        value (Any): the attribute of Bob.
+        reference (Any): the reference returned by _data_reference.
+
+    Returns:
+        bool: True if the value is the referenced object.
+    """
+    if isinstance(reference, weakref.ref):
+        return reference() is value
+    return reference == id(value)
+
+
+def _remove_artists(axes: Axes) -> None:
+    """
+    Remove the plotted artists of the axes and the legend,
+    but keep the labels, the title and the grid.
+
+    The images and their colorbars are also kept, as the heatmaps
+    update them in place.
+
+    Args:
+        axes (Axes): the axes to clean.
+    """
+    for artist in [*axes.lines, *axes.collections, *axes.patches]:
+        artist.remove()
+    legend = axes.get_legend()
+    if legend is not None:
+        legend.remove()
+
+
+def draw_figure(canvas: sg.Canvas, figure: Figure) -> "FigureCanvasTkAgg":
     """
     Creates and returns canvas to draw the figure on the GUI.
 
@@ -226,6 +593,10 @@ def draw_figure(canvas: sg.Canvas, figure: Figure) -> FigureCanvasTkAgg:
     Returns:
         FigureCanvasTkAgg: the tk canvas of the figure.
     """
+    # The Tk backend is only imported when the first figure is drawn.
+    # pylint: disable=import-outside-toplevel
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
     figure_canvas_agg = FigureCanvasTkAgg(figure, canvas)
     figure_canvas_agg.draw()
     figure_canvas_agg.get_tk_widget().pack(side="top", fill="both", expand=1)
@@ -243,61 +614,132 @@ class QOSSTBobGUIFigure:
     plot_key: str  #: The key of the plot button.
     autoplot_key: str  #: The key of the autoplot checkbox.
     save_key: str  #: The key of the save button.
+    tab_key: str  #: The key of the tab of the figure.
+    tk_canvas: Optional[Any]  #: The Tk canvas of the tab, where the figure is drawn.
     figure: Optional[Figure]  #: The matoplotlib figures.
     axes: Optional[Axes]  #: The matplotlib axes.
-    canvas: Optional[FigureCanvasTkAgg]  #: The canvas to display in the GUI.
+    canvas: Optional["FigureCanvasTkAgg"]  #: The canvas to display in the GUI.
     func: Callable[[Optional[Bob], Axes], None]  #: The function to plot the content.
     default_autoplot: bool  #: The default value of the autoplot checkbox.
+    #: The function returning the attributes of Bob used by the plot.
+    data: Callable[[Bob], Tuple[Any, ...]]
+    #: The function doing the expensive computations of the plot, that can run in a worker thread.
+    prepare_func: Optional[Callable[[Bob], None]]
+    #: The data generation of Bob and the references to the attributes of Bob used by the last plot.
+    _last_data: Optional[Tuple[Optional[int], Tuple[Any, ...]]]
 
     def __init__(
         self,
         name: str,
         func: Callable[[Optional[Bob], Axes], None],
+        data: Callable[[Bob], Tuple[Any, ...]],
         default_autoplot: bool = False,
+        prepare_func: Optional[Callable[[Bob], None]] = None,
     ) -> None:
         """
         Args:
             name (str): name of the figure.
             func (Callable[[Bob, Axes], None]): function to call to plot the figure.
+            data (Callable[[Bob], Tuple[Any, ...]]): function returning the attributes of Bob used by the plot, to skip the plot if they did not change.
             default_autoplot (bool, optional): default value of the autoplot checkbox.. Defaults to False.
+            prepare_func (Optional[Callable[[Bob], None]], optional): function doing the expensive computations of the plot, without touching matplotlib. Defaults to None.
         """
         self.name = name
-        self.key = f"-FIG-{self.name.upper()}-"
-        self.plot_key = f"-PLOT-FIG-{self.name.upper()}-"
-        self.save_key = f"-SAVE-FIG-{self.name.upper()}-"
-        self.autoplot_key = f"-AUTOPLOT-FIG-{self.name.upper()}"
+        # The keys are interned as they are looked up on every event of the GUI.
+        self.key = sys.intern(f"-FIG-{self.name.upper()}-")
+        self.plot_key = sys.intern(f"-PLOT-FIG-{self.name.upper()}-")
+        self.save_key = sys.intern(f"-SAVE-FIG-{self.name.upper()}-")
+        self.autoplot_key = sys.intern(f"-AUTOPLOT-FIG-{self.name.upper()}")
+        self.tab_key = sys.intern(f"-TAB-FIG-{self.name.upper()}-")
+        self.tk_canvas = None
         self.figure = None
         self.axes = None
         self.canvas = None
         self.func = func
+        self.data = data
         self.default_autoplot = default_autoplot
+        self.prepare_func = prepare_func
+        self._last_data = None
 
     def init_figure(self, window: sg.Window):
         """
-        Initialize the figure, the axes and make a dummy plot.
+        Initialize the figure by getting the canvas where it will be drawn.
+
+        The matplotlib figure itself is only created when it is first shown,
+        plotted or saved.
 
         Args:
             window (sg.Window): GUI window.
         """
+        self.tk_canvas = window[self.key].TKCanvas
+
+    def show(self):
+        """
+        Create the figure, the axes and make a dummy plot, if it was not already done.
+        """
+        if self.tk_canvas is None:
+            raise TypeError("Figure was not initialized.")
+        if self.figure is not None:
+            return
         self.figure = plt.figure()
         self.axes = self.figure.add_subplot()
         self.func(None, self.axes)
-        self.canvas = draw_figure(window[self.key].TKCanvas, self.figure)
+        self.canvas = draw_figure(self.tk_canvas, self.figure)
 
-    def plot(self, bob: Bob):
+    def prepare(self, bob: Bob):
         """
-        Actualise the plot
+        Do the expensive computations of the plot, so that the next plot
+        only has to draw.
+
+        This does not use matplotlib nor the GUI and can be called from a worker thread.
 
         Args:
             bob (Bob): Bob object.
         """
-        if self.figure is None or self.canvas is None:
-            raise TypeError("Figure was not initialized.")
-        self.figure.clear()
-        gc.collect()  # Call the garbage collector to free the memory of the cleared figure.
-        self.axes = self.figure.add_subplot()
+        if self.prepare_func is not None:
+            self.prepare_func(bob)
+
+    def plot(self, bob: Bob, force: bool = False):
+        """
+        Actualise the plot.
+
+        The plot is skipped if the attributes of Bob used by the plot
+        are the same objects as for the last plot, unless force is True.
+        Only references to these attributes are kept between plots.
+        The axes are reused between plots, with their labels, title and grid:
+        only the plotted artists are removed. They are recreated if force is True.
+
+        Args:
+            bob (Bob): Bob object.
+            force (bool, optional): if True, always plot on new axes. Defaults to False.
+        """
+        self.show()
+        assert self.figure is not None and self.canvas is not None
+        data = (bob,) if bob is None else (bob, *self.data(bob))
+        # Only references are kept, so that the previous acquisitions are not
+        # kept alive by the figures. The ids of the attributes that do not
+        # support weak references are only compared within a data generation.
+        generation = None if bob is None else bob.data_generation
+        if (
+            not force
+            and self._last_data is not None
+            and self._last_data[0] == generation
+            and len(data) == len(self._last_data[1])
+            and all(map(_is_referenced, data, self._last_data[1]))
+        ):
+            return
+        self._last_data = (generation, tuple(map(_data_reference, data)))
+        if self.axes is None or force:
+            # Recreate the axes, so that a new style is taken into account.
+            self.figure.clear()
+            self.axes = self.figure.add_subplot()
+            self.func(None, self.axes)
+        else:
+            _remove_artists(self.axes)
         self.func(bob, self.axes)
-        self.canvas.draw()
+        self.axes.relim()
+        self.axes.autoscale_view()
+        self.canvas.draw_idle()
 
     def save(self, path: PathLike):
         """
@@ -306,16 +748,48 @@ class QOSSTBobGUIFigure:
         Args:
             path (PathLike): path to save the figure.
         """
-        if self.figure is None:
-            raise TypeError("Figure was not initialized.")
+        self.show()
+        assert self.figure is not None
         self.figure.savefig(path)
 
 
 all_figures = [
-    QOSSTBobGUIFigure("temporal", plot_temporal, default_autoplot=True),
-    QOSSTBobGUIFigure("frequential", plot_frequential, default_autoplot=True),
-    QOSSTBobGUIFigure("fft", plot_fft),
-    QOSSTBobGUIFigure("tone", plot_tone, default_autoplot=True),
-    QOSSTBobGUIFigure("uncorrected", plot_quantum_data),
-    QOSSTBobGUIFigure("recovered", plot_recovered),
+    QOSSTBobGUIFigure(
+        "temporal",
+        plot_temporal,
+        lambda bob: (
+            bob.signal_data,
+            bob.end_electronic_shot_noise,
+            bob.begin_data,
+            bob.end_data,
+            bob.config,
+        ),
+        default_autoplot=True,
+        prepare_func=prepare_temporal,
+    ),
+    QOSSTBobGUIFigure(
+        "frequential",
+        plot_frequential,
+        lambda bob: (
+            bob.signal_data,
+            bob.electronic_noise,
+            bob.electronic_shot_noise,
+            bob.config,
+        ),
+        default_autoplot=True,
+        prepare_func=prepare_frequential,
+    ),
+    QOSSTBobGUIFigure(
+        "fft",
+        plot_fft,
+        lambda bob: (bob.signal_data, bob.config),
+        prepare_func=prepare_fft,
+    ),
+    QOSSTBobGUIFigure(
+        "tone", plot_tone, lambda bob: (bob.received_tone,), default_autoplot=True
+    ),
+    QOSSTBobGUIFigure(
+        "uncorrected", plot_quantum_data, lambda bob: (bob.quantum_data_phase_noisy,)
+    ),
+    QOSSTBobGUIFigure("recovered", plot_recovered, lambda bob: (bob.quantum_symbols,)),
 ]  #: List of all figures of the GUI.
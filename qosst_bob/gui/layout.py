@@ -241,7 +241,7 @@ for figure in all_figures:
         ],
     ]
     figures_tab_group_layout.append(
-        sg.Tab(figure.name.capitalize(), tab),
+        sg.Tab(figure.name.capitalize(), tab, key=figure.tab_key),
     )
 
     autoplot_figures.append(
@@ -279,6 +279,8 @@ second_column = [
     [
         sg.TabGroup(
             [figures_tab_group_layout],
+            key=QOSSTGUIInput.FIGURES_TAB_GROUP,
+            enable_events=True,
         )
     ],
     [sg.HorizontalSeparator()],
@@ -28,7 +28,7 @@ LOGO_LOCATION = Path(__file__).parent / "logo.png"
 
 THEME = "DarkGrey14"  #: The used theme.
 
-SEQUENCE = [38, 38, 40, 40, 37, 39, 37, 39, 98, 97]
+SEQUENCE = (38, 38, 40, 40, 37, 39, 37, 39, 98, 97)
 
 LICENSE_TEXT = """
 qosst-bob - Bob module of the Quantum Open Software for Secure Transmissions.
@@ -139,3 +139,19 @@ class QOSSTGUIInput(QOSSTGUIContent):
     CONFIGURATION_PATH = "-CONFIGURATION-PATH-"
     AUTO_EXPORT_DATA = "-AUTO-EXPORT-DATA-"
     SELECT_PLOT_STYLE = "-SELECT-PLOPT-STYLE-"
+    FIGURES_TAB_GROUP = "-FIGURES-TAB-GROUP-"
+
+
+class QOSSTGUIEvents(Enum):
+    """
+    Enumeration of internal events of the GUI (i.e. not triggered by an element).
+    """
+
+    LOG_FLUSH = "-LOG-FLUSH-"
+    INITIALIZATION_DONE = "-INITIALIZATION-DONE-"
+    QIE_DONE = "-QIE-DONE-"
+    DSP_DONE = "-DSP-DONE-"
+    PARAMETERS_ESTIMATION_DONE = "-PARAMETERS-ESTIMATION-DONE-"
+    ACQUISITION_ELEC_NOISE_DONE = "-ACQUISITION-ELEC-NOISE-DONE-"
+    ACQUISITION_SHOT_NOISE_DONE = "-ACQUISITION-SHOT-NOISE-DONE-"
+    AUTOPLOT_PREPARED = "-AUTOPLOT-PREPARED-"
@@ -4,13 +4,17 @@ Util functions for the plot.
 
 from typing import Dict
 from pathlib import Path
+from functools import lru_cache
 
 
+@lru_cache(maxsize=1)
 def get_styles() -> Dict[str, Path]:
     """
     Get the matplotlib available styles from the polt_styles directory
     and return a dict of names and paths.
 
+    The directory is only scanned on the first call.
+
     Returns:
         Dict[str, Path]: dict, key being the name of style and the value being the path.
     """
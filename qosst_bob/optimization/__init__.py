@@ -21,11 +21,48 @@ Also contains the Updater abstract class.
 """
 import abc
 import argparse
-from typing import Dict
+import logging
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, ClassVar, Dict, List, Optional, Tuple
 
+import numpy as np
 from qosst_core.configuration import Configuration
 
 from qosst_bob.bob import Bob
+from qosst_bob.sweep import linear_sweep
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ArgSpec:
+    """
+    Specification of a command line argument of an updater.
+    """
+
+    name: str  #: Name of the argument, starting with -- for an optional argument.
+    help: str  #: Help of the argument.
+    type: Optional[type] = None  #: Type of the argument.
+    nargs: Optional[Any] = None  #: Number of values of the argument.
+    aliases: Tuple[str, ...] = ()  #: Other names of an optional argument.
+    options: Dict[str, Any] = field(
+        default_factory=dict
+    )  #: Other keyword arguments of add_argument (default, action, ...).
+
+    def add_to(self, parser: argparse.ArgumentParser) -> None:
+        """
+        Add the argument to a parser.
+
+        Args:
+            parser (argparse.ArgumentParser): the parser to add the argument to.
+        """
+        kwargs = dict(self.options, help=self.help)
+        if self.type is not None:
+            kwargs["type"] = self.type
+        if self.nargs is not None:
+            kwargs["nargs"] = self.nargs
+        parser.add_argument(*self.aliases, self.name, **kwargs)
 
 
 class Updater(abc.ABC):
@@ -41,7 +78,22 @@ class Updater(abc.ABC):
     args: argparse.Namespace  #: The arguments of the command line.
     bob: Bob  #: The class of Bob, to request parameter changes to Alice
     config: Configuration  #: The configuration, to change the parameter on Bob side.
-    round: int  #: A counter to keep memory of the turn
+    round: int  #: A counter to keep memory of the turn, which is the index of the next round.
+
+    _pending_requests: List[
+        Future
+    ]  #: Parameter changes requested to Alice that may not be done yet.
+    _targets: Dict[
+        str, Tuple[Any, str]
+    ]  #: Section of the configuration and attribute of each parameter changed at Bob side.
+
+    OFFLINE: ClassVar[bool] = False  #: True if the updater only changes Bob DSP.
+
+    CLI_NAME: ClassVar[str]  #: Name of the subcommand of the updater.
+    CLI_HELP: ClassVar[str]  #: Help of the subcommand of the updater.
+    CLI_ARGS: ClassVar[List[ArgSpec]] = (
+        []
+    )  #: Arguments of the subcommand of the updater.
 
     def __init__(
         self, args: argparse.Namespace, bob: Bob, config: Configuration
@@ -56,6 +108,8 @@ class Updater(abc.ABC):
         self.bob = bob
         self.config = config
         self.round = 0
+        self._pending_requests = []
+        self._targets = {}
 
         self._init_parameters()
 
@@ -74,6 +128,69 @@ class Updater(abc.ABC):
             int: number of rounds of the experiment.
         """
 
+    def _request_parameter_change(self, key: str, value: Any) -> None:
+        """
+        Request a parameter change to Alice, without waiting for it.
+
+        The request is done in a worker thread of Bob, and join waits for it.
+
+        Args:
+            key (str): name of the parameter in the configuration.
+            value (Any): new value of the parameter.
+        """
+        logger.info("Requesting change of %s of Alice to %s", key, value)
+        self._pending_requests.append(
+            self.bob.request_parameter_change_async(key, value)
+        )
+
+    def _change_parameter(self, key: str, value: Any) -> None:
+        """
+        Change a parameter given by its name in the configuration.
+
+        Parameters starting with "frame." are changed at Alice and Bob sides,
+        parameters starting with "bob." at Bob side only and all the other
+        parameters at Alice side only. The section of the configuration of each
+        parameter is looked up once and kept for the next rounds. Lists are set as arrays in the configuration of Bob,
+        written in place in the current array when it is a float array of the same size.
+
+        Args:
+            key (str): name of the parameter in the configuration (e.g. frame.quantum.roll_off).
+            value (Any): new value of the parameter.
+        """
+        if key.startswith(("frame.", "bob.")):
+            logger.info("Changing Bob %s parameter to %s", key, value)
+            target = self._targets.get(key)
+            if target is None:
+                *path, attribute = key.split(".")
+                section = self.config
+                for name in path:
+                    section = getattr(section, name)
+                target = self._targets[key] = (section, attribute)
+            section, attribute = target
+            current = getattr(section, attribute, None)
+            if not isinstance(value, list):
+                setattr(section, attribute, value)
+            elif (
+                isinstance(current, np.ndarray)
+                and current.dtype == np.float64
+                and current.shape == (len(value),)
+            ):
+                current[:] = value
+            else:
+                setattr(section, attribute, np.array(value))
+        if not key.startswith("bob."):
+            self._request_parameter_change(key, value)
+
+    def join(self) -> None:
+        """
+        Wait for the parameter changes requested to Alice by the last update.
+
+        This should be called before using the socket of Bob again.
+        """
+        pending_requests, self._pending_requests = self._pending_requests, []
+        for future in pending_requests:
+            future.result()
+
     @abc.abstractmethod
     def update(self) -> Dict:
         """
@@ -86,6 +203,33 @@ class Updater(abc.ABC):
             Dict: dict with the name of parameters as key and the new value as value
         """
 
+    def next_round(self, history: List[Tuple[int, float]]) -> Optional[int]:
+        """
+        Choose the index of the next round, given the rounds already done.
+
+        By default, all the rounds are done in order.
+
+        Args:
+            history (List[Tuple[int, float]]): the index of each round already done with its mean excess noise.
+
+        Returns:
+            Optional[int]: the index of the next round, or None if the experiment is over.
+        """
+        if len(history) < self.number_of_rounds():
+            return len(history)
+        return None
+
+    def rounds_are_offline_independent(self) -> bool:
+        """
+        Tell if all the rounds can be done in order on the same acquisition.
+
+        This is the case when the updater only changes the DSP at Bob side.
+
+        Returns:
+            bool: True if all the rounds can be done on the same acquisition.
+        """
+        return self.OFFLINE
+
     @abc.abstractmethod
     def name(self) -> str:
         """
@@ -94,3 +238,145 @@ class Updater(abc.ABC):
         Returns:
             str: name of the updater.
         """
+
+
+class LocalSearchMixin:
+    """
+    Mixin for updaters over a 1D array of values, to look for the value
+    minimizing the excess noise with a local search instead of trying all the values.
+
+    The search is enabled with the local_search argument of the command line.
+    It starts in the middle of the array, tries the values at a given step on each side
+    of the best value found so far, and halves the step when none of them is better.
+    It stops when the neighbours of the best value have been tried.
+
+    This should be placed before Updater in the bases of the updater.
+    """
+
+    args: argparse.Namespace
+    _step: int  #: The current step of the local search, in number of values.
+
+    def rounds_are_offline_independent(self) -> bool:
+        """
+        Tell if all the rounds can be done in order on the same acquisition.
+
+        This is never the case with the local search, since the next round depends on the previous ones.
+
+        Returns:
+            bool: True if all the rounds can be done on the same acquisition.
+        """
+        if getattr(self.args, "local_search", False):
+            return False
+        return super().rounds_are_offline_independent()  # type: ignore[misc]
+
+    def next_round(self, history: List[Tuple[int, float]]) -> Optional[int]:
+        """
+        Choose the index of the next round, given the rounds already done.
+
+        If the local search is not enabled, all the rounds are done in order.
+
+        Args:
+            history (List[Tuple[int, float]]): the index of each round already done with its mean excess noise.
+
+        Returns:
+            Optional[int]: the index of the next round, or None if the experiment is over.
+        """
+        if not getattr(self.args, "local_search", False):
+            return super().next_round(history)  # type: ignore[misc]
+
+        size = self.number_of_rounds()  # type: ignore[attr-defined]
+        if not history:
+            self._step = max(size // 4, 1)
+            return size // 2 if size else None
+
+        excess_noises = dict(history)
+        best = min(excess_noises, key=excess_noises.__getitem__)
+        while self._step >= 1:
+            for candidate in (best - self._step, best + self._step):
+                if 0 <= candidate < size and candidate not in excess_noises:
+                    return candidate
+            self._step //= 2
+        return None
+
+
+class ScalarSweepUpdater(Updater):
+    """
+    An abstract class for updaters trying successively a list of values
+    for one parameter of the configuration.
+
+    Subclasses give the name of the parameter in PARAMETER and the values in _values.
+    The parameter is changed with _change_parameter.
+    """
+
+    PARAMETER: ClassVar[str]  #: Name of the parameter in the configuration.
+    values: List[Any]  #: Values of the parameter, for each round.
+
+    def _init_parameters(self):
+        """
+        Generate the list of values.
+        """
+        self.values = self._values()
+        logger.info("Initializing %s with values %s", type(self).__name__, self.values)
+
+    @abc.abstractmethod
+    def _values(self) -> List[Any]:
+        """
+        Generate the values of the parameter from the arguments of the command line.
+
+        Returns:
+            List[Any]: values of the parameter, for each round.
+        """
+
+    def _sweep(self, name: str) -> List[float]:
+        """
+        Values from the begin_{name} argument to the end_{name} argument (excluded),
+        with a step given by the step_{name} argument.
+
+        Args:
+            name (str): name of the arguments, without the begin_, end_ and step_ prefixes.
+
+        Returns:
+            List[float]: the values.
+        """
+        return linear_sweep(
+            getattr(self.args, f"begin_{name}"),
+            getattr(self.args, f"end_{name}"),
+            getattr(self.args, f"step_{name}"),
+        ).tolist()
+
+    def _changes(self, value: Any) -> List[Tuple[str, Any]]:
+        """
+        Parameters of the configuration to change for a value.
+
+        By default, only PARAMETER is changed to the value.
+
+        Args:
+            value (Any): the value of the round.
+
+        Returns:
+            List[Tuple[str, Any]]: the names of the parameters in the configuration with their new values.
+        """
+        return [(self.PARAMETER, value)]
+
+    def number_of_rounds(self) -> int:
+        """
+        Return the number of rounds, which is the length of the list of values.
+
+        Returns:
+            int: number of rounds.
+        """
+        return len(self.values)
+
+    def update(self) -> Dict:
+        """
+        Update the parameter with the value of the round.
+
+        Returns:
+            Dict: dict with the new values of the changed parameters.
+        """
+        changes = self._changes(self.values[self.round])
+        for key, value in changes:
+            self._change_parameter(key, value)
+
+        self.round += 1
+        return dict(changes)
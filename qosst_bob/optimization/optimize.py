@@ -21,21 +21,139 @@ import sys
 import argparse
 import logging
 import datetime
-from typing import Dict, Any
+import os
+import shutil
+import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
 
 import numpy as np
-import matplotlib.pyplot as plt
 
 from qosst_bob import __version__
 from qosst_bob.bob import Bob
-from qosst_bob.data import OptimizationResults
+from qosst_bob.data import ElectronicShotNoise, OptimizationResults
 from qosst_bob.optimization import Updater
+from qosst_bob.parameters_estimation import shot_noise_variance
 
 logger = logging.getLogger(__name__)
 
 MAX_ERRORS = 5
 
 
+def _create_result_array(
+    directory: Optional[str],
+    name: str,
+    shape: Tuple[int, int],
+    dtype: Any,
+    fill_value: Any = 0,
+) -> np.ndarray:
+    """
+    Create an array to hold the results of the optimization.
+
+    If a directory is given, the array is memory-mapped to a file in this directory,
+    otherwise it is held in memory.
+
+    Args:
+        directory (Optional[str]): directory of the file backing the array, or None to keep it in memory.
+        name (str): name of the file backing the array.
+        shape (Tuple[int, int]): shape of the array.
+        dtype (Any): data type of the array.
+        fill_value (Any, optional): initial value of the elements. Defaults to 0.
+
+    Returns:
+        np.ndarray: the array of results.
+    """
+    if directory is None:
+        return np.full(shape, fill_value, dtype=dtype)
+    array = np.memmap(
+        os.path.join(directory, f"{name}.dat"), dtype=dtype, mode="w+", shape=shape
+    )
+    array[...] = fill_value
+    return array
+
+
+def _estimate(bob: Bob) -> Tuple[float, float, float, float, float]:
+    """
+    Apply the DSP on the last acquisition of Bob and estimate the parameters.
+
+    Args:
+        bob (Bob): Bob, after the quantum information exchange.
+
+    Returns:
+        Tuple[float, float, float, float, float]: the excess noise at Bob side, the transmittance, the photon number at Alice's output, the electronic noise and the shot noise.
+    """
+    assert bob.config is not None and bob.config.bob is not None
+
+    logger.info("Do DSP")
+    bob.dsp()
+
+    alice_photon_number = bob.get_alice_photon_number()
+    assert bob.alice_symbols is not None
+    assert bob.quantum_symbols is not None
+    assert bob.electronic_symbols is not None
+    assert bob.electronic_shot_symbols is not None
+    (
+        transmittance,
+        excess_noise_bob,
+        electronic_noise,
+    ) = bob.config.bob.parameters_estimation.estimator.estimate(
+        bob.alice_symbols,
+        bob.quantum_symbols[bob.indices],
+        alice_photon_number,
+        bob.electronic_symbols,
+        bob.electronic_shot_symbols,
+    )
+    shot_noise = shot_noise_variance(
+        bob.electronic_symbols, bob.electronic_shot_symbols
+    )
+    return (
+        excess_noise_bob,
+        transmittance,
+        alice_photon_number,
+        electronic_noise,
+        shot_noise,
+    )
+
+
+# pylint: disable=too-many-arguments
+def _estimate_all_rounds(
+    bob: Bob,
+    updater: Updater,
+    result_arrays: Tuple[np.ndarray, ...],
+    repetition: int,
+    current_datetime: np.datetime64,
+    *,
+    parameters: Optional[Dict[Any, Any]],
+) -> None:
+    """
+    Apply the DSP and estimate the parameters for each round of the updater
+    on the last acquisition of Bob.
+
+    Args:
+        bob (Bob): Bob, after the quantum information exchange.
+        updater (Updater): the updater, changing the parameters of each round.
+        result_arrays (Tuple[np.ndarray, ...]): the arrays of the excess noise, the transmittance, the photon number, the electronic noise, the shot noise and the datetimes, where the results of the repetition are written.
+        repetition (int): index of the repetition.
+        current_datetime (np.datetime64): datetime of the acquisition.
+        parameters (Optional[Dict[Any, Any]]): the values of the parameters for each round, to fill with the values of the updater, or None to not record them.
+    """
+    number_of_rounds = updater.number_of_rounds()
+    all_values = []
+    for index in range(number_of_rounds):
+        logger.info("Starting round %i/%i", index + 1, number_of_rounds)
+        updater.round = index
+        all_values.append(updater.update())
+        updater.join()
+
+        for array, value in zip(result_arrays, (*_estimate(bob), current_datetime)):
+            array[index, repetition] = value
+
+    if parameters is not None:
+        for values in all_values:
+            for key, value in values.items():
+                parameters.setdefault(key, []).append(value)
+
+
 # pylint: disable=too-many-locals, too-many-statements too-many-branches
 def optimize(args: argparse.Namespace, config_path: str):
     """
@@ -52,171 +170,308 @@ def optimize(args: argparse.Namespace, config_path: str):
     )
 
     bob = Bob(config_path)
+    bob.dsp_workers = args.workers
 
     updater: Updater = args.updater(args, bob, bob.config)
 
     number_of_rounds = updater.number_of_rounds()
 
-    # Initialize the result arrays
+    # Initialize the result arrays, in single precision which is enough for
+    # the estimated quantities and halves the size of the saved results.
+    # When the results are saved, the arrays are backed by files in a temporary
+    # directory, so they are streamed to disk instead of being kept in memory.
+    results_directory = (
+        tempfile.mkdtemp(prefix="qosst-bob-optimize-") if args.save else None
+    )
+    if results_directory is not None:
+        logger.info("Results are streamed to %s", results_directory)
+    shape = (number_of_rounds, args.num_rep)
 
-    all_excess_noise_values = np.zeros(
-        shape=(number_of_rounds, args.num_rep), dtype=float
+    all_excess_noise_values = _create_result_array(
+        results_directory, "excess_noise", shape, np.float32
     )
 
-    all_transmittance_values = np.zeros(
-        shape=(number_of_rounds, args.num_rep), dtype=float
+    all_transmittance_values = _create_result_array(
+        results_directory, "transmittance", shape, np.float32
     )
 
-    all_photon_number_values = np.zeros(
-        shape=(number_of_rounds, args.num_rep), dtype=float
+    all_photon_number_values = _create_result_array(
+        results_directory, "photon_number", shape, np.float32
     )
 
-    all_electronic_noise_values = np.zeros(
-        shape=(number_of_rounds, args.num_rep), dtype=float
+    all_electronic_noise_values = _create_result_array(
+        results_directory, "electronic_noise", shape, np.float32
     )
 
-    all_shot_noise_values = np.zeros(
-        shape=(number_of_rounds, args.num_rep), dtype=float
+    all_shot_noise_values = _create_result_array(
+        results_directory, "shot_noise", shape, np.float32
     )
-    datetimes = np.zeros(
-        shape=(number_of_rounds, args.num_rep), dtype=datetime.datetime
+    # The datetimes are stored as datetime64 rather than as an array of objects.
+    datetimes = _create_result_array(
+        results_directory, "datetimes", shape, "datetime64[ns]", np.datetime64("NaT")
     )
 
     parameters: Dict[Any, Any] = {}
 
-    logger.info("Load electronic noise")
-    bob.load_electronic_noise_data()
-
-    # Init hardware
-    bob.open_hardware()
-
-    # Connect to Alice
-    bob.connect()
-
-    # Identification
-    bob.identification()
-
-    # Initialization
-    bob.initialization()
-
-    assert bob.config is not None and bob.config.bob is not None
-
-    if bob.notifier:
-        bob.notifier.send_notification("Experiment on optimization started.")
+    def save_results(rounds: int, repetitions: int = args.num_rep, suffix: str = ""):
+        """
+        Save the results of the rounds and repetitions done so far.
 
-    for i in range(number_of_rounds):
-        logger.info("Starting round %i/%i", i + 1, number_of_rounds)
-
-        # Call the updater to update the value
-        logger.info("Calling the updater")
-        values = updater.update()
-
-        for key, value in values.items():
-            if key in parameters:
-                parameters[key].append(value)
-            else:
-                parameters[key] = [value]
-
-        excess_noise_current = np.zeros(shape=args.num_rep)
-        transmittance_current = np.zeros(shape=args.num_rep)
-        photon_number_current = np.zeros(shape=args.num_rep)
-        electronic_noise_current = np.zeros(shape=args.num_rep)
-        shot_noise_current = np.zeros(shape=args.num_rep)
-        datetimes_current = np.zeros(shape=args.num_rep, dtype=datetime.datetime)
-
-        error = 0
-        j = 0
-        while j < args.num_rep:
-            try:
-                logger.info("Starting repetition %i/%i", j + 1, args.num_rep)
-
-                if not bob.config.bob.switch.switching_time:
-                    logger.info("Manual shot noise acquisition")
-                    bob.get_electronic_shot_noise_data()
-
-                current_datetime = datetime.datetime.now()
-
-                logger.info("Quantum data acquisition")
-                bob.quantum_information_exchange()
-
-                logger.info("Do DSP")
-                bob.dsp()
-
-                alice_photon_number = bob.get_alice_photon_number()
-                assert bob.alice_symbols is not None
-                assert bob.quantum_symbols is not None
-                assert bob.electronic_symbols is not None
-                assert bob.electronic_shot_symbols is not None
-                (
-                    transmittance,
-                    excess_noise_bob,
-                    electronic_noise,
-                ) = bob.config.bob.parameters_estimation.estimator.estimate(
-                    bob.alice_symbols,
-                    bob.quantum_symbols[bob.indices],
-                    alice_photon_number,
-                    bob.electronic_symbols,
-                    bob.electronic_shot_symbols,
-                )
-
-                excess_noise_current[j] = excess_noise_bob
-                transmittance_current[j] = transmittance
-                photon_number_current[j] = alice_photon_number
-                electronic_noise_current[j] = electronic_noise
-                shot_noise_current[j] = np.var(bob.electronic_shot_symbols) - np.var(
-                    bob.electronic_symbols
-                )
-                datetimes_current[j] = current_datetime
-                j += 1
-                error = 0
-            except ValueError as exc:
-                if error < MAX_ERRORS:
-                    error += 1
-                    logger.error(
-                        "There was an exception in this round (see next log for the exception). This round will be done again (%i attempts remaning)",
-                        MAX_ERRORS - error,
-                    )
-                    logger.error(exc)
-                else:
-                    logger.critical(
-                        "The same round failed for %i times in a row. The script is now aborting",
-                        MAX_ERRORS,
-                    )
-                    bob.close()
-                    return
-
-        all_excess_noise_values[i] = excess_noise_current
-        all_transmittance_values[i] = transmittance_current
-        all_photon_number_values[i] = photon_number_current
-        all_electronic_noise_values[i] = electronic_noise_current
-        all_shot_noise_values[i] = shot_noise_current
-        datetimes[i] = datetimes_current
-
-    if bob.notifier:
-        bob.notifier.send_notification("Experiment on optimization started.")
-
-    if args.save:
+        Args:
+            rounds (int): number of rounds done.
+            repetitions (int, optional): number of repetitions done for each round. Defaults to the number of repetitions of the command line.
+            suffix (str, optional): suffix to add to the name of the file. Defaults to "".
+        """
         to_save = OptimizationResults(
             configuration=bob.config,
-            num_rep=args.num_rep,
-            excess_noise_bob=all_excess_noise_values,
-            transmittance=all_transmittance_values,
-            photon_number=all_photon_number_values,
-            datetimes=datetimes,
-            electronic_noise=all_electronic_noise_values,
-            shot_noise=all_shot_noise_values,
+            num_rep=repetitions,
+            excess_noise_bob=np.array(all_excess_noise_values[:rounds, :repetitions]),
+            transmittance=np.array(all_transmittance_values[:rounds, :repetitions]),
+            photon_number=np.array(all_photon_number_values[:rounds, :repetitions]),
+            datetimes=np.array(datetimes[:rounds, :repetitions]),
+            electronic_noise=np.array(
+                all_electronic_noise_values[:rounds, :repetitions]
+            ),
+            shot_noise=np.array(all_shot_noise_values[:rounds, :repetitions]),
             source_script="qosst-bob-optimize",
             command_line=" ".join(sys.argv),
             parameters=parameters,
         )
-        filename = f"results_parameter_optimization_{updater.name()}_{datetime.datetime.now():%Y-%m-%d_%H-%M-%S}.qosst"
+        filename = f"results_parameter_optimization_{updater.name()}_{datetime.datetime.now():%Y-%m-%d_%H-%M-%S}{suffix}.qosst"
         to_save.save(filename)
         logger.info("Results have saved to %s", filename)
 
+    def save_partial_results():
+        """
+        Save the results of the rounds done so far if the script stops before the end.
+
+        When each acquisition is used for all the rounds, the repetitions done
+        for all the rounds are saved instead.
+        """
+        if not args.save or not (i or shared_repetitions):
+            return
+        logger.warning("The script stopped before the end. Saving partial results.")
+        if i:
+            save_results(i, suffix="_partial")
+        else:
+            save_results(number_of_rounds, shared_repetitions, "_partial")
+
+    i = 0
+    # Number of repetitions done for all the rounds, when each acquisition is used for all the rounds.
+    shared_repetitions = 0
+    completed = False
+    try:
+        logger.info("Load electronic noise")
+        bob.load_electronic_noise_data()
+
+        # Init hardware
+        bob.open_hardware()
+
+        # Connect to Alice
+        bob.connect()
+
+        # Identification
+        bob.identification()
+
+        # Initialization
+        bob.initialization()
+
+        assert bob.config is not None and bob.config.bob is not None
+
+        if bob.notifier:
+            bob.notifier.send_notification("Experiment on optimization started.")
+
+        # When the shot noise is acquired manually, the acquisition for the next
+        # repetition is done in this thread while the DSP runs on the current one.
+        shot_noise_executor = ThreadPoolExecutor(max_workers=1)
+        next_shot_noise: Optional[Future[ElectronicShotNoise]] = None
+
+        def get_shot_noise():
+            """
+            Get the shot noise for the next acquisition, if it is acquired manually.
+            """
+            nonlocal next_shot_noise
+            assert bob.config is not None and bob.config.bob is not None
+            if bob.config.bob.switch.switching_time:
+                return
+            if next_shot_noise is None:
+                logger.info("Manual shot noise acquisition")
+                bob.get_electronic_shot_noise_data()
+            else:
+                logger.info("Waiting for the manual shot noise acquisition")
+                future, next_shot_noise = next_shot_noise, None
+                bob.electronic_shot_noise = future.result()
+
+        def prefetch_shot_noise():
+            """
+            Start the acquisition of the shot noise for the next acquisition, if it is acquired manually.
+            """
+            nonlocal next_shot_noise
+            assert bob.config is not None and bob.config.bob is not None
+            if not bob.config.bob.switch.switching_time:
+                next_shot_noise = shot_noise_executor.submit(
+                    bob.acquire_electronic_shot_noise_data
+                )
+
+        result_arrays = (
+            all_excess_noise_values,
+            all_transmittance_values,
+            all_photon_number_values,
+            all_electronic_noise_values,
+            all_shot_noise_values,
+        )
+
+        if updater.rounds_are_offline_independent() and not args.acquire_each_round:
+            # The updater only changes the DSP at Bob side, so each acquisition is
+            # used for all the rounds, while Alice still has the corresponding frame.
+            logger.info("Using each acquisition for all the rounds.")
+            error = 0
+            j = 0
+            while j < args.num_rep:
+                try:
+                    logger.info("Starting repetition %i/%i", j + 1, args.num_rep)
+
+                    get_shot_noise()
+
+                    current_datetime = np.datetime64(datetime.datetime.now(), "ns")
+
+                    logger.info("Quantum data acquisition")
+                    bob.quantum_information_exchange()
+
+                    if j + 1 < args.num_rep:
+                        prefetch_shot_noise()
+
+                    _estimate_all_rounds(
+                        bob,
+                        updater,
+                        result_arrays + (datetimes,),
+                        j,
+                        current_datetime,
+                        parameters=parameters if j == 0 else None,
+                    )
+                    j += 1
+                    shared_repetitions = j
+                    error = 0
+                except ValueError as exc:
+                    if error < MAX_ERRORS:
+                        error += 1
+                        logger.error(
+                            "There was an exception in this repetition (see next log for the exception). This repetition will be done again (%i attempts remaning)",
+                            MAX_ERRORS - error,
+                        )
+                        logger.error(exc)
+                    else:
+                        logger.critical(
+                            "The same repetition failed for %i times in a row. The script is now aborting",
+                            MAX_ERRORS,
+                        )
+                        shot_noise_executor.shutdown()
+                        bob.close()
+                        return
+            i = number_of_rounds
+
+        # Index and mean excess noise of each round, for the updater to choose the next one.
+        history: List[Tuple[int, float]] = []
+        while (
+            i < number_of_rounds and (index := updater.next_round(history)) is not None
+        ):
+            logger.info(
+                "Starting round %i (value %i/%i)", i + 1, index + 1, number_of_rounds
+            )
+
+            # The shot noise of the first repetition is acquired while the
+            # updater requests the parameter changes, once the round is known to be done.
+            prefetch_shot_noise()
+
+            # Call the updater to update the value
+            logger.info("Calling the updater")
+            updater.round = index
+            values = updater.update()
+
+            error = 0
+            j = 0
+            while j < args.num_rep:
+                try:
+                    logger.info("Starting repetition %i/%i", j + 1, args.num_rep)
+
+                    get_shot_noise()
+
+                    # The parameter changes are requested to Alice while the
+                    # shot noise is acquired, and must be done before the acquisition.
+                    updater.join()
+
+                    current_datetime = np.datetime64(datetime.datetime.now(), "ns")
+
+                    logger.info("Quantum data acquisition")
+                    bob.quantum_information_exchange()
+
+                    if j + 1 < args.num_rep:
+                        prefetch_shot_noise()
+
+                    for array, value in zip(result_arrays, _estimate(bob)):
+                        array[i, j] = value
+                    datetimes[i, j] = current_datetime
+                    j += 1
+                    error = 0
+                except ValueError as exc:
+                    if error < MAX_ERRORS:
+                        error += 1
+                        logger.error(
+                            "There was an exception in this round (see next log for the exception). This round will be done again (%i attempts remaning)",
+                            MAX_ERRORS - error,
+                        )
+                        logger.error(exc)
+                    else:
+                        logger.critical(
+                            "The same round failed for %i times in a row. The script is now aborting",
+                            MAX_ERRORS,
+                        )
+                        shot_noise_executor.shutdown()
+                        bob.close()
+                        return
+
+            # The parameters are only recorded once the round is done, so that
+            # they match the rounds of the results if the script stops.
+            for key, value in values.items():
+                if key in parameters:
+                    parameters[key].append(value)
+                else:
+                    parameters[key] = [value]
+
+            history.append((index, float(np.mean(all_excess_noise_values[i]))))
+            i += 1
+
+        shot_noise_executor.shutdown()
+
+        # Keep only the rounds that were done, in case the updater stopped early.
+        all_excess_noise_values = np.array(all_excess_noise_values[:i])
+        all_transmittance_values = np.array(all_transmittance_values[:i])
+        all_photon_number_values = np.array(all_photon_number_values[:i])
+        all_electronic_noise_values = np.array(all_electronic_noise_values[:i])
+        all_shot_noise_values = np.array(all_shot_noise_values[:i])
+        datetimes = np.array(datetimes[:i])
+
+        if bob.notifier:
+            bob.notifier.send_notification("Experiment on optimization started.")
+
+        completed = True
+        if args.save:
+            save_results(i)
+    finally:
+        try:
+            if not completed:
+                save_partial_results()
+        finally:
+            if results_directory is not None:
+                shutil.rmtree(results_directory)
+
     logger.info("Closing Bob.")
     bob.close()
 
     if args.plot:
+        # Imported here to avoid loading matplotlib when nothing is plotted.
+        import matplotlib.pyplot as plt  # pylint: disable=import-outside-toplevel
+
         excess_noise_values = np.mean(all_excess_noise_values, axis=-1)
         transmittance_values = np.mean(all_transmittance_values, axis=-1)
         photon_number_values = np.mean(all_photon_number_values, axis=-1)
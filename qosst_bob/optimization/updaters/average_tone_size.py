@@ -18,56 +18,35 @@
 Updater to optimize the excess noise while varying the size of averaging for the tone.
 """
 
-import logging
-from typing import Dict
-
-import numpy as np
+from typing import Any, List
 
 from qosst_bob import __version__
-from qosst_bob.optimization import Updater
-
-logger = logging.getLogger(__name__)
+from qosst_bob.optimization import ArgSpec, ScalarSweepUpdater
 
 
-class AverageToneSizeUpdater(Updater):
+class AverageToneSizeUpdater(ScalarSweepUpdater):
     """
     Experiments to measure the excess noise variations as a function of the average tone size for the phase correctionat Bob side.
     """
 
-    sizes: np.ndarray
+    OFFLINE = True
 
-    def _init_parameters(self):
-        """
-        Generate the array of sizes.
-        """
-        logger.info(
-            "Initializing AverageToneSize updater with sizes %s", str(self.args.sizes)
-        )
-        self.sizes = np.array(self.args.sizes)
+    CLI_NAME = "average-tone-size"
+    CLI_HELP = "Compute the excess noise while varying the size for the averaging of the pilot at phase correction."
+    CLI_ARGS = [
+        ArgSpec("sizes", "The list of sizes to try.", int, "+"),
+    ]
 
-    def number_of_rounds(self) -> int:
-        """
-        Return the number of rounds, which is the length of the array of sizes.
+    PARAMETER = "bob.dsp.pilot_phase_filtering_size"
 
-        Returns:
-            int: number of rounds.
-        """
-        return len(self.sizes)
-
-    def update(self) -> Dict:
+    def _values(self) -> List[Any]:
         """
-        Update the parameter by changing the phase filtering size at Bob side only.
+        Generate the list of sizes.
 
         Returns:
-            Dict: dict with the new value of the phase filtering size.
+            List[Any]: the sizes.
         """
-        assert self.config.bob is not None
-        new_value = self.sizes[self.round]
-        logger.info("Changing Bob size parameter to %f", new_value)
-        self.config.bob.dsp.pilot_phase_filtering_size = new_value
-
-        self.round += 1
-        return {"bob.dsp.pilot_phase_filtering_size": new_value}
+        return list(self.args.sizes)
 
     def name(self) -> str:
         """
@@ -18,59 +18,33 @@
 Updater to optimize the excess noise while varying the baud rate.
 """
 
-import logging
-from typing import Dict
-
-import numpy as np
+from typing import Any, List
 
 from qosst_bob import __version__
-from qosst_bob.optimization import Updater
-
-logger = logging.getLogger(__name__)
+from qosst_bob.optimization import ArgSpec, ScalarSweepUpdater
 
 
-class BaudRateUpdater(Updater):
+class BaudRateUpdater(ScalarSweepUpdater):
     """
     Experiments to measure the excess noise variations as a function of the baud rate of the symbols.
     """
 
-    baud_rates: np.ndarray
-
-    def _init_parameters(self):
-        """
-        Generate the array of baud rates.
-        """
-        logger.info(
-            "Initializing BaudRate updater with begin baud rates : %s",
-            str(self.args.baud_rates),
-        )
-        self.baud_rates = np.array(self.args.baud_rates)
-
-    def number_of_rounds(self) -> int:
-        """
-        Return the number of rounds, which is the length of the array of baud rates.
+    CLI_NAME = "baud-rate"
+    CLI_HELP = "Compute the excess noise while varying the baud rate of Alice. WARNING: Make sure to have enough frequency space before doing so."
+    CLI_ARGS = [
+        ArgSpec("baud_rates", "The list of baud rates to try.", int, "+"),
+    ]
 
-        Returns:
-            int: number of rounds.
-        """
-        return len(self.baud_rates)
+    PARAMETER = "frame.quantum.symbol_rate"
 
-    def update(self) -> Dict:
+    def _values(self) -> List[Any]:
         """
-        Update the parameter by changing the symbol rate at Alice and Bob sides.
+        Generate the list of baud rates.
 
         Returns:
-            Dict: dict with the new value of the symbol rate.
+            List[Any]: the baud rates.
         """
-        assert self.config.frame is not None
-        new_value = self.baud_rates[self.round]
-        logger.info("Changing Bob baud rate parameter to %f", new_value)
-        self.config.frame.quantum.symbol_rate = new_value
-
-        logger.info("Requesting change of baud rate of Alice to %f", new_value)
-        self.bob.request_parameter_change("frame.quantum.symbol_rate", new_value)
-        self.round += 1
-        return {"frame.quantum.symbol_rate": new_value}
+        return list(self.args.baud_rates)
 
     def name(self) -> str:
         """
@@ -19,26 +19,43 @@ Updater to optimize the excess noise while varying the roll-off.
 """
 
 import logging
-from typing import Dict
-
-import numpy as np
+from typing import Dict, List
 
 from qosst_bob import __version__
-from qosst_bob.optimization import Updater
+from qosst_bob.optimization import (
+    ArgSpec,
+    LocalSearchMixin,
+    Updater,
+    linear_sweep,
+)
 
 logger = logging.getLogger(__name__)
 
 
-class ConversionFactorUpdater(Updater):
+class ConversionFactorUpdater(LocalSearchMixin, Updater):
     """
     Experiments to measure the excess noise variations as a function of the variance of Alice's modulation.
     """
 
-    conversion_factors: np.ndarray
+    CLI_NAME = "conversion-factor"
+    CLI_HELP = "Compute the excess noise while varying the conversion factor of Alice."
+    CLI_ARGS = [
+        ArgSpec("initial_value", "Initial value of the conversion factor.", float),
+        ArgSpec("begin_error", "Value for the first error (in %%)", float),
+        ArgSpec("end_error", "Value for the last error (in %%, excluded)", float),
+        ArgSpec("step_error", "Value for the step of the error (in %%)", float),
+        ArgSpec(
+            "--local-search",
+            "Search for the conversion factor minimizing the excess noise instead of trying all of them.",
+            options={"action": "store_true"},
+        ),
+    ]
+
+    conversion_factors: List[float]
 
     def _init_parameters(self):
         """
-        Generate the array of conversion factors.
+        Generate the list of conversion factors.
         """
         logger.info(
             "Initializing ConversionFactor updater with initial value=%f begin error=%f end error=%f and step error=%f",
@@ -47,19 +64,19 @@ class ConversionFactorUpdater(Updater):
             self.args.end_error,
             self.args.step_error,
         )
-        self.conversion_factors = self.args.initial_value * (
-            1
-            + np.arange(
-                self.args.begin_error,
-                self.args.end_error,
-                self.args.step_error,
-            )
-            / 100
+        conversion_factors = linear_sweep(
+            self.args.begin_error,
+            self.args.end_error,
+            self.args.step_error,
         )
+        conversion_factors *= 0.01
+        conversion_factors += 1
+        conversion_factors *= self.args.initial_value
+        self.conversion_factors = conversion_factors.tolist()
 
     def number_of_rounds(self) -> int:
         """
-        Return the number of rounds, which is the length of the array of conversion factors.
+        Return the number of rounds, which is the length of the list of conversion factors.
 
         Returns:
             int: number of rounds.
@@ -75,8 +92,7 @@ class ConversionFactorUpdater(Updater):
         """
         new_value = self.conversion_factors[self.round]
 
-        logger.info("Requesting change of conversion factor of Alice to %f", new_value)
-        self.bob.request_parameter_change(
+        self._request_parameter_change(
             "alice.photodiode_to_output_conversion", new_value
         )
         self.round += 1
@@ -19,26 +19,44 @@ Updater to optimize the excess noise while varying the cutoff for the filter of
 """
 
 import logging
-from typing import Dict
-
-import numpy as np
+from typing import Dict, List
 
 from qosst_bob import __version__
-from qosst_bob.optimization import Updater
+from qosst_bob.optimization import (
+    ArgSpec,
+    LocalSearchMixin,
+    Updater,
+    linear_sweep,
+)
 
 logger = logging.getLogger(__name__)
 
 
-class FrequencyCutoffToneUpdater(Updater):
+class FrequencyCutoffToneUpdater(LocalSearchMixin, Updater):
     """
     Experiments to measure the excess noise variations as a function of the cutoff for the filtering of the tone at Bob side.
     """
 
-    cutoffs: np.ndarray
+    OFFLINE = True
+
+    CLI_NAME = "frequency-cutoff-tone"
+    CLI_HELP = "Compute the excess noise while varying the cutoff for the filtering of the tone on Bob side."
+    CLI_ARGS = [
+        ArgSpec("begin_cutoff", "Value for the first cutoff", float),
+        ArgSpec("end_cutoff", "Value for the last cutoff (excluded)", float),
+        ArgSpec("step_cutoff", "Value for the step of the cutoff", float),
+        ArgSpec(
+            "--local-search",
+            "Search for the cutoff minimizing the excess noise instead of trying all of them.",
+            options={"action": "store_true"},
+        ),
+    ]
+
+    cutoffs: List[float]
 
     def _init_parameters(self):
         """
-        Generate the array of cut-offs.
+        Generate the list of cut-offs.
         """
         logger.info(
             "Initializing FrequencyCutoffTone updater with begin cutoff=%f end cutoff=%f and step cutoff=%f",
@@ -46,13 +64,15 @@ class FrequencyCutoffToneUpdater(Updater):
             self.args.end_cutoff,
             self.args.step_cutoff,
         )
-        self.cutoffs = np.arange(
-            self.args.begin_cutoff, self.args.end_cutoff, self.args.step_cutoff
-        )
+        self.cutoffs = linear_sweep(
+            self.args.begin_cutoff,
+            self.args.end_cutoff,
+            self.args.step_cutoff,
+        ).tolist()
 
     def number_of_rounds(self) -> int:
         """
-        Return the number of rounds, which is the length of the array of cutoffs.
+        Return the number of rounds, which is the length of the list of cutoffs.
 
         Returns:
             int: number of rounds.
@@ -66,10 +86,8 @@ class FrequencyCutoffToneUpdater(Updater):
         Returns:
             Dict: dict with the new value of the cutoff.
         """
-        assert self.config.bob is not None
         new_value = self.cutoffs[self.round]
-        logger.info("Changing Bob cutoff parameter to %f", new_value)
-        self.config.bob.dsp.tone_filtering_cutoff = new_value
+        self._change_parameter("bob.dsp.tone_filtering_cutoff", new_value)
 
         self.round += 1
         return {"bob.dsp.tone_filtering_cutoff": new_value}
@@ -18,59 +18,33 @@
 Updater to optimize the excess noise while varying the frequency shift.
 """
 
-import logging
-from typing import Dict
-
-import numpy as np
+from typing import Any, List
 
 from qosst_bob import __version__
-from qosst_bob.optimization import Updater
-
-logger = logging.getLogger(__name__)
+from qosst_bob.optimization import ArgSpec, ScalarSweepUpdater
 
 
-class FrequencyShiftUpdater(Updater):
+class FrequencyShiftUpdater(ScalarSweepUpdater):
     """
     Experiments to measure the excess noise variations as a function of the frequency shift of the symbols.
     """
 
-    frequency_shifts: np.ndarray
-
-    def _init_parameters(self):
-        """
-        Generate the array of frequency shifts.
-        """
-        logger.info(
-            "Initializing FrequencyShift updater with begin frequency shifts : %s",
-            str(self.args.frequency_shifts),
-        )
-        self.frequency_shifts = np.array(self.args.frequency_shifts)
-
-    def number_of_rounds(self) -> int:
-        """
-        Return the number of rounds, which is the length of the array of frequency shifts.
+    CLI_NAME = "frequency-shift"
+    CLI_HELP = "Compute the excess noise while varying the frequency shift of Alice. WARNING: Make sure to have enough frequency space before doing so."
+    CLI_ARGS = [
+        ArgSpec("frequency_shifts", "The list of frequency shifts to try.", float, "+"),
+    ]
 
-        Returns:
-            int: number of rounds.
-        """
-        return len(self.frequency_shifts)
+    PARAMETER = "frame.quantum.frequency_shift"
 
-    def update(self) -> Dict:
+    def _values(self) -> List[Any]:
         """
-        Update the parameter by changing the frequency shift at Alice and Bob sides.
+        Generate the list of frequency shifts.
 
         Returns:
-            Dict: dict with the new value of the frequench shift.
+            List[Any]: the frequency shifts.
         """
-        assert self.config.frame is not None
-        new_value = self.frequency_shifts[self.round]
-        logger.info("Changing Bob frequency shift parameter to %f", new_value)
-        self.config.frame.quantum.frequency_shift = new_value
-
-        logger.info("Requesting change of frequency shift of Alice to %f", new_value)
-        self.bob.request_parameter_change("frame.quantum.frequency_shift", new_value)
-        self.round += 1
-        return {"frame.quantum.frequency_shift": new_value}
+        return list(self.args.frequency_shifts)
 
     def name(self) -> str:
         """
@@ -0,0 +1,194 @@
+# qosst-bob - Bob module of the Quantum Open Software for Secure Transmissions.
+# Copyright (C) 2021-2024 Yoann Piétri
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Updater to optimize the excess noise over several parameters at once with a genetic algorithm.
+"""
+
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from qosst_bob import __version__
+from qosst_bob.optimization import ArgSpec, Updater
+
+logger = logging.getLogger(__name__)
+
+
+class GeneticUpdater(Updater):
+    """
+    Experiments to find the parameters minimizing the excess noise with a continuous genetic algorithm.
+
+    Each parameter is given by its name in the configuration and an interval,
+    and is changed with _change_parameter.
+
+    Each round evaluates one individual of the population, and the excess noise is used as fitness.
+    After each generation, the next one is made of the best individual and of children obtained
+    by selection, crossover and gaussian mutation.
+    """
+
+    CLI_NAME = "genetic-search"
+    CLI_HELP = "Search for the parameters minimizing the excess noise with a genetic algorithm."
+    CLI_ARGS = [
+        ArgSpec(
+            "--parameter",
+            "Name of a parameter in the configuration (e.g. frame.quantum.roll_off) and its interval. Can be given several times.",
+            nargs=3,
+            aliases=("-p",),
+            options={
+                "dest": "parameters",
+                "action": "append",
+                "required": True,
+                "metavar": ("NAME", "LOW", "HIGH"),
+            },
+        ),
+        ArgSpec(
+            "--pop",
+            "Size of the population. Default : 10.",
+            int,
+            options={"default": 10},
+        ),
+        ArgSpec(
+            "--generations",
+            "Number of generations. Default : 5.",
+            int,
+            options={"default": 5},
+        ),
+        ArgSpec(
+            "--sigma",
+            "Standard deviation of the mutation, relative to the width of the interval. Default : 0.1.",
+            float,
+            options={"default": 0.1},
+        ),
+    ]
+
+    keys: List[str]  #: Names of the parameters in the configuration.
+    lows: np.ndarray  #: Lower bounds of the parameters.
+    highs: np.ndarray  #: Upper bounds of the parameters.
+    population: np.ndarray  #: Current population, of shape (pop, number of parameters).
+    rng: np.random.Generator  #: Random generator of the algorithm.
+
+    def _init_parameters(self):
+        """
+        Generate the first population, uniformly in the intervals of the parameters.
+        """
+        logger.info(
+            "Initializing Genetic updater with parameters %s, population=%i, generations=%i and sigma=%f",
+            self.args.parameters,
+            self.args.pop,
+            self.args.generations,
+            self.args.sigma,
+        )
+        self.keys = [key for key, _, _ in self.args.parameters]
+        self.lows = np.array([float(low) for _, low, _ in self.args.parameters])
+        self.highs = np.array([float(high) for _, _, high in self.args.parameters])
+        self.rng = np.random.default_rng()
+        self.population = self.rng.uniform(
+            self.lows, self.highs, size=(self.args.pop, len(self.keys))
+        )
+
+    def number_of_rounds(self) -> int:
+        """
+        Return the number of rounds, which is the size of the population times the number of generations.
+
+        Returns:
+            int: number of rounds.
+        """
+        return self.args.pop * self.args.generations
+
+    def next_round(self, history: List[Tuple[int, float]]) -> Optional[int]:
+        """
+        Choose the index of the next round, and make the next generation when the current one has been evaluated.
+
+        Args:
+            history (List[Tuple[int, float]]): the index of each round already done with its mean excess noise.
+
+        Returns:
+            Optional[int]: the index of the next round, or None if the experiment is over.
+        """
+        index = super().next_round(history)
+        if index is not None and index and index % self.args.pop == 0:
+            self._next_generation(
+                np.array(
+                    [excess_noise for _, excess_noise in history[-self.args.pop :]]
+                )
+            )
+        return index
+
+    def _next_generation(self, fitness: np.ndarray):
+        """
+        Replace the population by the next generation.
+
+        The best individual is kept, and the other ones are children of two parents chosen
+        by tournament, with a uniform blend crossover and a gaussian mutation of standard
+        deviation sigma times the width of the interval.
+
+        Args:
+            fitness (np.ndarray): the mean excess noise of each individual of the current population.
+        """
+        pop, num_parameters = self.population.shape
+        best = int(np.argmin(fitness))
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Best individual of the generation: %s with excess noise %f",
+                dict(zip(self.keys, self.population[best])),
+                fitness[best],
+            )
+
+        # Tournament selection between pairs of individuals.
+        contenders = self.rng.integers(pop, size=(2, pop - 1, 2))
+        winners = np.where(
+            fitness[contenders[..., 0]] <= fitness[contenders[..., 1]],
+            contenders[..., 0],
+            contenders[..., 1],
+        )
+        alpha = self.rng.uniform(size=(pop - 1, num_parameters))
+        children = (
+            alpha * self.population[winners[0]]
+            + (1 - alpha) * self.population[winners[1]]
+        )
+        children += self.rng.normal(
+            scale=self.args.sigma * (self.highs - self.lows), size=children.shape
+        )
+        np.clip(children, self.lows, self.highs, out=children)
+
+        self.population = np.concatenate((self.population[best : best + 1], children))
+
+    def update(self) -> Dict:
+        """
+        Update the parameters with the values of the next individual, at Alice and/or Bob sides.
+
+        Returns:
+            Dict: dict with the new values of the parameters.
+        """
+        individual = self.population[self.round % self.args.pop]
+        values = {}
+        for key, value in zip(self.keys, individual):
+            values[key] = float(value)
+            self._change_parameter(key, values[key])
+
+        self.round += 1
+        return values
+
+    def name(self) -> str:
+        """
+        Name of the updater. To be used in the name of the saved file.
+
+        Returns:
+            str: name of the updater.
+        """
+        return "genetic-search"
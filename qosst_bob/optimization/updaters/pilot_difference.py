@@ -18,70 +18,57 @@
 Updater to optimize the excess noise while varying the difference of pilot frequency.
 """
 
-import logging
-from typing import Dict
-
-import numpy as np
+from typing import Any, List, Tuple
 
 from qosst_bob import __version__
-from qosst_bob.optimization import Updater
-
-logger = logging.getLogger(__name__)
+from qosst_bob.optimization import ArgSpec, ScalarSweepUpdater
 
 
-class PilotDifferenceUpdater(Updater):
+class PilotDifferenceUpdater(ScalarSweepUpdater):
     """
     Experiments to measure the excess noise variations as a function of the difference of frequency between the two pilots. The first pilot will be left untouched.
     """
 
-    differences: np.ndarray
+    CLI_NAME = "pilot-difference-tone"
+    CLI_HELP = "Compute the excess noise while varying the difference between the two pilots. The first pilot will be left unchanged."
+    CLI_ARGS = [
+        ArgSpec("begin_difference", "Value for the first difference", float),
+        ArgSpec("end_difference", "Value for the last difference (excluded)", float),
+        ArgSpec("step_difference", "Value for the step of the difference", float),
+    ]
+
+    PARAMETER = "frame.pilots.frequencies"
+
+    first_frequency: float  #: Frequency of the first pilot, which is left unchanged.
 
     def _init_parameters(self):
         """
-        Generate the array of differences.
+        Keep the frequency of the first pilot and generate the list of differences.
         """
-        logger.info(
-            "Initializing PilotDifference updater with begin difference=%f end difference=%f and step difference=%f",
-            self.args.begin_difference,
-            self.args.end_difference,
-            self.args.step_difference,
-        )
-        self.differences = np.arange(
-            self.args.begin_difference,
-            self.args.end_difference,
-            self.args.step_difference,
-        )
-
-    def number_of_rounds(self) -> int:
+        assert self.config.frame is not None
+        self.first_frequency = float(self.config.frame.pilots.frequencies[0])
+        super()._init_parameters()
+
+    def _values(self) -> List[Any]:
         """
-        Return the number of rounds, which is the length of the array of differences.
+        Generate the list of differences.
 
         Returns:
-            int: number of rounds.
+            List[Any]: the differences.
         """
-        return len(self.differences)
+        return self._sweep("difference")
 
-    def update(self) -> Dict:
+    def _changes(self, value: Any) -> List[Tuple[str, Any]]:
         """
-        Update the parameter by changing the frequencies of the pilot. The first frequency stays the same but the second one is updated with the new difference.
-        It is done at Alice and Bob sides.
+        Change the frequency of the second pilot, keeping the first one.
+
+        Args:
+            value (Any): the difference of frequency between the two pilots.
 
         Returns:
-            Dict: dict with the new values of the frequencies of the pilots.
+            List[Tuple[str, Any]]: the new frequencies of the pilots.
         """
-        assert self.config.frame is not None
-        new_diff = self.differences[self.round]
-        new_value = [
-            self.config.frame.pilots.frequencies[0],
-            self.config.frame.pilots.frequencies[0] + new_diff,
-        ]
-        logger.info("Changing Bob difference parameter to %f", new_diff)
-        self.config.frame.pilots.frequencies = np.array(new_value)
-
-        logger.info("Requesting change of difference of Alice to %f", new_diff)
-        self.bob.request_parameter_change("frame.pilots.frequencies", new_value)
-        self.round += 1
-        return {"frame.pilots.frequencies": new_value}
+        return [(self.PARAMETER, [self.first_frequency, self.first_frequency + value])]
 
     def name(self) -> str:
         """
@@ -19,12 +19,10 @@ Updater to optimize the excess noise while varying the amplitude of the pilots.
 """
 
 import logging
-from typing import Dict
-
-import numpy as np
+from typing import Dict, List
 
 from qosst_bob import __version__
-from qosst_bob.optimization import Updater
+from qosst_bob.optimization import ArgSpec, Updater, linear_sweep
 
 logger = logging.getLogger(__name__)
 
@@ -34,12 +32,21 @@ class PilotsAmplitudeUpdater(Updater):
     Experiments to measure the excess noise variations as a function of the amplitude of pilots.
     """
 
-    amplitudes: np.ndarray
+    CLI_NAME = "pilots-amplitude"
+    CLI_HELP = "Compute the excess noise while varying the amplitude of the pilots."
+    CLI_ARGS = [
+        ArgSpec("begin_amplitude", "Value for the first amplitude", float),
+        ArgSpec("end_amplitude", "Value for the last amplitude (excluded)", float),
+        ArgSpec("step_amplitude", "Value for the step of the amplitude", float),
+    ]
+
+    amplitudes: List[float]
+    amplitude_vectors: List[List[float]]  #: Amplitudes of the pilots for each round.
     num_pilots: int
 
     def _init_parameters(self):
         """
-        Generate the array of amplitudes.
+        Generate the list of amplitudes.
         """
         self.num_pilots = self.config.frame.pilots.num_pilots
         logger.info(
@@ -49,13 +56,16 @@ class PilotsAmplitudeUpdater(Updater):
             self.args.step_amplitude,
             self.num_pilots,
         )
-        self.amplitudes = np.arange(
+        self.amplitudes = linear_sweep(
             self.args.begin_amplitude, self.args.end_amplitude, self.args.step_amplitude
-        )
+        ).tolist()
+        self.amplitude_vectors = [
+            [amplitude] * self.num_pilots for amplitude in self.amplitudes
+        ]
 
     def number_of_rounds(self) -> int:
         """
-        Return the number of rounds, which is the length of the array of amplitudes.
+        Return the number of rounds, which is the length of the list of amplitudes.
 
         Returns:
             int: number of rounds.
@@ -69,15 +79,8 @@ class PilotsAmplitudeUpdater(Updater):
         Returns:
             Dict: dict with the new value of the amplitudes.
         """
-        assert self.config.frame is not None
-        new_value = [self.amplitudes[self.round] for _ in range(self.num_pilots)]
-        logger.info("Changing Bob pilots amplitude parameter to %s", str(new_value))
-        self.config.frame.pilots.amplitudes = np.array(new_value)
-
-        logger.info(
-            "Requesting change of pilots amplitude of Alice to %s", str(new_value)
-        )
-        self.bob.request_parameter_change("frame.pilots.amplitudes", new_value)
+        new_value = self.amplitude_vectors[self.round]
+        self._change_parameter("frame.pilots.amplitudes", new_value)
         self.round += 1
         return {"frame.pilots.amplitudes": new_value}
 
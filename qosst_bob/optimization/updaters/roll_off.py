@@ -18,63 +18,35 @@
 Updater to optimize the excess noise while varying the roll-off.
 """
 
-import logging
-from typing import Dict
-
-import numpy as np
+from typing import Any, List
 
 from qosst_bob import __version__
-from qosst_bob.optimization import Updater
-
-logger = logging.getLogger(__name__)
+from qosst_bob.optimization import ArgSpec, ScalarSweepUpdater
 
 
-class RollOffUpdater(Updater):
+class RollOffUpdater(ScalarSweepUpdater):
     """
     Experiments to measure the excess noise variations as a function of the variance of Alice's modulation.
     """
 
-    roll_offs: np.ndarray
-
-    def _init_parameters(self):
-        """
-        Generate the array of roll-offs.
-        """
-        logger.info(
-            "Initializing RollOff updater with begin roll-off=%f end roll-off=%f and step roll-off=%f",
-            self.args.begin_roll_off,
-            self.args.end_roll_off,
-            self.args.step_roll_off,
-        )
-        self.roll_offs = np.arange(
-            self.args.begin_roll_off, self.args.end_roll_off, self.args.step_roll_off
-        )
-
-    def number_of_rounds(self) -> int:
-        """
-        Return the number of rounds, which is the length of the array of roll-offs.
+    CLI_NAME = "roll-off"
+    CLI_HELP = "Compute the excess noise while varying the roll-off."
+    CLI_ARGS = [
+        ArgSpec("begin_roll_off", "Value for the first roll-off", float),
+        ArgSpec("end_roll_off", "Value for the last roll-off (excluded)", float),
+        ArgSpec("step_roll_off", "Value for the step of the roll-off", float),
+    ]
 
-        Returns:
-            int: number of rounds.
-        """
-        return len(self.roll_offs)
+    PARAMETER = "frame.quantum.roll_off"
 
-    def update(self) -> Dict:
+    def _values(self) -> List[Any]:
         """
-        Update the parameter by changing the roll-off factor at Alice and Bob sides.
+        Generate the list of roll-offs.
 
         Returns:
-            Dict: dict with the new value of the roll-off.
+            List[Any]: the roll-offs.
         """
-        assert self.config.frame is not None
-        new_value = self.roll_offs[self.round]
-        logger.info("Changing Bob roll-off parameter to %f", new_value)
-        self.config.frame.quantum.roll_off = new_value
-
-        logger.info("Requesting change of roll-off of Alice to %f", new_value)
-        self.bob.request_parameter_change("frame.quantum.roll_off", new_value)
-        self.round += 1
-        return {"frame.quantum.roll_off": new_value}
+        return self._sweep("roll_off")
 
     def name(self) -> str:
         """
@@ -18,57 +18,35 @@
 Updater to optimize the excess noise while varying the size of subframes.
 """
 
-import logging
-from typing import Dict
-
-import numpy as np
+from typing import Any, List
 
 from qosst_bob import __version__
-from qosst_bob.optimization import Updater
-
-logger = logging.getLogger(__name__)
+from qosst_bob.optimization import ArgSpec, ScalarSweepUpdater
 
 
-class SubframeSizeUpdater(Updater):
+class SubframeSizeUpdater(ScalarSweepUpdater):
     """
     Experiments to measure the excess noise variations as a function of the subframe size at Bob side.
     """
 
-    sizes: np.ndarray
+    OFFLINE = True
 
-    def _init_parameters(self):
-        """
-        Generate the array of subframe sizes.
-        """
-        logger.info(
-            "Initializing SubframeSize updater with begin sizes : %s",
-            str(self.args.sizes),
-        )
-        self.sizes = np.array(self.args.sizes)
+    CLI_NAME = "subframe-size"
+    CLI_HELP = "Compute the excess noise while varing the size of the subframe of the DSP at Bob side."
+    CLI_ARGS = [
+        ArgSpec("sizes", "The list of subframe sizes to try.", int, "+"),
+    ]
 
-    def number_of_rounds(self) -> int:
-        """
-        Return the number of rounds, which is the length of the array of subframe sizes.
+    PARAMETER = "bob.dsp.subframes_size"
 
-        Returns:
-            int: number of rounds.
-        """
-        return len(self.sizes)
-
-    def update(self) -> Dict:
+    def _values(self) -> List[Any]:
         """
-        Update the parameter by changing the subframe size at Bob side only.
+        Generate the list of subframe sizes.
 
         Returns:
-            Dict: dict with the new value of the subframe size.
+            List[Any]: the subframe sizes.
         """
-        assert self.config.bob is not None
-        new_value = self.sizes[self.round]
-        logger.info("Changing Bob subframe size parameter to %f", new_value)
-        self.config.bob.dsp.subframes_size = new_value
-
-        self.round += 1
-        return {"bob.dsp.subframes_size": new_value}
+        return list(self.args.sizes)
 
     def name(self) -> str:
         """
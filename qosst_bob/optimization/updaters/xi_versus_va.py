@@ -18,63 +18,35 @@
 Updater to optimize the excess noise while varying the variance.
 """
 
-import logging
-from typing import Dict
-
-import numpy as np
+from typing import Any, List
 
 from qosst_bob import __version__
-from qosst_bob.optimization import Updater
-
-logger = logging.getLogger(__name__)
+from qosst_bob.optimization import ArgSpec, ScalarSweepUpdater
 
 
-class XiVsVaUpdater(Updater):
+class XiVsVaUpdater(ScalarSweepUpdater):
     """
     Experiments to measure the excess noise variations as a function of the variance of Alice's modulation.
     """
 
-    variances: np.ndarray
-
-    def _init_parameters(self):
-        """
-        Generate the array of variances.
-        """
-        logger.info(
-            "Initializing XiVsVa updater with begin variance=%f end variance=%f and step variance=%f",
-            self.args.begin_variance,
-            self.args.end_variance,
-            self.args.step_variance,
-        )
-        self.variances = np.arange(
-            self.args.begin_variance, self.args.end_variance, self.args.step_variance
-        )
-
-    def number_of_rounds(self) -> int:
-        """
-        Return the number of rounds, which is the length of the array of variances.
+    CLI_NAME = "xi-vs-va"
+    CLI_HELP = "Compute the excess noise while varying the variance."
+    CLI_ARGS = [
+        ArgSpec("begin_variance", "Value for the first variance", float),
+        ArgSpec("end_variance", "Value for the last variance (excluded)", float),
+        ArgSpec("step_variance", "Value for the step of the variance", float),
+    ]
 
-        Returns:
-            int: number of rounds.
-        """
-        return len(self.variances)
+    PARAMETER = "frame.quantum.variance"
 
-    def update(self) -> Dict:
+    def _values(self) -> List[Any]:
         """
-        Update the parameter by changing Alice's variance at Alice side only.
+        Generate the list of variances.
 
         Returns:
-            Dict: dict with the new value of the variance.
+            List[Any]: the variances.
         """
-        assert self.config.frame is not None
-        new_value = self.variances[self.round]
-        logger.info("Changing Bob variance parameter to %f", new_value)
-        self.config.frame.quantum.variance = new_value
-
-        logger.info("Requesting change of variance of Alice to %f", new_value)
-        self.bob.request_parameter_change("frame.quantum.variance", new_value)
-        self.round += 1
-        return {"frame.quantum.var": new_value}
+        return self._sweep("variance")
 
     def name(self) -> str:
         """
@@ -17,4 +17,9 @@
 """
 Module holding estimators for Bob.
 """
-from .base import BaseEstimator, DefaultEstimator
+from .base import (
+    BaseEstimator,
+    DefaultEstimator,
+    fast_variance,
+    shot_noise_variance,
+)
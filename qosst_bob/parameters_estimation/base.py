@@ -19,7 +19,8 @@ Define abstract class for estimators.
 """
 import abc
 import logging
-from typing import Tuple
+import threading
+from typing import Any, Callable, Optional, Tuple
 
 import numpy as np
 
@@ -33,16 +34,328 @@ def complex_to_real(input_data: np.ndarray) -> np.ndarray:
     [a_1+i*b_1, a_2+i*b_2, ..., a_n+i*b_n] then the output array
     is [a_1, b_1, a_2, b_2, ..., a_n, b_n].
 
+    This is the memory layout of a complex array, so for a contiguous
+    complex128 array the output is a view of the input, without copy,
+    and should not be modified.
+
     Args:
         input_data (np.ndarray): the input complex array of size n.
 
     Returns:
         np.ndarray: the output real array of size 2n.
     """
-    out = np.zeros(2 * len(input_data))
-    out[::2] = input_data.real
-    out[1::2] = input_data.imag
-    return out
+    return np.ascontiguousarray(input_data, dtype=np.complex128).view(np.float64)
+
+
+def fast_variance(data: np.ndarray) -> float:
+    """
+    Compute the variance of real or complex data as E[|x|^2] - |E[x]|^2.
+
+    Contrary to np.var, this does not allocate the array of deviations:
+    the data is read once for the mean and once for the sum of squares,
+    computed with np.vdot. This is accurate as long as the mean is small
+    compared to the standard deviation, as for symbols and noises.
+
+    Args:
+        data (np.ndarray): the data.
+
+    Returns:
+        float: the variance of the data.
+    """
+    return float(np.real(np.vdot(data, data)) / data.size - np.abs(np.mean(data)) ** 2)
+
+
+#: Number of elements of each chunk in _vdot, when the data is not in double precision.
+_VDOT_CHUNK_SIZE = 1 << 16
+
+
+def _vdot(first: np.ndarray, second: np.ndarray) -> complex:
+    """
+    Compute np.vdot(first, second), with the result accumulated in double precision.
+
+    Arrays in double precision are given to np.vdot directly. Otherwise, as for
+    complex64 symbols after the DSP, np.vdot is applied in single precision on
+    chunks of the arrays, so that the arrays are neither upcast nor copied as a whole,
+    and the results of the chunks are summed in double precision.
+
+    Args:
+        first (np.ndarray): the first array, which is conjugated.
+        second (np.ndarray): the second array, of the same size.
+
+    Returns:
+        complex: the dot product of the conjugate of the first array with the second one.
+    """
+    if first.dtype == second.dtype == np.complex128:
+        return complex(np.vdot(first, second))
+
+    first = first.ravel()
+    second = second.ravel()
+    total = 0j
+    for start in range(0, first.size, _VDOT_CHUNK_SIZE):
+        stop = start + _VDOT_CHUNK_SIZE
+        total += complex(np.vdot(first[start:stop], second[start:stop]))
+    return total
+
+
+def _sums(data: np.ndarray) -> Tuple[complex, float]:
+    """
+    Compute the sum and the sum of the squared moduli of complex data,
+    both accumulated in double precision.
+
+    Args:
+        data (np.ndarray): the complex data.
+
+    Returns:
+        Tuple[complex, float]: the sum and the sum of the squared moduli of the data.
+    """
+    return complex(np.sum(data, dtype=np.complex128)), _vdot(data, data).real
+
+
+def _moments(
+    data: np.ndarray, sums: Optional[Tuple[complex, float]] = None
+) -> Tuple[float, float]:
+    """
+    Compute the mean and the mean square of the real representation of complex data,
+    as given by complex_to_real, directly on the complex data.
+
+    The mean square is computed with _vdot, which does not allocate
+    the array of squares, so the data is read once for each moment.
+    Both moments are accumulated in double precision, also for complex64 data.
+
+    Args:
+        data (np.ndarray): the complex data.
+        sums (Optional[Tuple[complex, float]], optional): the sums of the data, as given by _sums, if already known. Defaults to None.
+
+    Returns:
+        Tuple[float, float]: the mean and the mean square of the real representation of the data.
+    """
+    size = 2 * data.size
+    total, square_sum = _sums(data) if sums is None else sums
+    return (total.real + total.imag) / size, square_sum / size
+
+
+def _combination_variance(
+    alice_var: float,
+    bob_var: float,
+    cross_var: float,
+    alice_coefficient: float,
+    bob_coefficient: float,
+) -> float:
+    """
+    Compute the variance of alice_coefficient * alice_symbols + bob_coefficient * bob_symbols
+    from the variances and the covariance of the symbols, without computing the combination.
+
+    Args:
+        alice_var (float): variance of the symbols of Alice.
+        bob_var (float): variance of the symbols of Bob.
+        cross_var (float): covariance of the symbols of Alice and Bob.
+        alice_coefficient (float): coefficient of the symbols of Alice.
+        bob_coefficient (float): coefficient of the symbols of Bob.
+
+    Returns:
+        float: the variance of the combination.
+    """
+    return (
+        alice_coefficient**2 * alice_var
+        + bob_coefficient**2 * bob_var
+        + 2 * alice_coefficient * bob_coefficient * cross_var
+    )
+
+
+# pylint: disable=too-few-public-methods
+class _LastArraysCache:
+    """
+    Cache of the result of a computation for the last arrays given.
+
+    The result is returned again when the same array objects are given. A reference
+    to the last arrays is kept, so their memory cannot be reused by other arrays,
+    but they should not be modified in place. The cache can be used from several threads.
+    """
+
+    _arrays: Tuple[np.ndarray, ...]  #: The last arrays given.
+    _result: Any  #: The result of the computation for the last arrays.
+    _lock: threading.Lock  #: Lock of the arrays and the result.
+
+    def __init__(self) -> None:
+        self._arrays = ()
+        self._result = None
+        self._lock = threading.Lock()
+
+    def get(self, func: Callable[..., Any], *arrays: np.ndarray) -> Any:
+        """
+        Return the result of func for the arrays, computing it if they are not the last arrays given.
+
+        Args:
+            func (Callable[..., Any]): the computation, called with the arrays.
+            *arrays (np.ndarray): the arrays.
+
+        Returns:
+            Any: the result of func for the arrays.
+        """
+        with self._lock:
+            if len(arrays) == len(self._arrays) and all(
+                array is last_array for array, last_array in zip(arrays, self._arrays)
+            ):
+                return self._result
+        result = func(*arrays)
+        with self._lock:
+            self._arrays = arrays
+            self._result = result
+        return result
+
+
+#: Cache of the moments of the last symbols of Alice given to _alice_moments.
+_ALICE_MOMENTS_CACHE = _LastArraysCache()
+#: Cache of the sums of the last noise symbols given to _noise_sums.
+_NOISE_SUMS_CACHE = _LastArraysCache()
+
+
+def _alice_moments(alice_symbols: np.ndarray) -> Tuple[float, float]:
+    """
+    Compute the mean and the mean square of the real representation of the symbols of Alice.
+
+    The moments of the last array are kept and returned again when the same
+    array object is given, as when the parameters are estimated several times
+    on the same symbols of Alice.
+
+    Args:
+        alice_symbols (np.ndarray): symbols sent by Alice.
+
+    Returns:
+        Tuple[float, float]: the mean and the mean square of the symbols.
+    """
+    return _ALICE_MOMENTS_CACHE.get(_moments, alice_symbols)
+
+
+def _compute_noise_sums(
+    electronic_symbols: np.ndarray, electronic_shot_symbols: np.ndarray
+) -> Tuple[Tuple[complex, float], Tuple[complex, float]]:
+    """
+    Compute the sums of the electronic noise symbols and of the electronic
+    and shot noise symbols, as given by _sums.
+
+    Args:
+        electronic_symbols (np.ndarray): electronic noise data after equivalent DSP.
+        electronic_shot_symbols (np.ndarray): electronic and shot noise data, after equivalent DSP.
+
+    Returns:
+        Tuple[Tuple[complex, float], Tuple[complex, float]]: the sums of the electronic noise symbols and of the electronic and shot noise symbols.
+    """
+    return _sums(electronic_symbols), _sums(electronic_shot_symbols)
+
+
+def _noise_sums(
+    electronic_symbols: np.ndarray, electronic_shot_symbols: np.ndarray
+) -> Tuple[Tuple[complex, float], Tuple[complex, float]]:
+    """
+    Compute the sums of the electronic noise symbols and of the electronic
+    and shot noise symbols, as given by _sums.
+
+    As for _alice_moments, the sums of the last arrays are kept and returned
+    again when the same array objects are given, as when the shot noise is
+    computed after the estimation of the parameters on the same symbols.
+
+    Args:
+        electronic_symbols (np.ndarray): electronic noise data after equivalent DSP.
+        electronic_shot_symbols (np.ndarray): electronic and shot noise data, after equivalent DSP.
+
+    Returns:
+        Tuple[Tuple[complex, float], Tuple[complex, float]]: the sums of the electronic noise symbols and of the electronic and shot noise symbols.
+    """
+    return _NOISE_SUMS_CACHE.get(
+        _compute_noise_sums, electronic_symbols, electronic_shot_symbols
+    )
+
+
+def _symbols_moments(
+    alice_symbols: np.ndarray, bob_symbols: np.ndarray
+) -> Tuple[float, float, float, float]:
+    """
+    Compute the moments of the real representation of the symbols of Alice and Bob,
+    as given by complex_to_real, directly on the complex arrays.
+
+    The moments are computed in the precision of the arrays and accumulated in
+    double precision. Each array is read once for each moment (the ones of Alice
+    only once for the same symbols).
+
+    Args:
+        alice_symbols (np.ndarray): symbols sent by Alice.
+        bob_symbols (np.ndarray): symbols received by Bob, after DSP.
+
+    Returns:
+        Tuple[float, float, float, float]: the mean square of the symbols of Alice, the variance of the symbols of Alice, the variance of the symbols of Bob and their covariance.
+    """
+    alice_mean, alice_square_mean = _alice_moments(alice_symbols)
+    bob_mean, bob_square_mean = _moments(bob_symbols)
+    cross_var = (
+        _vdot(alice_symbols, bob_symbols).real / (2 * alice_symbols.size)
+        - alice_mean * bob_mean
+    )
+    return (
+        alice_square_mean,
+        alice_square_mean - alice_mean**2,
+        bob_square_mean - bob_mean**2,
+        cross_var,
+    )
+
+
+def _noise_variances(
+    electronic_symbols: np.ndarray, electronic_shot_symbols: np.ndarray
+) -> Tuple[float, float]:
+    """
+    Compute the shot noise and the electronic noise in shot noise units,
+    on the real representation of the noise symbols.
+
+    Args:
+        electronic_symbols (np.ndarray): electronic noise data after equivalent DSP.
+        electronic_shot_symbols (np.ndarray): electronic and shot noise data, after equivalent DSP.
+
+    Returns:
+        Tuple[float, float]: the shot noise and the normalised electronic noise.
+    """
+    electronic_sums, electronic_shot_sums = _noise_sums(
+        electronic_symbols, electronic_shot_symbols
+    )
+    electronic_mean, electronic_square_mean = _moments(
+        electronic_symbols, electronic_sums
+    )
+    electronic_shot_mean, electronic_shot_square_mean = _moments(
+        electronic_shot_symbols, electronic_shot_sums
+    )
+    electronic_var = electronic_square_mean - electronic_mean**2
+    shot = electronic_shot_square_mean - electronic_shot_mean**2 - electronic_var
+    return shot, electronic_var / shot
+
+
+def shot_noise_variance(
+    electronic_symbols: np.ndarray, electronic_shot_symbols: np.ndarray
+) -> float:
+    """
+    Compute the variance of the shot noise, as the difference
+    fast_variance(electronic_shot_symbols) - fast_variance(electronic_symbols).
+
+    The sums of the noise symbols are shared with the estimation of the parameters,
+    so the arrays are not read again after the estimation on the same symbols.
+
+    Args:
+        electronic_symbols (np.ndarray): electronic noise data after equivalent DSP.
+        electronic_shot_symbols (np.ndarray): electronic and shot noise data, after equivalent DSP.
+
+    Returns:
+        float: the variance of the shot noise.
+    """
+    (electronic_total, electronic_square_sum), (
+        electronic_shot_total,
+        electronic_shot_square_sum,
+    ) = _noise_sums(electronic_symbols, electronic_shot_symbols)
+    electronic_size = electronic_symbols.size
+    electronic_shot_size = electronic_shot_symbols.size
+    return (
+        electronic_shot_square_sum / electronic_shot_size
+        - abs(electronic_shot_total / electronic_shot_size) ** 2
+        - electronic_square_sum / electronic_size
+        + abs(electronic_total / electronic_size) ** 2
+    )
 
 
 # pylint: disable=too-few-public-methods
@@ -107,22 +420,32 @@ class DefaultEstimator(BaseEstimator):
         Returns:
             Tuple[float, float, float]: tuple containing the transmittance, the excess noise at Bob side and the electronic noise.
         """
-        electronic_symbols = complex_to_real(electronic_symbols)
-        electronic_shot_symbols = complex_to_real(electronic_shot_symbols)
-        alice_symbols = complex_to_real(alice_symbols)
-        bob_symbols = complex_to_real(bob_symbols)
-
-        conversion_factor = np.sqrt(
-            alice_photon_number / np.mean(np.abs(alice_symbols) ** 2)
+        # All the moments are those of the real representation of the symbols,
+        # but are computed on the complex arrays, and the variance of
+        # factor * alice_symbols - bob_symbols is computed from them.
+        size = 2 * alice_symbols.size
+        alice_square_mean, alice_var, bob_var, cross_var = _symbols_moments(
+            alice_symbols, bob_symbols
         )
+        shot, vel = _noise_variances(electronic_symbols, electronic_shot_symbols)
 
-        shot = np.var(electronic_shot_symbols) - np.var(electronic_symbols)
-        vel = np.var(electronic_symbols) / shot
-        bob_symbols = bob_symbols / np.sqrt(shot)
-        factor = np.cov([alice_symbols, bob_symbols])[0][1].real / np.var(alice_symbols)
+        # The symbols of Bob are normalised in shot noise units by folding
+        # this scale into the moments, without scaling the array.
+        bob_scale = 1 / np.sqrt(shot)
 
-        excess_noise_bob = np.var(factor * alice_symbols - bob_symbols) - 1 - vel
+        # The covariance is unbiased, as given by np.cov.
+        factor = cross_var * bob_scale * size / (size - 1) / alice_var
 
-        transmittance = factor**2 / conversion_factor**2
+        excess_noise_bob = (
+            _combination_variance(alice_var, bob_var, cross_var, factor, -bob_scale)
+            - 1
+            - vel
+        )
 
-        return transmittance, excess_noise_bob, vel
+        # The transmittance is factor**2 divided by the square of the
+        # conversion factor sqrt(alice_photon_number / alice_square_mean).
+        return (
+            factor**2 * alice_square_mean / alice_photon_number,
+            excess_noise_bob,
+            vel,
+        )
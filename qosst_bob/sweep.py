@@ -0,0 +1,49 @@
+# qosst-bob - Bob module of the Quantum Open Software for Secure Transmissions.
+# Copyright (C) 2021-2024 Yoann Piétri
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Sweeps of values, for the scripts changing a parameter step by step.
+
+This only depends on numpy, so that it can be imported by the standalone scripts.
+"""
+from typing import Any
+
+import numpy as np
+
+
+def linear_sweep(
+    begin: float, end: float, step: float, dtype: Any = np.float64
+) -> np.ndarray:
+    """
+    Values from begin to end (excluded) with the given step, as np.arange.
+
+    The number of values is computed with a tolerance on the rounding errors,
+    and the values with np.linspace, so that end is never included and the
+    values do not accumulate the rounding errors of the step.
+
+    Args:
+        begin (float): first value.
+        end (float): end of the values (excluded).
+        step (float): step between two values.
+        dtype (Any, optional): data type of the values. Defaults to np.float64.
+
+    Returns:
+        np.ndarray: the values.
+    """
+    number = max(int(np.ceil(round((end - begin) / step, 9))), 0)
+    return np.linspace(
+        begin, begin + number * step, number, endpoint=False, dtype=dtype
+    )
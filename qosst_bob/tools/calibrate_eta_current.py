@@ -19,8 +19,8 @@ Script to calibrate eta for detectors using the photocurrents.
 """
 import logging
 import argparse
-import time
 import datetime
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field, fields
 
 import numpy as np
@@ -31,6 +31,9 @@ from qosst_hal.voa import GenericVOA
 from qosst_core.data import BaseQOSSTData
 from qosst_core.utils import configuration_menu, get_object_by_import_path
 
+from qosst_bob.sweep import linear_sweep
+from qosst_bob.tools.utils import slope, wait_for_settling
+
 logger = logging.getLogger(__name__)
 
 DEFAULT_AMPEREMETER1_DEVICE: str = "qosst_hal.amperemeter.FakeAmpereMeter"
@@ -112,10 +115,10 @@ class Configuration:
     )
 
     def __str__(self) -> str:
-        res = ""
-        for class_field in fields(self.__class__):
-            res += f"{class_field.name}: {getattr(self, class_field.name)}\n"
-        return res
+        return "".join(
+            f"{class_field.name}: {getattr(self, class_field.name)}\n"
+            for class_field in fields(self)
+        )
 
 
 # pylint: disable=too-many-locals, too-many-statements
@@ -144,7 +147,7 @@ def calibration_eta_current(args: argparse.Namespace):
     if cont == "n":
         configuration_menu(config)
 
-    voa_values = np.arange(
+    voa_values = linear_sweep(
         config.voa_start_value, config.voa_end_value, config.voa_step_value
     )
 
@@ -177,20 +180,29 @@ def calibration_eta_current(args: argparse.Namespace):
     powermeter.open()
     voa.open()
 
+    # The three instruments are independent, so they are read concurrently.
+    executor = ThreadPoolExecutor(max_workers=3)
     for i, voa_value in enumerate(voa_values):
         logger.info("Starting %i/%i", i + 1, len(voa_values))
 
         logger.info("Setting voa to %f", voa_value)
         voa.set_value(voa_value)
-        time.sleep(1)
-        power_values[i] = powermeter.read()
-        current1_values[i] = amperemeter1.get_current()
-        current2_values[i] = amperemeter2.get_current()
+        wait_for_settling(powermeter)
+        power_future = executor.submit(powermeter.read)
+        current1_future = executor.submit(amperemeter1.get_current)
+        current2_future = executor.submit(amperemeter2.get_current)
+        power_values[i] = power_future.result()
+        current1_values[i] = current1_future.result()
+        current2_values[i] = current2_future.result()
+
+        logger.info(
+            "Power was estimated at %f mW, current 1 at %f A and current 2 at %f A",
+            power_values[i] * 1e3,
+            current1_values[i],
+            current2_values[i],
+        )
 
-        logger.info("Power was estimated at %f mW", power_values[i] * 1e3)
-        logger.info("Current 1 was estimated at %f A", current1_values[i])
-        logger.info("Current 2 was estimated at %f A", current2_values[i])
-        time.sleep(1)
+    executor.shutdown()
 
     amperemeter1.close()
     amperemeter2.close()
@@ -198,10 +210,9 @@ def calibration_eta_current(args: argparse.Namespace):
     voa.close()
 
     total_photocurrent = current1_values + current2_values
-    responsivity, _ = np.polyfit(
+    responsivity = slope(
         power_values * config.beam_splitter_conversion_factor_pm_to_bob,
         total_photocurrent,
-        1,
     )
     eta = responsivity / 1.25  # Only works at 1550nm
 
@@ -214,7 +225,7 @@ def calibration_eta_current(args: argparse.Namespace):
     if args.save:
         to_save = CalibrateEtaCurrentData(
             power_values=power_values,
-            current1_values=current2_values,
+            current1_values=current1_values,
             current2_values=current2_values,
         )
         filename = "calibration-eta-current.qosst"
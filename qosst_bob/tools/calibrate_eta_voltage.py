@@ -19,8 +19,8 @@ Script to calibrate eta for detectors with monitoring output in voltage.
 """
 import logging
 import argparse
-import time
 import datetime
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field, fields
 
 import numpy as np
@@ -31,6 +31,9 @@ from qosst_hal.voa import GenericVOA
 from qosst_core.data import BaseQOSSTData
 from qosst_core.utils import configuration_menu, get_object_by_import_path
 
+from qosst_bob.sweep import linear_sweep
+from qosst_bob.tools.utils import slope, wait_for_settling
+
 logger = logging.getLogger(__name__)
 
 DEFAULT_VOLTMETER1_DEVICE: str = "qosst_hal.voltmeter.FakeVoltMeter"
@@ -109,10 +112,10 @@ class Configuration:
     )
 
     def __str__(self) -> str:
-        res = ""
-        for class_field in fields(self.__class__):
-            res += f"{class_field.name}: {getattr(self, class_field.name)}\n"
-        return res
+        return "".join(
+            f"{class_field.name}: {getattr(self, class_field.name)}\n"
+            for class_field in fields(self)
+        )
 
 
 # pylint: disable=too-many-locals, too-many-statements
@@ -143,7 +146,7 @@ def calibration_eta_voltage(args: argparse.Namespace):
     if cont == "n":
         configuration_menu(config)
 
-    voa_values = np.arange(
+    voa_values = linear_sweep(
         config.voa_start_value, config.voa_end_value, config.voa_step_value
     )
 
@@ -172,20 +175,29 @@ def calibration_eta_voltage(args: argparse.Namespace):
     powermeter.open()
     voa.open()
 
+    # The three instruments are independent, so they are read concurrently.
+    executor = ThreadPoolExecutor(max_workers=3)
     for i, voa_value in enumerate(voa_values):
         logger.info("Starting %i/%i", i + 1, len(voa_values))
 
         logger.info("Setting voa to %f", voa_value)
         voa.set_value(voa_value)
-        time.sleep(1)
-        power_values[i] = powermeter.read()
-        voltage1_values[i] = voltmeter1.get_voltage()
-        voltage2_values[i] = voltmeter2.get_voltage()
+        wait_for_settling(powermeter)
+        power_future = executor.submit(powermeter.read)
+        voltage1_future = executor.submit(voltmeter1.get_voltage)
+        voltage2_future = executor.submit(voltmeter2.get_voltage)
+        power_values[i] = power_future.result()
+        voltage1_values[i] = voltage1_future.result()
+        voltage2_values[i] = voltage2_future.result()
+
+        logger.info(
+            "Power was estimated at %f mW, voltage 1 at %f V and voltage 2 at %f V",
+            power_values[i] * 1e3,
+            voltage1_values[i],
+            voltage2_values[i],
+        )
 
-        logger.info("Power was estimated at %f mW", power_values[i] * 1e3)
-        logger.info("Voltage 1 was estimated at %f V", voltage1_values[i])
-        logger.info("Voltage 2 was estimated at %f V", voltage2_values[i])
-        time.sleep(1)
+    executor.shutdown()
 
     voltmeter1.close()
     voltmeter2.close()
@@ -193,10 +205,9 @@ def calibration_eta_voltage(args: argparse.Namespace):
     voa.close()
 
     total_photocurrent = (voltage1_values + voltage2_values) / config.gain
-    responsivity, _ = np.polyfit(
+    responsivity = slope(
         power_values * config.beam_splitter_conversion_factor_pm_to_bob,
         total_photocurrent,
-        1,
     )
     eta = responsivity / 1.25  # Only works at 1550nm
 
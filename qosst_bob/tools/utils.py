@@ -0,0 +1,79 @@
+# qosst-bob - Bob module of the Quantum Open Software for Secure Transmissions.
+# Copyright (C) 2021-2024 Yoann Piétri
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Helpers shared by the calibration scripts of the tools.
+"""
+import logging
+import time
+
+import numpy as np
+
+from qosst_hal.powermeter import GenericPowerMeter
+
+logger = logging.getLogger(__name__)
+
+#: Minimal time to wait after setting the VOA before checking that the power is settled, in seconds.
+SETTLING_MIN_TIME: float = 0.2
+#: Maximal time to wait for the power to settle after setting the VOA, in seconds.
+SETTLING_TIMEOUT: float = 1.0
+#: Relative difference between two reads of the power below which it is settled.
+SETTLING_TOLERANCE: float = 1e-3
+#: Time between two reads of the power while waiting for it to settle, in seconds.
+SETTLING_INTERVAL: float = 0.05
+
+
+def wait_for_settling(powermeter: GenericPowerMeter) -> None:
+    """
+    Wait for the optical power to settle after a change of the VOA.
+
+    The power meter is first read after SETTLING_MIN_TIME, so that a VOA
+    that has not started moving yet is not taken as settled, and then until
+    two successive reads differ by less than SETTLING_TOLERANCE (relative),
+    or until SETTLING_TIMEOUT is reached.
+
+    Args:
+        powermeter (GenericPowerMeter): the opened power meter.
+    """
+    start = time.monotonic()
+    time.sleep(SETTLING_MIN_TIME)
+    previous = powermeter.read()
+    while time.monotonic() - start < SETTLING_TIMEOUT:
+        time.sleep(SETTLING_INTERVAL)
+        power = powermeter.read()
+        if abs(power - previous) <= SETTLING_TOLERANCE * abs(previous):
+            return
+        previous = power
+    logger.warning("The power did not settle after %f s", SETTLING_TIMEOUT)
+
+
+def slope(x: np.ndarray, y: np.ndarray) -> float:
+    """
+    Compute the slope of the least squares linear fit of y as a function of x.
+
+    This is the closed form cov(x, y) / var(x), computed on the centered data,
+    which gives the same slope as np.polyfit(x, y, 1) without the least squares solver.
+
+    Args:
+        x (np.ndarray): the abscissas.
+        y (np.ndarray): the ordinates.
+
+    Returns:
+        float: the slope of the linear fit.
+    """
+    x_centered = x - np.mean(x)
+    y_centered = y - np.mean(y)
+    return float(np.dot(x_centered, y_centered) / np.dot(x_centered, x_centered))
@@ -23,6 +23,8 @@ from pathlib import Path
 import logging
 import argparse
 import datetime
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
 
 import numpy as np
 import matplotlib.pyplot as plt
@@ -34,7 +36,9 @@ from qosst_core.configuration.exceptions import InvalidConfiguration
 
 from qosst_bob import __version__
 from qosst_bob.bob import Bob
-from qosst_bob.data import TransmittanceResults
+from qosst_bob.data import ElectronicShotNoise, TransmittanceResults
+from qosst_bob.sweep import linear_sweep
+from qosst_bob.parameters_estimation import shot_noise_variance
 
 logger = logging.getLogger(__name__)
 
@@ -99,22 +103,18 @@ def main():
 
     create_loggers(args.verbose, args.file)
 
-    attenuations = np.arange(args.start_voa, args.end_voa, args.step_voa)
+    attenuations = linear_sweep(args.start_voa, args.end_voa, args.step_voa)
 
     total_rounds = args.num_rep * len(attenuations)
 
-    transmittances = np.zeros(shape=(len(attenuations), args.num_rep), dtype=float)
-    excess_noises_bob = np.zeros(shape=(len(attenuations), args.num_rep), dtype=float)
-    electronic_noise_values = np.zeros(
-        shape=(len(attenuations), args.num_rep), dtype=float
-    )
-    photon_number_values = np.zeros(
-        shape=(len(attenuations), args.num_rep), dtype=float
-    )
-    shot_noise_values = np.zeros(shape=(len(attenuations), args.num_rep), dtype=float)
-    datetimes = np.zeros(
-        shape=(len(attenuations), args.num_rep), dtype=datetime.datetime
-    )
+    shape = (len(attenuations), args.num_rep)
+    transmittances = np.zeros(shape=shape, dtype=float)
+    excess_noises_bob = np.zeros(shape=shape, dtype=float)
+    electronic_noise_values = np.zeros(shape=shape, dtype=float)
+    photon_number_values = np.zeros(shape=shape, dtype=float)
+    shot_noise_values = np.zeros(shape=shape, dtype=float)
+    # The datetimes are stored as datetime64 rather than as an array of objects.
+    datetimes = np.full(shape, np.datetime64("NaT"), dtype="datetime64[ns]")
 
     bob = Bob(args.file)
     bob.open_hardware()
@@ -122,14 +122,13 @@ def main():
     bob.connect()
 
     voa_channel = None
+    voa_config = bob.config.channel.voa
     if (
-        bob.config.channel.voa is not None
-        and bob.config.channel.voa.use
-        and bob.config.channel.voa.applier == Participant.BOB
+        voa_config is not None
+        and voa_config.use
+        and voa_config.applier == Participant.BOB
     ):
-        voa_channel = bob.config.channel.voa.device(
-            bob.config.channel.voa.location, **bob.config.channel.voa.extra_args
-        )
+        voa_channel = voa_config.device(voa_config.location, **voa_config.extra_args)
         voa_channel.open()
 
     if voa_channel is None:
@@ -150,6 +149,11 @@ def main():
     if bob.notifier:
         bob.notifier.send_notification("Experiment on transmittance started.")
 
+    # When the shot noise is calibrated manually, the calibration for the next
+    # round is done in this thread while the DSP runs on the current one.
+    shot_noise_executor = ThreadPoolExecutor(max_workers=1)
+    next_shot_noise: Optional[Future[ElectronicShotNoise]] = None
+
     for i, att in enumerate(attenuations):
         logger.info("Starting attenuation %i/%i", i + 1, len(attenuations))
         logger.info("Setting VOA attenuation voltage to %f", att)
@@ -164,14 +168,26 @@ def main():
                 )
 
                 if not bob.config.bob.switch.switching_time:
-                    logger.info("Manual shot noise calibration")
-                    bob.get_electronic_shot_noise_data()
+                    if next_shot_noise is None:
+                        logger.info("Manual shot noise calibration")
+                        bob.get_electronic_shot_noise_data()
+                    else:
+                        logger.info("Waiting for the manual shot noise calibration")
+                        future, next_shot_noise = next_shot_noise, None
+                        bob.electronic_shot_noise = future.result()
 
-                current_datetime = datetime.datetime.now()
+                current_datetime = np.datetime64(datetime.datetime.now(), "ns")
 
                 logger.info("Starting QIE")
                 bob.quantum_information_exchange()
 
+                if not bob.config.bob.switch.switching_time and (
+                    i * args.num_rep + j + 1 < total_rounds
+                ):
+                    next_shot_noise = shot_noise_executor.submit(
+                        bob.acquire_electronic_shot_noise_data
+                    )
+
                 logger.info("DSP")
                 bob.dsp()
 
@@ -191,14 +207,14 @@ def main():
 
                 logger.info("T = %f, ξ = %f", transmittance, excess_noise_bob)
 
-                transmittances[i][j] = transmittance
-                excess_noises_bob[i][j] = excess_noise_bob
-                electronic_noise_values[i][j] = electronic_noise
-                photon_number_values[i][j] = alice_photon_number
-                shot_noise_values[i][j] = np.var(bob.electronic_shot_symbols) - np.var(
-                    bob.electronic_symbols
+                transmittances[i, j] = transmittance
+                excess_noises_bob[i, j] = excess_noise_bob
+                electronic_noise_values[i, j] = electronic_noise
+                photon_number_values[i, j] = alice_photon_number
+                shot_noise_values[i, j] = shot_noise_variance(
+                    bob.electronic_symbols, bob.electronic_shot_symbols
                 )
-                datetimes[i][j] = current_datetime
+                datetimes[i, j] = current_datetime
                 j += 1
                 error = 0
             except ValueError as exc:
@@ -214,11 +230,14 @@ def main():
                         "The same round failed for %i times in a row. The script is now aborting",
                         MAX_ERRORS,
                     )
+                    shot_noise_executor.shutdown()
                     bob.close()
                     if voa_channel is not None:
                         voa_channel.close()
                     return
 
+    shot_noise_executor.shutdown()
+
     if bob.notifier:
         bob.notifier.send_notification("Experiment on transmittance ended.")
     if args.save:
@@ -246,8 +265,9 @@ def main():
     bob.close()
 
     if args.plot:
+        mean_transmittances = np.mean(transmittances, axis=-1)
         plt.figure(100)
-        plt.plot(attenuations, np.mean(transmittances, axis=-1), "--o")
+        plt.plot(attenuations, mean_transmittances, "--o")
         plt.xlabel("Attenuation voltage [V]")
         plt.ylabel("Transmittance")
         plt.title("Transmittance vs. attenuation voltage")
@@ -255,9 +275,7 @@ def main():
         plt.figure(101)
         plt.plot(
             attenuations,
-            np.mean(transmittances, axis=-1)
-            / np.mean(transmittances, axis=-1)[0]
-            * 100,
+            mean_transmittances / mean_transmittances[0] * 100,
             "--o",
         )
         plt.xlabel("Attenuation voltage [V]")
@@ -17,12 +17,271 @@
 """
 Util functions for qosst-bob.
 """
+import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Union, Tuple, Optional
 
 import numpy as np
 import matplotlib
+import matplotlib.colors
+import matplotlib.figure
 from matplotlib.axes import Axes
-import matplotlib.pyplot as plt
+
+#: Number of points binned at once by _histogram2d.
+_HISTOGRAM_CHUNK_SIZE = 1 << 18
+
+
+#: Number of points read at once by _min_max, so that they are still in cache for the maximum.
+_MIN_MAX_CHUNK_SIZE = 1 << 16
+
+
+def _min_max(data: np.ndarray) -> Tuple[float, float]:
+    """
+    Compute the minimum and the maximum of the data in one pass over the memory.
+
+    The data is read by chunks that fit in the cache, and the maximum of
+    each chunk is computed while it is still in cache after its minimum.
+
+    Args:
+        data (np.ndarray): the data, which should not be empty.
+
+    Returns:
+        Tuple[float, float]: the minimum and the maximum of the data.
+    """
+    low, high = np.inf, -np.inf
+    for start in range(0, len(data), _MIN_MAX_CHUNK_SIZE):
+        chunk = data[start : start + _MIN_MAX_CHUNK_SIZE]
+        low = min(low, float(np.min(chunk)))
+        high = max(high, float(np.max(chunk)))
+    return low, high
+
+
+def _bin_indices(
+    data: np.ndarray, low: float, high: float, bins: int, exclude_outside: bool
+) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Compute the index of the uniform bin between low and high of each point of data.
+
+    Args:
+        data (np.ndarray): the data.
+        low (float): the lower edge of the first bin.
+        high (float): the upper edge of the last bin.
+        bins (int): the number of bins.
+        exclude_outside (bool): if True, also find the points outside of [low, high].
+
+    Returns:
+        Tuple[np.ndarray, Optional[np.ndarray]]: the index of the bin of each point, and the mask of the points outside of [low, high] if exclude_outside is True, None otherwise.
+    """
+    # The position in bins is computed in a single temporary array. The
+    # offset is subtracted in the precision of the data, so that the
+    # points of a narrow range far from 0 are not rounded into the same bin.
+    position = np.subtract(data, low)
+    position *= bins / (high - low)
+    outside = (position < 0) | (position > bins) if exclude_outside else None
+    index = position.astype(np.intp)
+    np.clip(index, 0, bins - 1, out=index)
+    return index, outside
+
+
+def _bins_range(
+    data: np.ndarray, data_range: Optional[Tuple[float, float]]
+) -> Tuple[float, float, bool]:
+    """
+    Get the range of the uniform bins of one dimension of a 2D histogram.
+
+    Args:
+        data (np.ndarray): the data of the dimension, which should not be empty.
+        data_range (Optional[Tuple[float, float]]): the given range, or None to use the range of the data.
+
+    Returns:
+        Tuple[float, float, bool]: the lower and upper edges of the bins, and True if the range was given, in which case the points outside of it should not be counted.
+    """
+    if data_range is None:
+        low, high = _min_max(data)
+    else:
+        low, high = map(float, data_range)
+    if low == high:
+        low, high = low - 0.5, high + 0.5
+    return low, high, data_range is not None
+
+
+def _count_chunk(
+    data_x: np.ndarray,
+    data_y: np.ndarray,
+    start: int,
+    bins: int,
+    ranges: Tuple[Tuple[float, float, bool], Tuple[float, float, bool]],
+) -> np.ndarray:
+    """
+    Count the points of the chunk of data_x and data_y beginning at start in each bin.
+
+    Args:
+        data_x (np.ndarray): the data of the first dimension.
+        data_y (np.ndarray): the data of the second dimension.
+        start (int): the index of the first point of the chunk.
+        bins (int): the number of bins in each dimension.
+        ranges (Tuple[Tuple[float, float, bool], Tuple[float, float, bool]]): the ranges of the bins of each dimension, as returned by _bins_range.
+
+    Returns:
+        np.ndarray: the flattened counts of the chunk, of size bins * bins.
+    """
+    stop = start + _HISTOGRAM_CHUNK_SIZE
+    flat_index: Optional[np.ndarray] = None
+    outside: Optional[np.ndarray] = None
+    for data, (low, high, exclude_outside) in zip((data_x, data_y), ranges):
+        index, index_outside = _bin_indices(
+            data[start:stop], low, high, bins, exclude_outside
+        )
+        if flat_index is None:
+            flat_index = index
+        else:
+            # The flat index of the bins is accumulated in the index of the first dimension.
+            flat_index *= bins
+            flat_index += index
+        if index_outside is not None:
+            outside = index_outside if outside is None else outside | index_outside
+    assert flat_index is not None
+    if outside is not None:
+        flat_index = flat_index[~outside]
+    return np.bincount(flat_index, minlength=bins * bins)
+
+
+def _histogram2d(
+    data_x: np.ndarray,
+    data_y: np.ndarray,
+    bins: int,
+    range_x: Optional[Tuple[float, float]] = None,
+    range_y: Optional[Tuple[float, float]] = None,
+) -> Tuple[np.ndarray, Tuple[float, float], Tuple[float, float]]:
+    """
+    Compute the 2D histogram of data_x and data_y with uniform bins
+    spanning the range of the data, or the given ranges, as np.histogram2d would.
+
+    As the bins are uniform, only the range of the bins of each dimension is
+    returned, instead of the array of edges returned by np.histogram2d.
+
+    The bin of each point is computed directly and the points are counted
+    with np.bincount, which is much faster than the search in the edges
+    done by np.histogram2d. When a range is given, the data is not read to
+    find its minimum and maximum, and the points outside of the range are not counted.
+
+    The points are binned by chunks, so that the temporary arrays stay small,
+    and the chunks are binned in a thread pool when there are several CPUs.
+
+    Args:
+        data_x (np.ndarray): the data of the first dimension.
+        data_y (np.ndarray): the data of the second dimension.
+        bins (int): the number of bins in each dimension.
+        range_x (Optional[Tuple[float, float]], optional): the range of the bins of the first dimension. Defaults to None.
+        range_y (Optional[Tuple[float, float]], optional): the range of the bins of the second dimension. Defaults to None.
+
+    Returns:
+        Tuple[np.ndarray, Tuple[float, float], Tuple[float, float]]: the histogram (in float32, except for empty data), the range of the bins of the first dimension and the range of the bins of the second dimension.
+    """
+    if len(data_x) == 0:
+        histogram, edges_x, edges_y = np.histogram2d(
+            data_x, data_y, bins=bins, range=[range_x, range_y]
+        )
+        return (
+            histogram,
+            (float(edges_x[0]), float(edges_x[-1])),
+            (float(edges_y[0]), float(edges_y[-1])),
+        )
+
+    ranges = (_bins_range(data_x, range_x), _bins_range(data_y, range_y))
+
+    # The counts of the chunks are added in place in a single array.
+    counts = np.zeros(bins * bins, dtype=np.intp)
+    starts = range(0, len(data_x), _HISTOGRAM_CHUNK_SIZE)
+    workers = min(len(starts), os.cpu_count() or 1)
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for chunk_counts in executor.map(
+                lambda start: _count_chunk(data_x, data_y, start, bins, ranges),
+                starts,
+            ):
+                counts += chunk_counts
+    else:
+        for start in starts:
+            counts += _count_chunk(data_x, data_y, start, bins, ranges)
+    return (
+        counts.reshape(bins, bins).astype(np.float32),
+        ranges[0][:2],
+        ranges[1][:2],
+    )
+
+
+def _heatmap_axes(
+    axes: Optional[Axes], clear: bool
+) -> Tuple[matplotlib.figure.Figure, matplotlib.axes.Axes]:
+    """
+    Get the figure and the axes on which a heatmap is drawn.
+
+    Args:
+        axes (Optional[Axes]): the given axes, or None to create a new figure.
+        clear (bool): if True and if an axe was given, clear this axe, with its colorbar.
+
+    Returns:
+        Tuple[matplotlib.figure.Figure, matplotlib.axes.Axes]: the figure and the axe.
+    """
+    fig: Optional[matplotlib.figure.Figure]
+    if not axes:
+        # Imported here so that pyplot and its backend are only loaded when
+        # a new figure is needed, and not when the axes are given.
+        import matplotlib.pyplot as plt  # pylint: disable=import-outside-toplevel
+
+        fig = plt.figure()
+        axes = fig.add_subplot()
+    else:
+        fig = axes.get_figure()
+        if clear:
+            if axes.images and axes.images[0].colorbar is not None:
+                axes.images[0].colorbar.remove()
+            axes.clear()
+    assert fig is not None
+    return fig, axes
+
+
+def _draw_heatmap_image(
+    fig: matplotlib.figure.Figure,
+    axes: Axes,
+    histogram: np.ndarray,
+    extent: Tuple[float, float, float, float],
+    cmap: Union[matplotlib.colors.Colormap, str],
+):
+    """
+    Draw the histogram as an image on the axes, or update the image already drawn.
+
+    Args:
+        fig (matplotlib.figure.Figure): the figure of the axes, used to add the colorbar.
+        axes (Axes): the axes of the heatmap.
+        histogram (np.ndarray): the histogram, in the (row, column) layout of the image.
+        extent (Tuple[float, float, float, float]): the extent of the image.
+        cmap (Union[matplotlib.colors.Colormap, str]): the colormap to use.
+    """
+    # The counts are given as float32 so that matplotlib scales and
+    # resamples the image in single precision.
+    image = histogram.astype(np.float32, copy=False)
+    if axes.images:
+        # The heatmap of a previous call is kept: update its data and colorbar
+        # instead of creating a new image and colorbar.
+        axes_image = axes.images[0]
+        axes_image.set_data(image)
+        axes_image.set_extent(extent)
+        axes_image.set_cmap(cmap)
+        axes_image.autoscale()
+        if axes_image.colorbar is not None:
+            axes_image.colorbar.update_normal(axes_image)
+    else:
+        axes_image = axes.imshow(
+            image,
+            extent=extent,
+            origin="lower",
+            cmap=cmap,
+            interpolation="nearest",
+        )
+        fig.colorbar(axes_image)
+        axes.grid(True)
 
 
 # pylint: disable=too-many-arguments
@@ -35,10 +294,16 @@ def heatmap(
     cmap: Union[matplotlib.colors.Colormap, str] = "rainbow",
     axes: Optional[Axes] = None,
     clear: bool = True,
+    range_x: Optional[Tuple[float, float]] = None,
+    range_y: Optional[Tuple[float, float]] = None,
 ) -> Tuple[matplotlib.figure.Figure, matplotlib.axes.Axes]:
     """
     Draw a heatmap from data_x and data_y.
 
+    By default, the heatmap spans the range of the data. Fixed ranges can be
+    given, for instance to keep the same axes between successive heatmaps,
+    in which case the minimum and maximum of the data are not computed.
+
     Args:
         data_x (np.ndarray): the data to be put in the x-axis of the heatmap.
         data_y (np.ndarray): the data to be put in the y-axis of the heatmap.
@@ -47,39 +312,30 @@ def heatmap(
         title (str, optional): the title of the figure. Defaults to "Heatmap".
         cmap (Union[matplotlib.colors.Colormap, str], optional): the colormap to use. Defaults to rainbow.
         axes (matplotlib.axes.Axes, optional): use those axes to make the plot. Defaults to None.
-        clear (bool): if True and if an axe was given, clear this axe.
+        clear (bool): if True and if an axe was given, clear this axe. Otherwise, the heatmap already drawn on this axe, if any, is updated in place.
+        range_x (Optional[Tuple[float, float]], optional): the range of the x-axis, points outside are not counted. Defaults to None.
+        range_y (Optional[Tuple[float, float]], optional): the range of the y-axis, points outside are not counted. Defaults to None.
 
     Returns:
         Tuple[matplotlib.figure.Figure, matplotlib.axes.Axes]: the figure and the axe.
     """
-    fig: Optional[matplotlib.figure.Figure]
-    if not axes:
-        fig = plt.figure()
-        axes = fig.add_subplot()
-    else:
-        fig = axes.get_figure()
-        if clear:
-            if axes.images:
-                # mypy is not happy with the next line but it works
-                # Ignore the error for now, and maybe find a better solution
-                # one day.
-                axes.images[0].colobar.remove()  # type: ignore
-            axes.clear()
-    assert fig is not None
-    current_heatmap, xedges, yedges = np.histogram2d(
-        data_x,
-        data_y,
-        bins=50,
+    fig, axes = _heatmap_axes(axes, clear)
+    # The histogram is computed with y as the first dimension, so that it is
+    # already in the (row, column) layout of the image, without transposition.
+    current_heatmap, bins_range_y, bins_range_x = _histogram2d(
+        data_y, data_x, bins=50, range_x=range_y, range_y=range_x
     )
-    extent = (float(xedges[0]), float(xedges[-1]), float(yedges[0]), float(yedges[-1]))
-    axes_image = axes.imshow(
-        current_heatmap.T, extent=extent, origin="lower", cmap=cmap
+    _draw_heatmap_image(
+        fig, axes, current_heatmap, (*bins_range_x, *bins_range_y), cmap
     )
-    fig.colorbar(axes_image)
-    axes.set_xlabel(x_label)
-    axes.set_ylabel(y_label)
-    axes.set_title(title)
-    axes.grid()
+    # The texts are only set when they change, as each change invalidates the
+    # layout of the figure, and they are kept when the heatmap is updated.
+    if axes.get_xlabel() != x_label:
+        axes.set_xlabel(x_label)
+    if axes.get_ylabel() != y_label:
+        axes.set_ylabel(y_label)
+    if axes.get_title() != title:
+        axes.set_title(title)
     return fig, axes
 
 
@@ -91,6 +347,8 @@ def heatmap_complex(
     cmap: Union[matplotlib.colors.Colormap, str] = "rainbow",
     axes: Optional[Axes] = None,
     clear: bool = True,
+    range_x: Optional[Tuple[float, float]] = None,
+    range_y: Optional[Tuple[float, float]] = None,
 ) -> Tuple[matplotlib.figure.Figure, matplotlib.axes.Axes]:
     """
     Draw a heatmap from data, using data.real as the values for the x-axis and data.imag for the y-axis.
@@ -103,6 +361,8 @@ def heatmap_complex(
         cmap (Union[matplotlib.colors.Colormap, str], optional): the colormap to use. Defaults to rainbow.
         axes (matplotlib.axes.Axes, optional): use those axes to make the plot. Defaults to None.
         clear (bool): if True and if an axe was given, clear this axe.
+        range_x (Optional[Tuple[float, float]], optional): the range of the x-axis (real part), points outside are not counted. Defaults to None.
+        range_y (Optional[Tuple[float, float]], optional): the range of the y-axis (imag part), points outside are not counted. Defaults to None.
 
     Returns:
         Tuple[matplotlib.figure.Figure, matplotlib.axes.Axes]: the figure and the axe.
@@ -116,4 +376,6 @@ def heatmap_complex(
         cmap=cmap,
         axes=axes,
         clear=clear,
+        range_x=range_x,
+        range_y=range_y,
     )